@@ -0,0 +1,75 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the per-response JSON cost of each available codec backend.
+
+Each iteration decodes one A2UI payload and serializes it back, which mirrors
+what the SDK does per LLM response (parse the block, then forward it as an A2A
+part or render a schema into a prompt).
+
+Usage:
+  uv run python benchmarks/bench_codec.py [--components N ...] [--iterations N]
+"""
+
+import argparse
+import json
+import time
+
+from a2ui.core import codec
+from corpus import synthetic_messages
+
+
+def _time_per_call(fn, iterations: int) -> float:
+  """Returns the best per-call time in microseconds over a few repeats."""
+  best = float("inf")
+  for _ in range(5):
+    start = time.perf_counter()
+    for _ in range(iterations):
+      fn()
+    best = min(best, (time.perf_counter() - start) / iterations)
+  return best * 1e6
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--components", type=int, nargs="+", default=[10, 100, 1000])
+  parser.add_argument("--iterations", type=int, default=200)
+  args = parser.parse_args()
+
+  backends = codec.available_backends()
+  print(f"Available backends: {', '.join(backends)}")
+  print(
+      f"{'components':>10} {'bytes':>9} {'backend':>8} {'loads us':>10}"
+      f" {'dumps us':>10} {'total us':>10} {'speedup':>8}"
+  )
+  for num_components in args.components:
+    payload = json.dumps(synthetic_messages(num_components), indent=2)
+    baseline = None
+    # The standard library runs first so that speedups are relative to it.
+    for name in sorted(backends, key=lambda name: name != codec.STDLIB_BACKEND):
+      json_codec = codec.create_codec(name)
+      decoded = json_codec.loads(payload)
+      loads_us = _time_per_call(lambda: json_codec.loads(payload), args.iterations)
+      dumps_us = _time_per_call(lambda: json_codec.dumps(decoded), args.iterations)
+      total_us = loads_us + dumps_us
+      baseline = baseline or total_us
+      speedup = f"{baseline / total_us:.2f}x"
+      print(
+          f"{num_components:>10} {len(payload):>9} {name:>8} {loads_us:>10.1f}"
+          f" {dumps_us:>10.1f} {total_us:>10.1f} {speedup:>8}"
+      )
+
+
+if __name__ == "__main__":
+  main()
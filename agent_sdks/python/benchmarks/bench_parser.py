@@ -0,0 +1,160 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures parser throughput and latency on synthetic LLM responses.
+
+For each response shape in `corpus.RESPONSE_SHAPES` this reports the
+throughput (MB/s of response text) and per-call latency percentiles of
+`parse_response`, `parse_and_fix` (over the payloads of all blocks) and
+`parse_response_to_parts`. `parse_and_fix` is compared with
+`regex_fix_baseline`, the plain `json` parse with a regex trailing comma retry
+that it replaced; `--max-slowdown` fails the run if `parse_and_fix` is slower
+than that many times the baseline on any shape. Use `--json` to emit
+machine-readable results for CI.
+
+Usage:
+  uv run python benchmarks/bench_parser.py [--shapes NAME ...] [--iterations N]
+      [--max-slowdown RATIO]
+"""
+
+import argparse
+import json
+import logging
+import re
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+from a2ui.a2a import parse_response_to_parts
+from a2ui.core import codec
+from a2ui.core.parser.parser import find_response_spans, parse_response
+from a2ui.core.parser.payload_fixer import parse_and_fix
+from corpus import RESPONSE_SHAPES
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+  ordered = sorted(samples)
+  index = min(int(len(ordered) * percent / 100), len(ordered) - 1)
+  return ordered[index]
+
+
+def _measure(fn: Callable[[], object], size: int, iterations: int) -> Dict:
+  """Times fn and returns throughput and latency statistics in ms."""
+  fn()  # Warm up caches.
+  samples = []
+  for _ in range(iterations):
+    start = time.perf_counter()
+    fn()
+    samples.append(time.perf_counter() - start)
+  mean = statistics.fmean(samples)
+  return {
+      "mb_per_s": size / mean / 1e6,
+      "p50_ms": _percentile(samples, 50) * 1e3,
+      "p90_ms": _percentile(samples, 90) * 1e3,
+      "p99_ms": _percentile(samples, 99) * 1e3,
+  }
+
+
+def _regex_fix_baseline(payload: str) -> object:
+  """The parse and repair `parse_and_fix` replaced, which only removed
+  trailing commas, including inside strings."""
+  try:
+    return json.loads(payload)
+  except json.JSONDecodeError:
+    return json.loads(re.sub(r",(?=\s*[\]}])", "", payload))
+
+
+def _benchmarks(response: str) -> Dict[str, Callable[[], object]]:
+  payloads = [
+      response[span.json_start : span.json_end]
+      for span in find_response_spans(response)
+      if span.json_start is not None
+  ]
+
+  def parse_payloads():
+    for payload in payloads:
+      parse_and_fix(payload)
+
+  def parse_payloads_baseline():
+    for payload in payloads:
+      _regex_fix_baseline(payload)
+
+  return {
+      "parse_response": lambda: parse_response(response),
+      "parse_and_fix": parse_payloads,
+      "regex_fix_baseline": parse_payloads_baseline,
+      "parse_response_to_parts": lambda: parse_response_to_parts(response),
+  }
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument(
+      "--shapes",
+      nargs="+",
+      choices=sorted(RESPONSE_SHAPES),
+      default=list(RESPONSE_SHAPES),
+  )
+  parser.add_argument("--iterations", type=int, default=50)
+  parser.add_argument(
+      "--json", action="store_true", help="Print results as JSON lines."
+  )
+  parser.add_argument(
+      "--max-slowdown",
+      type=float,
+      help="Fail if parse_and_fix is slower than this many times the baseline.",
+  )
+  args = parser.parse_args()
+
+  # Failed parses and repairs are logged, which would dominate the timings.
+  logging.disable(logging.CRITICAL)
+
+  if not args.json:
+    print(f"JSON backend: {codec.get_codec().name}")
+    print(
+        f"{'shape':>16} {'bytes':>9} {'function':>24} {'MB/s':>8}"
+        f" {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}"
+    )
+  too_slow = []
+  for shape in args.shapes:
+    response = RESPONSE_SHAPES[shape]()
+    size = len(response.encode("utf-8"))
+    p50_ms = {}
+    for name, fn in _benchmarks(response).items():
+      stats = _measure(fn, size, args.iterations)
+      p50_ms[name] = stats["p50_ms"]
+      if args.json:
+        print(json.dumps({"shape": shape, "bytes": size, "function": name, **stats}))
+        continue
+      print(
+          f"{shape:>16} {size:>9} {name:>24} {stats['mb_per_s']:>8.1f}"
+          f" {stats['p50_ms']:>8.3f} {stats['p90_ms']:>8.3f}"
+          f" {stats['p99_ms']:>8.3f}"
+      )
+    slowdown = p50_ms["parse_and_fix"] / p50_ms["regex_fix_baseline"]
+    if not args.json:
+      print(f"{shape:>16} parse_and_fix is {slowdown:.2f}x the baseline")
+    if args.max_slowdown is not None and slowdown > args.max_slowdown:
+      too_slow.append(f"{shape} ({slowdown:.2f}x)")
+
+  if too_slow:
+    sys.exit(
+        f"parse_and_fix is more than {args.max_slowdown}x the baseline on: "
+        + ", ".join(too_slow)
+    )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,247 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures where A2uiValidator spends its time as payloads and catalogs grow.
+
+For each catalog, tree shape (`corpus.TREE_SHAPES`) and component count, this
+reports the median time in ms of each validation stage:
+
+- schema: JSON Schema validation with the selected backend.
+- ref_fields: extracting the reference fields of the catalog's components,
+  done once per validator.
+- references: extracting the references of every component.
+- components: the integrity and topology checks (unique IDs, root, dangling
+  references, cycles, depth and reachability), which run in one pass and
+  include `references`.
+- topology: the cycle, depth and reachability walk alone.
+- paths: the recursion limit and JSON Pointer checks.
+- validate: `A2uiValidator.validate` end to end.
+
+Catalogs are the v0.8 and v0.9 basic catalogs, the v0.8 rizzcharts sample
+catalog and a v0.9 inline catalog merged from the basic catalog and
+`--extra-components` generated components. Use `--json` to emit
+machine-readable results for CI.
+
+Usage:
+  uv run python benchmarks/bench_validator.py [--sizes N ...] [--backend NAME]
+"""
+
+import argparse
+import copy
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema.catalog import A2uiCatalog, CatalogConfig
+from a2ui.core.schema.constants import INLINE_CATALOGS_KEY, VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.surface_state import walk_components
+from a2ui.core.schema.utils import find_repo_root
+from a2ui.core.schema.validator import (
+    MAX_GLOBAL_DEPTH,
+    VALIDATION_BACKENDS,
+    A2uiValidator,
+    _extract_component_ref_fields,
+    _find_root_id,
+    _get_component_references,
+    _get_component_update,
+    _validate_components,
+    _validate_recursion_and_paths,
+    resolve_validation_backend,
+)
+from corpus import TREE_SHAPES, synthetic_tree_messages
+
+STAGES = [
+    "schema",
+    "ref_fields",
+    "references",
+    "components",
+    "topology",
+    "paths",
+    "validate",
+]
+
+RIZZCHARTS_CATALOG = os.path.join(
+    "samples", "agent", "adk", "rizzcharts", "rizzcharts_catalog_definition.json"
+)
+
+
+def _custom_catalog(extra_components: int) -> A2uiCatalog:
+  """Returns the v0.9 basic catalog merged with generated inline components."""
+  basic = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  ).get_selected_catalog()
+  template = basic.catalog_schema["components"]["Text"]
+  names = [f"Custom{index}" for index in range(extra_components)]
+  components = {}
+  for name in names:
+    component = copy.deepcopy(template)
+    component["allOf"][-1]["properties"]["component"] = {"const": name}
+    components[name] = component
+  any_component = copy.deepcopy(basic.catalog_schema["$defs"]["anyComponent"])
+  any_component["oneOf"].extend({"$ref": f"#/components/{name}"} for name in names)
+  manager = A2uiSchemaManager(
+      VERSION_0_9,
+      catalogs=[BasicCatalog.get_config(VERSION_0_9)],
+      accepts_inline_catalogs=True,
+  )
+  return manager.get_selected_catalog({
+      INLINE_CATALOGS_KEY: [
+          {"components": components, "$defs": {"anyComponent": any_component}}
+      ]
+  })
+
+
+def _catalogs(extra_components: int) -> Dict[str, A2uiCatalog]:
+  catalogs = {
+      f"basic_{version}": (
+          A2uiSchemaManager(
+              version, catalogs=[BasicCatalog.get_config(version)]
+          ).get_selected_catalog()
+      )
+      for version in (VERSION_0_8, VERSION_0_9)
+  }
+  repo_root = find_repo_root(os.path.dirname(os.path.abspath(__file__)))
+  if repo_root:
+    catalogs["rizzcharts_0.8"] = A2uiSchemaManager(
+        VERSION_0_8,
+        catalogs=[
+            CatalogConfig.from_path(
+                "rizzcharts", os.path.join(repo_root, RIZZCHARTS_CATALOG)
+            )
+        ],
+    ).get_selected_catalog()
+  catalogs["custom_0.9"] = _custom_catalog(extra_components)
+  return catalogs
+
+
+def _median_ms(fn: Callable[[], object], iterations: int) -> float:
+  samples = []
+  for _ in range(iterations):
+    start = time.perf_counter()
+    fn()
+    samples.append(time.perf_counter() - start)
+  return statistics.median(samples) * 1e3
+
+
+def _stages(
+    validator: A2uiValidator, catalog: A2uiCatalog, messages: List[Dict[str, Any]]
+) -> Dict[str, Callable[[], object]]:
+  """Returns a function running each stage of validating the messages."""
+  ref_fields_map = _extract_component_ref_fields(catalog)
+  update = next(m for m in messages if _get_component_update(m)[2])
+  _, surface_id, components = _get_component_update(update)
+  root_id = _find_root_id(messages, surface_id)
+  references = {
+      component["id"]: list(_get_component_references(component, ref_fields_map))
+      for component in components
+  }
+
+  def schema():
+    if validator._compiled is None or not validator._compiled.is_valid(messages):
+      next(validator._validator.iter_errors(messages), None)
+
+  def paths():
+    for message in messages:
+      _validate_recursion_and_paths(message)
+
+  return {
+      "schema": schema,
+      "ref_fields": lambda: _extract_component_ref_fields(catalog),
+      "references": lambda: [
+          list(_get_component_references(component, ref_fields_map))
+          for component in components
+      ],
+      "components": lambda: _validate_components(root_id, components, ref_fields_map),
+      "topology": lambda: walk_components(references, root_id, set(), MAX_GLOBAL_DEPTH),
+      "paths": paths,
+      "validate": lambda: validator.validate(messages),
+  }
+
+
+def _run(
+    catalog: A2uiCatalog,
+    backend: str,
+    shape: str,
+    size: int,
+    iterations: int,
+) -> Tuple[Dict[str, float], int]:
+  validator = A2uiValidator(catalog, backend=backend)
+  messages = synthetic_tree_messages(size, version=catalog.version, shape=shape)
+  # Fail early on payloads that would make the stages measure error paths.
+  validator.validate(messages)
+  size_bytes = len(json.dumps(messages))
+  return {
+      stage: _median_ms(fn, iterations)
+      for stage, fn in _stages(validator, catalog, messages).items()
+  }, size_bytes
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--sizes", nargs="+", type=int, default=[10, 100, 1000, 10000])
+  parser.add_argument(
+      "--shapes", nargs="+", choices=sorted(TREE_SHAPES), default=list(TREE_SHAPES)
+  )
+  parser.add_argument("--catalogs", nargs="+", help="Defaults to all catalogs.")
+  parser.add_argument(
+      "--backend",
+      choices=VALIDATION_BACKENDS,
+      help="Defaults to the A2UI_VALIDATION_BACKEND environment variable.",
+  )
+  parser.add_argument("--extra-components", type=int, default=100)
+  parser.add_argument("--iterations", type=int, default=5)
+  parser.add_argument(
+      "--json", action="store_true", help="Print results as JSON lines."
+  )
+  args = parser.parse_args()
+  backend = resolve_validation_backend(args.backend)
+
+  catalogs = _catalogs(args.extra_components)
+  names = args.catalogs or list(catalogs)
+
+  if not args.json:
+    print(f"Validation backend: {backend}")
+    print(
+        f"{'catalog':>15} {'shape':>9} {'components':>10} {'bytes':>9} "
+        + " ".join(f"{stage:>10}" for stage in STAGES)
+    )
+  for name in names:
+    catalog = catalogs[name]
+    for shape in args.shapes:
+      for size in args.sizes:
+        timings, size_bytes = _run(catalog, backend, shape, size, args.iterations)
+        if args.json:
+          print(
+              json.dumps({
+                  "catalog": name,
+                  "backend": backend,
+                  "shape": shape,
+                  "components": size,
+                  "bytes": size_bytes,
+                  **{f"{stage}_ms": timings[stage] for stage in STAGES},
+              })
+          )
+          continue
+        print(
+            f"{name:>15} {shape:>9} {size:>10} {size_bytes:>9} "
+            + " ".join(f"{timings[stage]:>10.3f}" for stage in STAGES)
+        )
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,292 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synthetic A2UI payloads shared by the benchmark scripts."""
+
+import json
+import random
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from a2ui.core.schema.constants import (
+    A2UI_OPEN_TAG,
+    A2UI_CLOSE_TAG,
+    VERSION_0_8,
+    VERSION_0_9,
+)
+
+_WORDS = [
+    "flight",
+    "status",
+    "gate",
+    "boarding",
+    "café",
+    "order",
+    "total",
+    "confirm",
+    "cancel",
+    "details",
+]
+
+
+def _words(rng: random.Random, count: int) -> str:
+  return " ".join(rng.choice(_WORDS) for _ in range(count))
+
+
+def synthetic_messages(
+    num_components: int, surface_id: str = "bench", seed: int = 0
+) -> List[Dict[str, Any]]:
+  """Builds a v0.9 message list with a tree of `num_components` components.
+
+  The tree is a Column root whose children are Rows of Text, Button and Image
+  leaves, so that it exercises both `children` lists and single `child` refs.
+  """
+  rng = random.Random(seed)
+  components: List[Dict[str, Any]] = []
+  row_ids: List[str] = []
+  remaining = max(num_components - 1, 0)
+  row = 0
+  while remaining > 0:
+    row_id = f"row-{row}"
+    row_ids.append(row_id)
+    remaining -= 1
+    leaf_ids = []
+    for leaf in range(min(rng.randint(2, 5), remaining)):
+      leaf_id = f"{row_id}-leaf-{leaf}"
+      leaf_ids.append(leaf_id)
+      kind = leaf % 3
+      if kind == 0:
+        components.append({
+            "id": leaf_id,
+            "component": "Text",
+            "text": _words(rng, rng.randint(3, 12)),
+        })
+      elif kind == 1:
+        label_id = f"{leaf_id}-label"
+        components.append({
+            "id": leaf_id,
+            "component": "Button",
+            "child": label_id,
+            "action": {"event": {"name": "select", "context": {"row": row}}},
+        })
+        components.append({"id": label_id, "component": "Text", "text": "Go"})
+      else:
+        components.append({
+            "id": leaf_id,
+            "component": "Image",
+            "url": {"path": f"/items/{row}/image"},
+        })
+    remaining -= len(leaf_ids)
+    components.append({"id": row_id, "component": "Row", "children": leaf_ids})
+    row += 1
+  components.append({"id": "root", "component": "Column", "children": row_ids})
+
+  return [
+      {
+          "version": "v0.9",
+          "createSurface": {
+              "surfaceId": surface_id,
+              "catalogId": "https://a2ui.org/specification/v0_9/basic_catalog.json",
+          },
+      },
+      {
+          "version": "v0.9",
+          "updateComponents": {"surfaceId": surface_id, "components": components},
+      },
+      {
+          "version": "v0.9",
+          "updateDataModel": {
+              "surfaceId": surface_id,
+              "path": "/items",
+              "value": {
+                  str(i): {"image": f"https://example.com/{i}.png"} for i in range(row)
+              },
+          },
+      },
+  ]
+
+
+def _tree_parents(num_components: int, fan_out: int, spine: int) -> List[Optional[int]]:
+  """Returns the parent index of each component of a tree, None for the root.
+
+  The first `spine` components form a chain below the root. The other
+  components are attached breadth-first, at most `fan_out` per parent, with
+  the spine components as the first parents.
+  """
+  parents: List[Optional[int]] = [None]
+  spine = max(1, min(spine, num_components))
+  parents.extend(range(spine - 1))
+  child_counts = [0] * num_components
+  for index in range(1, spine):
+    child_counts[index - 1] = 1
+  parent = 0
+  for index in range(spine, num_components):
+    while child_counts[parent] >= fan_out:
+      parent += 1
+    parents.append(parent)
+    child_counts[parent] += 1
+  return parents
+
+
+# Tree shapes for `synthetic_tree_messages`, as (fan_out, spine) pairs.
+TREE_SHAPES = {
+    "wide": (100, 1),
+    "balanced": (4, 1),
+    "deep": (4, 40),
+}
+
+
+def synthetic_tree_messages(
+    num_components: int,
+    version: str = VERSION_0_9,
+    shape: str = "balanced",
+    surface_id: str = "bench",
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+  """Builds a message list with a tree of `num_components` Columns and Texts.
+
+  Every component with children is a Column and every leaf is a Text. One in
+  four Texts is bound to the data model, which the last message fills in.
+
+  Args:
+    num_components: The number of components, including the root.
+    version: VERSION_0_8 or VERSION_0_9.
+    shape: The tree shape, one of `TREE_SHAPES`.
+    surface_id: The surface of the messages.
+    seed: The random seed for the texts.
+  """
+  rng = random.Random(seed)
+  fan_out, spine = TREE_SHAPES[shape]
+  parents = _tree_parents(max(num_components, 1), fan_out, spine)
+  ids = ["root"] + [f"c{index}" for index in range(1, len(parents))]
+  children: List[List[str]] = [[] for _ in parents]
+  for index, parent in enumerate(parents):
+    if parent is not None:
+      children[parent].append(ids[index])
+
+  v08 = version == VERSION_0_8
+  components = []
+  bound = []
+  for index, component_id in enumerate(ids):
+    if children[index]:
+      if v08:
+        props = {"children": {"explicitList": children[index]}}
+        components.append({"id": component_id, "component": {"Column": props}})
+      else:
+        components.append({
+            "id": component_id,
+            "component": "Column",
+            "children": children[index],
+        })
+      continue
+    if index % 4 == 0:
+      bound.append(component_id)
+      text = {"path": f"/texts/{component_id}"}
+    else:
+      words = _words(rng, rng.randint(3, 12))
+      text = {"literalString": words} if v08 else words
+    if v08:
+      components.append({"id": component_id, "component": {"Text": {"text": text}}})
+    else:
+      components.append({"id": component_id, "component": "Text", "text": text})
+
+  if v08:
+    return [
+        {"beginRendering": {"surfaceId": surface_id, "root": "root"}},
+        {"surfaceUpdate": {"surfaceId": surface_id, "components": components}},
+        {
+            "dataModelUpdate": {
+                "surfaceId": surface_id,
+                "path": "/texts",
+                "contents": [
+                    {"key": key, "valueString": _words(rng, 3)} for key in bound
+                ],
+            }
+        },
+    ]
+  return [
+      {
+          "version": "v0.9",
+          "createSurface": {
+              "surfaceId": surface_id,
+              "catalogId": "https://a2ui.org/specification/v0_9/basic_catalog.json",
+          },
+      },
+      {
+          "version": "v0.9",
+          "updateComponents": {"surfaceId": surface_id, "components": components},
+      },
+      {
+          "version": "v0.9",
+          "updateDataModel": {
+              "surfaceId": surface_id,
+              "path": "/texts",
+              "value": {key: _words(rng, 3) for key in bound},
+          },
+      },
+  ]
+
+
+# A value followed by the closing bracket of its object or array.
+_LAST_VALUE = re.compile(r"(\S)(\n\s*[\]}])")
+
+
+def add_trailing_commas(payload: str) -> str:
+  """Damages an indented JSON payload with a trailing comma after every last item."""
+  return _LAST_VALUE.sub(r"\1,\2", payload)
+
+
+def synthetic_response(
+    num_components: int,
+    num_blocks: int = 1,
+    seed: int = 0,
+    text_words: int = 20,
+    fenced: bool = False,
+    damaged: bool = False,
+) -> str:
+  """Builds an LLM response with conversational text and A2UI blocks.
+
+  Args:
+    num_components: The number of components in each block.
+    num_blocks: The number of A2UI blocks.
+    seed: The random seed.
+    text_words: The number of words of text before each block.
+    fenced: Whether to wrap each payload in a markdown code fence.
+    damaged: Whether to add trailing commas that need repair.
+  """
+  rng = random.Random(seed)
+  pieces = []
+  for block in range(num_blocks):
+    pieces.append(_words(rng, text_words))
+    messages = synthetic_messages(
+        num_components, surface_id=f"surface-{block}", seed=seed + block
+    )
+    payload = json.dumps(messages, indent=2)
+    if damaged:
+      payload = add_trailing_commas(payload)
+    if fenced:
+      payload = f"```json\n{payload}\n```"
+    pieces.append(f"{A2UI_OPEN_TAG}\n{payload}\n{A2UI_CLOSE_TAG}")
+  pieces.append(_words(rng, 10))
+  return "\n".join(pieces)
+
+
+# Response shapes covering the main parser paths, keyed by name.
+RESPONSE_SHAPES: Dict[str, Callable[[], str]] = {
+    "small_blocks": lambda: synthetic_response(5, num_blocks=50),
+    "huge_block": lambda: synthetic_response(5000),
+    "fenced": lambda: synthetic_response(50, num_blocks=5, fenced=True),
+    "trailing_commas": lambda: synthetic_response(50, num_blocks=5, damaged=True),
+    "interleaved_text": lambda: synthetic_response(10, num_blocks=20, text_words=300),
+}
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import logging
-from typing import Any, Optional, List
+from typing import Any, AsyncIterable, AsyncIterator, List, Optional, Tuple
 
 from a2a.server.agent_execution import RequestContext
 from a2a.types import AgentExtension, Part, DataPart, TextPart
@@ -110,6 +110,7 @@ def parse_response_to_parts(
     content: str,
     validator: Optional[Any] = None,
     fallback_text: Optional[str] = None,
+    blocks: Optional[List[Tuple[int, int]]] = None,
 ) -> List[Part]:
   """Helper to parse LLM response content into A2A Parts, with optional validation.
 
@@ -117,6 +118,9 @@ def parse_response_to_parts(
       content: The LLM response content, potentially containing A2UI delimiters.
       validator: Optional validator to run against extracted JSON payloads.
       fallback_text: Optional text to return if no parts are successfully created.
+      blocks: The A2UI block offsets returned by
+        `a2ui.core.parser.parser.find_a2ui_blocks` for this content, if already
+        computed.
 
   Returns:
       A list of A2A Part objects (TextPart and/or DataPart).
@@ -125,7 +129,7 @@ def parse_response_to_parts(
 
   parts = []
   try:
-    response_parts = parse_response(content)
+    response_parts = parse_response(content, blocks)
 
     for part in response_parts:
       if part.text:
@@ -151,6 +155,88 @@ def parse_response_to_parts(
   return parts
 
 
+def _feed_stream_parser(parser: Any, chunk: Optional[str]) -> List[Any]:
+  """Feeds a chunk to a stream parser, or closes it if chunk is None.
+
+  Blocks that fail to parse are logged and skipped. The stream parser stays
+  usable after an error, so it is polled again for the parts that follow the
+  failing block.
+  """
+  while True:
+    try:
+      return parser.close() if chunk is None else parser.feed(chunk)
+    except ValueError as e:
+      logger.warning(f"Failed to parse A2UI block: {e}")
+      if chunk is not None:
+        chunk = ""
+
+
+async def stream_response_to_parts(
+    chunks: AsyncIterable[str],
+    validator: Optional[Any] = None,
+    fallback_text: Optional[str] = None,
+    incremental_messages: bool = False,
+) -> AsyncIterator[Part]:
+  """Parses a streamed LLM response into A2A Parts as the chunks arrive.
+
+  This is the streaming counterpart of `parse_response_to_parts`. Text is
+  yielded as TextParts while it is generated, and the messages of each A2UI
+  block are yielded as DataParts as soon as the block is complete, so callers
+  can forward partial UI (e.g. with `TaskUpdater.update_status`) before the
+  response ends. A block that fails to parse or validate is logged and
+  skipped; the parts before and after it are still yielded.
+
+  Args:
+      chunks: The LLM response chunks, potentially containing A2UI delimiters.
+      validator: Optional validator to run against extracted JSON payloads.
+      fallback_text: Optional text to yield if no parts are produced.
+      incremental_messages: If True, each message is yielded (and validated on
+        its own) as soon as its JSON object is complete instead of when the
+        closing tag arrives. Checks that span messages, such as finding the
+        root of a new surface, then do not apply.
+
+  Yields:
+      A2A Part objects (TextPart and/or DataPart).
+  """
+  from a2ui.core.parser.streaming import A2uiStreamParser
+
+  parser = A2uiStreamParser(incremental_messages=incremental_messages)
+  has_parts = False
+
+  def to_parts(response_parts: List[Any]) -> List[Part]:
+    parts = []
+    for part in response_parts:
+      if part.text:
+        parts.append(Part(root=TextPart(text=part.text)))
+        continue
+
+      json_data = part.a2ui_json
+      if validator:
+        try:
+          validator.validate(json_data)
+        except Exception as e:
+          logger.warning(f"Failed to validate A2UI block: {e}")
+          continue
+
+      if isinstance(json_data, list):
+        parts.extend(create_a2ui_part(message) for message in json_data)
+      else:
+        parts.append(create_a2ui_part(json_data))
+    return parts
+
+  async for chunk in chunks:
+    for part in to_parts(_feed_stream_parser(parser, chunk)):
+      has_parts = True
+      yield part
+
+  for part in to_parts(_feed_stream_parser(parser, None)):
+    has_parts = True
+    yield part
+
+  if not has_parts and fallback_text:
+    yield Part(root=TextPart(text=fallback_text))
+
+
 def try_activate_a2ui_extension(context: RequestContext) -> bool:
   """Activates the A2UI extension if requested.
 
@@ -88,7 +88,6 @@ Usage Examples:
 """
 
 import inspect
-import json
 import logging
 import re
 from typing import (
@@ -109,7 +108,7 @@ from a2ui.a2a import (
     create_a2ui_part,
     parse_response_to_parts,
 )
-from a2ui.core.parser.parser import has_a2ui_parts
+from a2ui.core.parser.parser import find_a2ui_blocks
 from a2ui.core.parser.payload_fixer import parse_and_fix
 from a2ui.core.schema.catalog import A2uiCatalog
 from google.adk.a2a.converters import part_converter
@@ -387,8 +386,12 @@ class A2uiPartConverter:
 
     # 3. Handle Text-based A2UI (TextPart)
     if text := part.text:
-      if has_a2ui_parts(text):
-        return parse_response_to_parts(text, validator=self._catalog.validator)
+      # Most text parts are plain conversation, which is rejected after a
+      # single scan. Otherwise the block offsets are reused for parsing.
+      if blocks := find_a2ui_blocks(text):
+        return parse_response_to_parts(
+            text, validator=self._catalog.validator, blocks=blocks
+        )
 
     # 4. Default conversion for other parts
     converted_part = part_converter.convert_genai_part_to_a2a_part(part)
@@ -0,0 +1,277 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pluggable JSON codec for the per-response hot paths.
+
+The SDK decodes every LLM payload and serializes schemas for every prompt. This
+module picks the fastest available backend (orjson, then msgspec) and falls
+back to the standard library `json` module when neither is installed. The
+backend can be forced with the `A2UI_JSON_BACKEND` environment variable or
+`set_backend()`. An unknown or uninstalled backend in the environment variable
+is ignored with a warning when the codec is selected.
+
+All backends produce the same output for the same input (minified or indented
+with two spaces, non-ASCII characters unescaped), except for the textual form
+of some floats. Decode errors are always reported as the standard library's
+`json.JSONDecodeError`, with the character position of the error and the
+backend's own description of it.
+"""
+
+import json
+import logging
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# The error raised by every backend for invalid documents.
+JSONDecodeError = json.JSONDecodeError
+
+BACKEND_ENV_VAR = "A2UI_JSON_BACKEND"
+
+ORJSON_BACKEND = "orjson"
+MSGSPEC_BACKEND = "msgspec"
+STDLIB_BACKEND = "json"
+
+# Preference order used when no backend is forced.
+_BACKEND_PREFERENCE = [ORJSON_BACKEND, MSGSPEC_BACKEND, STDLIB_BACKEND]
+
+# The non-standard constants accepted by the standard library's decoder, which
+# the native backends reject.
+_STDLIB_CONSTANTS = ("NaN", "Infinity", "-Infinity")
+
+# A msgspec decode error, e.g. "JSON is malformed: trailing comma in array
+# (byte 6)". Errors at the end of the input have no byte offset.
+_MSGSPEC_ERROR = re.compile(r"(?:JSON is malformed: )?(.*?)(?: \(byte (\d+)\))?")
+
+
+def _is_stdlib_constant(data: str, pos: int) -> bool:
+  """Whether a native decode error at `pos` is a constant like `NaN`.
+
+  Backends report `-Infinity` either at the minus sign or right after it.
+  """
+  return data.startswith(_STDLIB_CONSTANTS, pos) or (
+      pos > 0 and data.startswith(_STDLIB_CONSTANTS, pos - 1)
+  )
+
+
+class JsonCodec(ABC):
+  """Abstract base class for JSON backends."""
+
+  name: str
+
+  @abstractmethod
+  def loads(self, data: str) -> Any:
+    """Decodes a JSON document.
+
+    Raises:
+      json.JSONDecodeError: If the document is not valid JSON.
+    """
+    pass
+
+  @abstractmethod
+  def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """Encodes an object as JSON.
+
+    Args:
+      obj: The object to encode.
+      indent: Whether to indent the output with two spaces instead of
+        minifying it.
+      sort_keys: Whether to sort object keys.
+
+    Returns:
+      The JSON document as a string.
+    """
+    pass
+
+
+class StdlibJsonCodec(JsonCodec):
+  """Codec backed by the standard library `json` module."""
+
+  name = STDLIB_BACKEND
+
+  def loads(self, data: str) -> Any:
+    return json.loads(data)
+
+  def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    if indent:
+      return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    return json.dumps(
+        obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys
+    )
+
+
+_STDLIB_CODEC = StdlibJsonCodec()
+
+
+class OrjsonCodec(JsonCodec):
+  """Codec backed by orjson."""
+
+  name = ORJSON_BACKEND
+
+  def __init__(self):
+    import orjson
+
+    self._orjson = orjson
+
+  def loads(self, data: str) -> Any:
+    try:
+      return self._orjson.loads(data)
+    except self._orjson.JSONDecodeError as e:
+      # orjson is stricter than json: it rejects NaN and lone surrogates.
+      if _is_stdlib_constant(data, e.pos) or e.msg.startswith("str is not valid UTF-8"):
+        return _STDLIB_CODEC.loads(data)
+      raise JSONDecodeError(e.msg, data, e.pos) from None
+
+  def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    option = 0
+    if indent:
+      option |= self._orjson.OPT_INDENT_2
+    if sort_keys:
+      option |= self._orjson.OPT_SORT_KEYS
+    try:
+      return self._orjson.dumps(obj, option=option).decode("utf-8")
+    except TypeError:
+      # E.g. non-string dict keys, which json converts to strings.
+      return _STDLIB_CODEC.dumps(obj, indent=indent, sort_keys=sort_keys)
+
+
+class MsgspecCodec(JsonCodec):
+  """Codec backed by msgspec."""
+
+  name = MSGSPEC_BACKEND
+
+  def __init__(self):
+    import msgspec
+
+    self._msgspec = msgspec
+    self._encoder = msgspec.json.Encoder()
+    self._sorted_encoder = msgspec.json.Encoder(order="sorted")
+    self._decoder = msgspec.json.Decoder()
+
+  def loads(self, data: str) -> Any:
+    try:
+      return self._decoder.decode(data)
+    except UnicodeEncodeError:
+      # Lone surrogates, which json accepts, cannot be encoded for msgspec.
+      return _STDLIB_CODEC.loads(data)
+    except self._msgspec.DecodeError as e:
+      message, byte = _MSGSPEC_ERROR.fullmatch(str(e)).groups()
+      if byte is None:
+        pos = len(data)
+      elif data.isascii():
+        pos = int(byte)
+      else:
+        pos = len(data.encode("utf-8")[: int(byte)].decode("utf-8", "ignore"))
+      # msgspec is stricter than json: it rejects NaN.
+      if _is_stdlib_constant(data, pos):
+        return _STDLIB_CODEC.loads(data)
+      raise JSONDecodeError(message, data, pos) from None
+
+  def dumps(self, obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    encoder = self._sorted_encoder if sort_keys else self._encoder
+    try:
+      encoded = encoder.encode(obj)
+    except TypeError:
+      return _STDLIB_CODEC.dumps(obj, indent=indent, sort_keys=sort_keys)
+    if indent:
+      encoded = self._msgspec.json.format(encoded, indent=2)
+    return encoded.decode("utf-8")
+
+
+_CODEC_CLASSES = {
+    ORJSON_BACKEND: OrjsonCodec,
+    MSGSPEC_BACKEND: MsgspecCodec,
+    STDLIB_BACKEND: StdlibJsonCodec,
+}
+
+_codec: Optional[JsonCodec] = None
+
+
+def available_backends() -> List[str]:
+  """Returns the names of the backends that can be used in this environment."""
+  backends = []
+  for name in _BACKEND_PREFERENCE:
+    try:
+      _CODEC_CLASSES[name]()
+    except ImportError:
+      continue
+    backends.append(name)
+  return backends
+
+
+def create_codec(name: str) -> JsonCodec:
+  """Creates a codec for the given backend name.
+
+  Raises:
+    ValueError: If the backend name is unknown.
+    ImportError: If the backend is not installed.
+  """
+  if name not in _CODEC_CLASSES:
+    raise ValueError(
+        f"Unknown JSON backend: {name}. Supported: {list(_CODEC_CLASSES.keys())}"
+    )
+  return _CODEC_CLASSES[name]()
+
+
+def _select_codec() -> JsonCodec:
+  forced = os.environ.get(BACKEND_ENV_VAR)
+  if forced:
+    try:
+      return create_codec(forced)
+    except (ImportError, ValueError) as e:
+      logger.warning(
+          "Ignoring %s=%r, selecting a JSON backend automatically: %s",
+          BACKEND_ENV_VAR,
+          forced,
+          e,
+      )
+  for name in _BACKEND_PREFERENCE:
+    try:
+      return create_codec(name)
+    except ImportError:
+      logger.debug("JSON backend '%s' is not installed", name)
+  return _STDLIB_CODEC
+
+
+def get_codec() -> JsonCodec:
+  """Returns the active codec, selecting it on first use."""
+  global _codec
+  if _codec is None:
+    _codec = _select_codec()
+  return _codec
+
+
+def set_backend(name: Optional[str]) -> JsonCodec:
+  """Forces the active backend, or re-runs auto-selection if name is None.
+
+  Raises:
+    ValueError: If the backend name is unknown.
+    ImportError: If the backend is not installed.
+  """
+  global _codec
+  _codec = create_codec(name) if name else _select_codec()
+  return _codec
+
+
+def loads(data: str) -> Any:
+  """Decodes a JSON document with the active codec."""
+  return get_codec().loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+  """Encodes an object as JSON with the active codec."""
+  return get_codec().dumps(obj, indent=indent, sort_keys=sort_keys)
@@ -0,0 +1,196 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide counters and latency histograms for the SDK hot paths.
+
+The SDK records metrics such as how often LLM payloads need repair into the
+registry returned by `get_registry()`. Labels set with `metric_labels()` (for
+example the model name) are attached to every metric recorded in that context,
+so callers can break metrics down without passing labels through every API:
+
+  with metric_labels(model="gemini-2.5-flash"):
+    parts = parse_response(content)
+
+  print(get_registry().render_prometheus())
+"""
+
+import bisect
+import contextlib
+import contextvars
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+# Sorted (name, value) label pairs that identify one series of a metric.
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Upper bounds in seconds of the latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+)
+
+_context_labels: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "a2ui_metric_labels", default={}
+)
+
+
+@contextlib.contextmanager
+def metric_labels(**labels: str) -> Iterator[None]:
+  """Attaches labels to the metrics recorded within the context."""
+  token = _context_labels.set({**_context_labels.get(), **labels})
+  try:
+    yield
+  finally:
+    _context_labels.reset(token)
+
+
+@dataclass
+class Histogram:
+  """A latency histogram with cumulative bucket counts.
+
+  Attributes:
+    buckets: The upper bounds of the buckets.
+    counts: The number of observations in each bucket, plus one for the
+      observations above the last bound.
+    count: The total number of observations.
+    sum: The sum of all observations.
+  """
+
+  buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS
+  counts: List[int] = field(default_factory=list)
+  count: int = 0
+  sum: float = 0.0
+
+  def __post_init__(self):
+    if not self.counts:
+      self.counts = [0] * (len(self.buckets) + 1)
+
+  def observe(self, value: float) -> None:
+    self.counts[bisect.bisect_left(self.buckets, value)] += 1
+    self.count += 1
+    self.sum += value
+
+
+class MetricsRegistry:
+  """A thread-safe registry of labelled counters and histograms."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._counters: Dict[str, Dict[LabelSet, float]] = {}
+    self._histograms: Dict[str, Dict[LabelSet, Histogram]] = {}
+
+  @staticmethod
+  def _label_set(labels: Dict[str, str]) -> LabelSet:
+    context_labels = _context_labels.get()
+    if context_labels:
+      labels = {**context_labels, **labels}
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+  def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+    """Increments a counter."""
+    label_set = self._label_set(labels)
+    with self._lock:
+      series = self._counters.setdefault(name, {})
+      series[label_set] = series.get(label_set, 0) + amount
+
+  def observe(self, name: str, value: float, **labels: str) -> None:
+    """Records a value, usually a duration in seconds, in a histogram."""
+    label_set = self._label_set(labels)
+    with self._lock:
+      series = self._histograms.setdefault(name, {})
+      histogram = series.get(label_set)
+      if histogram is None:
+        histogram = series[label_set] = Histogram()
+      histogram.observe(value)
+
+  def counter(self, name: str, **labels: str) -> float:
+    """Returns the value of a counter series, summed over unspecified labels."""
+    wanted = {(k, str(v)) for k, v in labels.items()}
+    with self._lock:
+      return sum(
+          value
+          for label_set, value in self._counters.get(name, {}).items()
+          if wanted.issubset(label_set)
+      )
+
+  def snapshot(self) -> Dict[str, Dict[str, Dict[LabelSet, object]]]:
+    """Returns a copy of all counters and histograms."""
+    with self._lock:
+      return {
+          "counters": {name: dict(series) for name, series in self._counters.items()},
+          "histograms": {
+              name: {
+                  labels: Histogram(h.buckets, list(h.counts), h.count, h.sum)
+                  for labels, h in series.items()
+              }
+              for name, series in self._histograms.items()
+          },
+      }
+
+  def reset(self) -> None:
+    """Removes all recorded metrics."""
+    with self._lock:
+      self._counters.clear()
+      self._histograms.clear()
+
+  def render_prometheus(self) -> str:
+    """Renders all metrics in the Prometheus text exposition format."""
+
+    def fmt(label_set: LabelSet, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+      pairs = label_set + extra
+      if not pairs:
+        return ""
+      escaped = (
+          (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+          for k, v in pairs
+      )
+      return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+    snapshot = self.snapshot()
+    lines = []
+    for name, series in sorted(snapshot["counters"].items()):
+      lines.append(f"# TYPE {name} counter")
+      for label_set, value in sorted(series.items()):
+        lines.append(f"{name}{fmt(label_set)} {value}")
+    for name, series in sorted(snapshot["histograms"].items()):
+      lines.append(f"# TYPE {name} histogram")
+      for label_set, histogram in sorted(series.items()):
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+          cumulative += count
+          lines.append(
+              f"{name}_bucket{fmt(label_set, (('le', str(bound)),))} {cumulative}"
+          )
+        lines.append(
+            f"{name}_bucket{fmt(label_set, (('le', '+Inf'),))} {histogram.count}"
+        )
+        lines.append(f"{name}_sum{fmt(label_set)} {histogram.sum}")
+        lines.append(f"{name}_count{fmt(label_set)} {histogram.count}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+  """Returns the process-wide metrics registry."""
+  return _registry
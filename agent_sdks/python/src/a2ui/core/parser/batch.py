@@ -0,0 +1,108 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, TYPE_CHECKING
+from .parser import ResponsePart, parse_response
+
+if TYPE_CHECKING:
+  from ..schema.catalog import A2uiCatalog
+
+# The validator of the current process, built once by `_init_worker`.
+_worker_validator: Optional[Any] = None
+
+
+@dataclass
+class ParseResult:
+  """The outcome of parsing one response in a batch.
+
+  Attributes:
+      parts: The parsed ResponsePart objects. None if parsing or validation
+        failed.
+      error: The error raised while parsing or validating the response. None on
+        success.
+  """
+
+  parts: Optional[List[ResponsePart]] = None
+  error: Optional[Exception] = None
+
+  @property
+  def ok(self) -> bool:
+    return self.error is None
+
+
+def _init_worker(catalog: Optional["A2uiCatalog"]) -> None:
+  """Builds the validator once per worker process."""
+  global _worker_validator
+  _worker_validator = catalog.validator if catalog is not None else None
+
+
+def _parse_one(content: str) -> ParseResult:
+  try:
+    parts = parse_response(content)
+    if _worker_validator is not None:
+      for part in parts:
+        if part.a2ui_json is not None:
+          _worker_validator.validate(part.a2ui_json)
+    return ParseResult(parts=parts)
+  except Exception as e:
+    # Exceptions travel back to the parent process by pickling, which fails for
+    # some third-party exception types. The message is all callers rely on.
+    if not isinstance(e, ValueError):
+      e = ValueError(f"{type(e).__name__}: {e}")
+    return ParseResult(error=e)
+
+
+def parse_many(
+    responses: Iterable[str],
+    catalog: Optional["A2uiCatalog"] = None,
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+) -> List[ParseResult]:
+  """Parses and optionally validates many LLM responses across processes.
+
+  This is meant for offline workloads such as evaluation runs over stored model
+  responses. A failing response never aborts the batch; its error is reported
+  in its own ParseResult.
+
+  Args:
+      responses: The raw LLM responses.
+      catalog: Optional catalog to validate the A2UI JSON blocks against. The
+        catalog is sent to each worker once and its validator is built once
+        per worker.
+      workers: The number of worker processes. Defaults to the number of CPUs.
+        With 1 worker, responses are parsed in the current process.
+      chunksize: The number of responses sent to a worker at a time.
+
+  Returns:
+      One ParseResult per response, in input order.
+  """
+  responses = list(responses)
+  if workers is None:
+    workers = os.cpu_count() or 1
+  workers = max(1, min(workers, len(responses)))
+
+  if workers == 1:
+    _init_worker(catalog)
+    try:
+      return [_parse_one(content) for content in responses]
+    finally:
+      _init_worker(None)
+
+  with ProcessPoolExecutor(
+      max_workers=workers, initializer=_init_worker, initargs=(catalog,)
+  ) as executor:
+    return list(executor.map(_parse_one, responses, chunksize=chunksize))
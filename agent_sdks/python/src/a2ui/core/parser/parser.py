@@ -12,16 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import re
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Tuple
 from ..schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
 from .payload_fixer import parse_and_fix
 
-
-_A2UI_BLOCK_PATTERN = re.compile(
-    f"{re.escape(A2UI_OPEN_TAG)}(.*?){re.escape(A2UI_CLOSE_TAG)}", re.DOTALL
-)
+_MARKDOWN_FENCE = "```"
+_MARKDOWN_JSON_FENCE = "```json"
 
 
 @dataclass
@@ -38,65 +35,171 @@ class ResponsePart:
   a2ui_json: Optional[Any] = None
 
 
+@dataclass(frozen=True)
+class ResponseSpan:
+  """The offsets of one part of an LLM response.
+
+  Spans are half-open `[start, end)` offsets into the response and are already
+  trimmed: text spans exclude surrounding whitespace, and JSON spans exclude
+  the surrounding whitespace and markdown code fences.
+
+  Attributes:
+      text_start: The start of the conversational text.
+      text_end: The end of the conversational text.
+      json_start: The start of the A2UI JSON payload. None if this span only
+        contains trailing text.
+      json_end: The end of the A2UI JSON payload. None if this span only
+        contains trailing text.
+  """
+
+  text_start: int
+  text_end: int
+  json_start: Optional[int] = None
+  json_end: Optional[int] = None
+
+
+def find_a2ui_blocks(content: str) -> List[Tuple[int, int]]:
+  """Classifies the content by locating its A2UI blocks in a single scan.
+
+  Plain text without an opening tag is rejected after one `str.find` over the
+  content. The returned offsets can be passed to `parse_response` and
+  `find_response_spans` so that the content is not scanned again.
+
+  Args:
+      content: The raw LLM response.
+
+  Returns:
+      The `(open_tag_start, close_tag_start)` offsets of each complete A2UI
+      block, in order. Empty if the content has no complete block.
+  """
+  blocks = []
+  pos = 0
+  open_len = len(A2UI_OPEN_TAG)
+  while True:
+    start = content.find(A2UI_OPEN_TAG, pos)
+    if start < 0:
+      break
+    close = content.find(A2UI_CLOSE_TAG, start + open_len)
+    if close < 0:
+      break
+    blocks.append((start, close))
+    pos = close + len(A2UI_CLOSE_TAG)
+  return blocks
+
+
 def has_a2ui_parts(content: str) -> bool:
-  """Checks if the content has A2UI parts."""
-  return A2UI_OPEN_TAG in content and A2UI_CLOSE_TAG in content
+  """Checks if the content has at least one complete A2UI block."""
+  return bool(find_a2ui_blocks(content))
+
+
+def _strip_span(content: str, start: int, end: int) -> Tuple[int, int]:
+  """Returns the span with leading and trailing whitespace excluded."""
+  while start < end and content[start].isspace():
+    start += 1
+  while end > start and content[end - 1].isspace():
+    end -= 1
+  return start, end
+
+
+def _sanitize_json_span(content: str, start: int, end: int) -> Tuple[int, int]:
+  """Returns the span with whitespace and markdown code fences excluded."""
+  start, end = _strip_span(content, start, end)
+  if content.startswith(_MARKDOWN_JSON_FENCE, start, end):
+    start += len(_MARKDOWN_JSON_FENCE)
+  elif content.startswith(_MARKDOWN_FENCE, start, end):
+    start += len(_MARKDOWN_FENCE)
+  if content.endswith(_MARKDOWN_FENCE, start, end):
+    end -= len(_MARKDOWN_FENCE)
+  return _strip_span(content, start, end)
 
 
-def _sanitize_json_string(json_string: str) -> str:
-  """Sanitizes the JSON string by removing markdown code blocks."""
-  json_string = json_string.strip()
-  if json_string.startswith("```json"):
-    json_string = json_string[len("```json") :]
-  elif json_string.startswith("```"):
-    json_string = json_string[len("```") :]
-  if json_string.endswith("```"):
-    json_string = json_string[: -len("```")]
-  json_string = json_string.strip()
-  return json_string
+def _parse_json_span(content: str, start: int, end: int) -> Any:
+  """Sanitizes and parses the A2UI block content between the given offsets."""
+  start, end = _sanitize_json_span(content, start, end)
+  if start == end:
+    raise ValueError("A2UI JSON part is empty.")
+  return parse_and_fix(content[start:end])
 
 
-def parse_response(content: str) -> List[ResponsePart]:
+def _parse_json_block(json_string: str) -> Any:
+  """Sanitizes and parses the raw content of a single A2UI block."""
+  return _parse_json_span(json_string, 0, len(json_string))
+
+
+def find_response_spans(
+    content: str, blocks: Optional[List[Tuple[int, int]]] = None
+) -> List[ResponseSpan]:
   """
-  Parses the LLM response into a list of ResponsePart objects.
+  Locates the text and A2UI JSON regions of the LLM response without copying.
 
   Args:
       content: The raw LLM response.
+      blocks: The block offsets returned by `find_a2ui_blocks` for this
+        content, if already computed.
 
   Returns:
-      A list of ResponsePart objects.
+      A list of ResponseSpan objects, in the same order as the ResponsePart
+      objects returned by `parse_response`.
 
   Raises:
-      ValueError: If no A2UI tags are found or if the JSON part is invalid.
+      ValueError: If no A2UI tags are found.
   """
-  matches = list(_A2UI_BLOCK_PATTERN.finditer(content))
-
-  if not matches:
+  if blocks is None:
+    blocks = find_a2ui_blocks(content)
+  if not blocks:
     raise ValueError(
         f"A2UI tags '{A2UI_OPEN_TAG}' and '{A2UI_CLOSE_TAG}' not found in response."
     )
 
-  response_parts = []
+  spans = []
   last_end = 0
-
-  for match in matches:
-    start, end = match.span()
+  for start, close in blocks:
     # Text preceding the JSON block
-    text_part = content[last_end:start].strip()
-
+    text_start, text_end = _strip_span(content, last_end, start)
     # The JSON content within the tags
-    json_string = match.group(1)
-    json_string_cleaned = _sanitize_json_string(json_string)
-    if not json_string_cleaned:
-      raise ValueError("A2UI JSON part is empty.")
-
-    json_data = parse_and_fix(json_string_cleaned)
-    response_parts.append(ResponsePart(text=text_part, a2ui_json=json_data))
-    last_end = end
+    json_start, json_end = _sanitize_json_span(
+        content, start + len(A2UI_OPEN_TAG), close
+    )
+    spans.append(ResponseSpan(text_start, text_end, json_start, json_end))
+    last_end = close + len(A2UI_CLOSE_TAG)
 
   # Trailing text after the last JSON block
-  trailing_text = content[last_end:].strip()
-  if trailing_text:
-    response_parts.append(ResponsePart(text=trailing_text, a2ui_json=None))
+  text_start, text_end = _strip_span(content, last_end, len(content))
+  if text_start < text_end:
+    spans.append(ResponseSpan(text_start, text_end))
+
+  return spans
+
+
+def parse_response(
+    content: str, blocks: Optional[List[Tuple[int, int]]] = None
+) -> List[ResponsePart]:
+  """
+  Parses the LLM response into a list of ResponsePart objects.
+
+  Each JSON payload is copied out of the response exactly once, straight into
+  the JSON decoder.
+
+  Args:
+      content: The raw LLM response.
+      blocks: The block offsets returned by `find_a2ui_blocks` for this
+        content, if already computed.
+
+  Returns:
+      A list of ResponsePart objects.
+
+  Raises:
+      ValueError: If no A2UI tags are found or if the JSON part is invalid.
+  """
+  response_parts = []
+  for span in find_response_spans(content, blocks):
+    text_part = content[span.text_start : span.text_end]
+    if span.json_start is None:
+      response_parts.append(ResponsePart(text=text_part, a2ui_json=None))
+      continue
+    if span.json_start == span.json_end:
+      raise ValueError("A2UI JSON part is empty.")
+    json_data = parse_and_fix(content[span.json_start : span.json_end])
+    response_parts.append(ResponsePart(text=text_part, a2ui_json=json_data))
 
   return response_parts
@@ -12,14 +12,90 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import collections
 import logging
 import re
-from typing import Any, Dict, List
-
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from .. import codec
+from ..metrics import get_registry
 
 logger = logging.getLogger(__name__)
 
+# Kinds of fixes applied by `repair_json`.
+FIX_TRAILING_COMMA = "trailing_comma"
+FIX_UNCLOSED_BRACKET = "unclosed_bracket"
+FIX_UNCLOSED_STRING = "unclosed_string"
+FIX_SINGLE_QUOTES = "single_quotes"
+FIX_CONTROL_CHARACTER = "control_character"
+FIX_MARKDOWN_FENCE = "markdown_fence"
+
+# Outcomes of `parse_and_fix`.
+OUTCOME_OK = "ok"
+OUTCOME_REPAIRED = "repaired"
+OUTCOME_FAILED = "failed"
+
+# Metrics recorded in the registry of `a2ui.core.metrics`.
+PARSE_TOTAL_METRIC = "a2ui_payload_parse_total"
+PARSE_SECONDS_METRIC = "a2ui_payload_parse_seconds"
+FIXES_TOTAL_METRIC = "a2ui_payload_fixes_total"
+
+# A comma followed by a closing bracket, possibly inside a string.
+_TRAILING_COMMA = re.compile(r",(?=\s*[\]}])")
+# Removes the trailing commas outside of double-quoted strings when replaced
+# with `\1`. Each match is a run of other tokens and complete strings, followed
+# by a trailing comma if there is one.
+_TRAILING_COMMAS_OUTSIDE_STRINGS = re.compile(
+    r'((?:[^",]+|"[^"\\]*(?:\\.[^"\\]*)*"|,(?!\s*[\]}]))*),?'
+)
+# Characters that need attention outside of strings.
+_SPECIAL = re.compile(r"[\"',\[\]{}`]")
+# Characters that need attention inside double- and single-quoted strings.
+_DOUBLE_QUOTED_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+_SINGLE_QUOTED_SPECIAL = re.compile(r"['\"\\\x00-\x1f]")
+_WHITESPACE = re.compile(r"\s*")
+_MARKDOWN_FENCE = re.compile(r"```[A-Za-z0-9_-]*")
+_CLOSERS = {"[": "]", "{": "}"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+
+
+@dataclass(frozen=True)
+class PayloadFix:
+  """A single repair applied to a JSON payload.
+
+  Attributes:
+    kind: The kind of fix, one of the `FIX_*` constants.
+    offset: The offset in the original payload where the fix was applied.
+  """
+
+  kind: str
+  offset: int
+
+
+@dataclass
+class ParseDiagnostics:
+  """Describes how a payload was parsed by `parse_and_fix_with_diagnostics`.
+
+  Attributes:
+    outcome: One of the `OUTCOME_*` constants.
+    attempts: The number of parse attempts: 1, plus 1 for the trailing comma
+      repair if it found any, plus 1 if the full `repair_json` was needed.
+    fixes: The repairs applied to the payload.
+    initial_error: The error of the first parse attempt, if it failed.
+    duration: The time spent parsing and repairing, in seconds.
+  """
+
+  outcome: str = OUTCOME_OK
+  attempts: int = 0
+  fixes: List[PayloadFix] = field(default_factory=list)
+  initial_error: Optional[str] = None
+  duration: float = 0.0
+
+  @property
+  def repaired(self) -> bool:
+    return self.outcome == OUTCOME_REPAIRED
+
 
 def parse_and_fix(payload: str) -> List[Dict[str, Any]]:
   """Validates and applies autofixes to a raw JSON string and returns the parsed payload.
@@ -29,46 +105,251 @@ def parse_and_fix(payload: str) -> List[Dict[str, Any]]:
 
   Returns:
     A parsed and potentially fixed payload (list of dicts).
+
+  Raises:
+    ValueError: If the payload cannot be parsed even after repair. The error
+      describes the original payload.
   """
+  return parse_and_fix_with_diagnostics(payload)[0]
+
+
+def parse_and_fix_with_diagnostics(
+    payload: str,
+) -> Tuple[List[Dict[str, Any]], ParseDiagnostics]:
+  """Like `parse_and_fix`, but also returns how the payload was parsed.
+
+  The outcome, applied fixes and latency are also recorded in the process-wide
+  metrics registry, labelled with any `a2ui.core.metrics.metric_labels`.
+
+  Args:
+    payload: The raw JSON string from the LLM.
+
+  Returns:
+    A tuple of the parsed payload and its ParseDiagnostics.
+
+  Raises:
+    ValueError: If the payload cannot be parsed even after repair. The error
+      describes the original payload.
+  """
+  diagnostics = ParseDiagnostics()
+  start = time.perf_counter()
   try:
-    a2ui_json = _parse(payload)
-    return a2ui_json
-  except (
-      json.JSONDecodeError,
-      ValueError,
-  ) as e:
-    logger.warning(f"Initial A2UI payload validation failed: {e}")
-    updated_payload = _remove_trailing_commas(payload)
-    a2ui_json = _parse(updated_payload)
-    return a2ui_json
+    diagnostics.attempts = 1
+    try:
+      return _parse(payload), diagnostics
+    except ValueError as e:
+      diagnostics.outcome = OUTCOME_FAILED
+      diagnostics.initial_error = str(e)
+      logger.warning(f"Initial A2UI payload validation failed: {e}")
+      repaired_payload, fixes = _remove_trailing_commas(payload)
+      if fixes:
+        diagnostics.fixes = fixes
+        diagnostics.attempts += 1
+        try:
+          parsed = _parse(repaired_payload, log_errors=False)
+        except ValueError:
+          pass
+        else:
+          logger.info(f"Applied {len(fixes)} autofix(es) to LLM output.")
+          diagnostics.outcome = OUTCOME_REPAIRED
+          return parsed, diagnostics
+      repaired_payload, fixes = repair_json(payload)
+      if not fixes:
+        raise
+      diagnostics.fixes = fixes
+      logger.info(f"Applied {len(fixes)} autofix(es) to LLM output.")
+      diagnostics.attempts += 1
+      try:
+        parsed = _parse(repaired_payload)
+      except ValueError:
+        raise e
+      diagnostics.outcome = OUTCOME_REPAIRED
+      return parsed, diagnostics
+  finally:
+    diagnostics.duration = time.perf_counter() - start
+    _record_metrics(diagnostics)
 
 
-def _parse(payload: str) -> List[Dict[str, Any]]:
+def _record_metrics(diagnostics: ParseDiagnostics) -> None:
+  registry = get_registry()
+  registry.increment(PARSE_TOTAL_METRIC, outcome=diagnostics.outcome)
+  registry.observe(PARSE_SECONDS_METRIC, diagnostics.duration)
+  counts = collections.Counter(fix.kind for fix in diagnostics.fixes)
+  for kind, count in counts.items():
+    registry.increment(
+        FIXES_TOTAL_METRIC, count, kind=kind, outcome=diagnostics.outcome
+    )
+
+
+def _parse(payload: str, log_errors: bool = True) -> List[Dict[str, Any]]:
   """Parses the payload and returns a list of A2UI JSON objects."""
   try:
-    a2ui_json = json.loads(payload)
+    a2ui_json = codec.loads(payload)
     if not isinstance(a2ui_json, list):
       logger.info("Received a single JSON object, wrapping in a list for validation.")
       a2ui_json = [a2ui_json]
     return a2ui_json
-  except json.JSONDecodeError as e:
-    logger.error(f"Failed to parse JSON: {e}")
+  except codec.JSONDecodeError as e:
+    if log_errors:
+      logger.error(f"Failed to parse JSON: {e}")
     raise ValueError(f"Failed to parse JSON: {e}")
 
 
-def _remove_trailing_commas(json_str: str) -> str:
-  """Attempts to remove trailing commas from a JSON string.
+def _remove_trailing_commas(payload: str) -> Tuple[str, List[PayloadFix]]:
+  """Removes the trailing commas outside of strings at regex speed.
+
+  This is the cheap first repair of `parse_and_fix_with_diagnostics`: it only
+  fixes trailing commas in otherwise valid JSON, which is by far the most
+  common mistake, while `repair_json` fixes everything one token at a time.
+
+  Returns:
+    A tuple of the repaired JSON string and the list of applied fixes. If a
+    trailing comma may be inside a string, the payload is returned unchanged
+    without fixes and is left to `repair_json`.
+  """
+  offsets = [match.start() for match in _TRAILING_COMMA.finditer(payload)]
+  if not offsets:
+    return payload, []
+  if '\\"' not in payload:
+    # Every quote delimits a string, so a comma is outside of strings if an
+    # even number of quotes precede it.
+    pieces = []
+    quotes = 0
+    previous = 0
+    for offset in offsets:
+      quotes += payload.count('"', previous, offset)
+      if quotes % 2:
+        return payload, []
+      pieces.append(payload[previous:offset])
+      previous = offset + 1
+    pieces.append(payload[previous:])
+    repaired = "".join(pieces)
+  else:
+    repaired = _TRAILING_COMMAS_OUTSIDE_STRINGS.sub(r"\1", payload)
+    # Each removed comma is one character; if they are all removed, none of
+    # them was inside a string.
+    if len(payload) - len(repaired) != len(offsets):
+      return payload, []
+  return repaired, [PayloadFix(FIX_TRAILING_COMMA, offset) for offset in offsets]
+
+
+def _escape_control_character(char: str) -> str:
+  return _CONTROL_ESCAPES.get(char) or f"\\u{ord(char):04x}"
+
+
+def repair_json(payload: str) -> Tuple[str, List[PayloadFix]]:
+  """Repairs common LLM JSON mistakes in a single string-aware pass.
+
+  `parse_and_fix` only uses this when removing trailing commas with a regex is
+  not enough, as this pass is several times slower.
+
+  The following problems are fixed:
+  - Trailing commas before a closing bracket or at the end of the payload.
+  - Brackets and strings left open at the end of the payload.
+  - Single-quoted keys and strings.
+  - Unescaped newlines and other control characters inside strings.
+  - Stray markdown code fences outside of strings.
+
+  String contents are never modified except for escaping, so text like
+  `", ]"` inside a string is preserved.
 
   Args:
-    json_str: The raw JSON string from the LLM.
+    payload: The raw JSON string from the LLM.
 
   Returns:
-    A potentially fixed JSON string.
+    A tuple of the repaired JSON string and the list of applied fixes. The
+    string is returned unchanged if no fixes were needed.
   """
-  # Fix trailing commas: identifying commas followed by optional whitespace and a closing bracket (]) or brace (}).
-  fixed_json = re.sub(r",(?=\s*[\]}])", "", json_str)
+  out: List[str] = []
+  fixes: List[PayloadFix] = []
+  stack: List[str] = []
+  n = len(payload)
+  i = 0
+
+  def scan_string(start: int, quote: str) -> int:
+    """Copies the string starting at `start` and returns the offset after it."""
+    single = quote == "'"
+    if single:
+      fixes.append(PayloadFix(FIX_SINGLE_QUOTES, start))
+    special = _SINGLE_QUOTED_SPECIAL if single else _DOUBLE_QUOTED_SPECIAL
+    out.append('"')
+    j = start + 1
+    while True:
+      match = special.search(payload, j)
+      if not match:
+        out.append(payload[j:])
+        out.append('"')
+        fixes.append(PayloadFix(FIX_UNCLOSED_STRING, n))
+        return n
+      k = match.start()
+      out.append(payload[j:k])
+      char = payload[k]
+      if char == quote:
+        out.append('"')
+        return k + 1
+      if char == "\\":
+        if k + 1 >= n:
+          # A dangling escape at the end of the payload cannot be kept.
+          out.append('"')
+          fixes.append(PayloadFix(FIX_UNCLOSED_STRING, n))
+          return n
+        escaped = payload[k + 1]
+        # \' is not a valid JSON escape; inside a single-quoted string it is
+        # just an apostrophe.
+        out.append("'" if single and escaped == "'" else payload[k : k + 2])
+        j = k + 2
+      elif char == '"':
+        # Only reached in single-quoted strings.
+        out.append('\\"')
+        j = k + 1
+      else:
+        out.append(_escape_control_character(char))
+        fixes.append(PayloadFix(FIX_CONTROL_CHARACTER, k))
+        j = k + 1
+
+  while i < n:
+    match = _SPECIAL.search(payload, i)
+    if not match:
+      out.append(payload[i:])
+      break
+    k = match.start()
+    out.append(payload[i:k])
+    char = payload[k]
+    if char == '"' or char == "'":
+      i = scan_string(k, char)
+    elif char == ",":
+      next_offset = _WHITESPACE.match(payload, k + 1).end()
+      if next_offset >= n or payload[next_offset] in "]}":
+        fixes.append(PayloadFix(FIX_TRAILING_COMMA, k))
+      else:
+        out.append(char)
+      i = k + 1
+    elif char == "[" or char == "{":
+      stack.append(_CLOSERS[char])
+      out.append(char)
+      i = k + 1
+    elif char == "]" or char == "}":
+      if char in stack:
+        # Close any brackets the LLM forgot before this one.
+        while stack[-1] != char:
+          out.append(stack.pop())
+          fixes.append(PayloadFix(FIX_UNCLOSED_BRACKET, k))
+        stack.pop()
+      out.append(char)
+      i = k + 1
+    else:  # Backtick
+      fence = _MARKDOWN_FENCE.match(payload, k)
+      if fence:
+        fixes.append(PayloadFix(FIX_MARKDOWN_FENCE, k))
+        i = fence.end()
+      else:
+        out.append(char)
+        i = k + 1
 
-  if fixed_json != json_str:
-    logger.warning("Detected trailing commas in LLM output; applied autofix.")
+  while stack:
+    out.append(stack.pop())
+    fixes.append(PayloadFix(FIX_UNCLOSED_BRACKET, n))
 
-  return fixed_json
+  if not fixes:
+    return payload, fixes
+  return "".join(out), fixes
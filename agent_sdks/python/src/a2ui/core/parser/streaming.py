@@ -0,0 +1,396 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import re
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+from ..schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
+from .parser import ResponsePart, _parse_json_block
+from .payload_fixer import parse_and_fix
+
+# Characters that change the scanner state outside and inside JSON strings.
+# Single-quoted strings are tracked too, as `parse_and_fix` repairs them.
+_TOP_LEVEL_START = re.compile(r"[\[{]")
+_STRUCTURAL = re.compile(r"[\[\]{}\"']")
+_STRING_SPECIAL = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+
+
+class _OrderedResults:
+  """A queue of results and errors that preserves their relative order.
+
+  `flush()` returns the results that precede the first queued error, or raises
+  that error if it is at the head of the queue. This lets push-style parsers
+  report a failure without losing the results produced around it.
+  """
+
+  def __init__(self):
+    self._items: Deque[Tuple[Any, Optional[ValueError]]] = collections.deque()
+
+  def append(self, item: Any) -> None:
+    self._items.append((item, None))
+
+  def fail(self, error: ValueError) -> None:
+    self._items.append((None, error))
+
+  def flush(self) -> List[Any]:
+    results = []
+    while self._items:
+      item, error = self._items[0]
+      if error is not None:
+        if results:
+          return results
+        self._items.popleft()
+        raise error
+      results.append(item)
+      self._items.popleft()
+    return results
+
+  def drain(self) -> List[Any]:
+    """Returns all queued results and errors in order, and empties the queue."""
+    items = [item if error is None else error for item, error in self._items]
+    self._items.clear()
+    return items
+
+
+def _partial_tag_suffix_len(content: str, tag: str) -> int:
+  """Returns the length of the longest suffix of content that is a prefix of tag."""
+  for length in range(min(len(tag) - 1, len(content)), 0, -1):
+    if content.endswith(tag[:length]):
+      return length
+  return 0
+
+
+class A2uiMessageScanner:
+  """Incrementally splits a streamed A2UI JSON payload into messages.
+
+  The payload is usually a JSON array of A2UI messages. The scanner tracks
+  bracket depth and string/escape state, for both double-quoted strings and
+  the single-quoted strings that `parse_and_fix` repairs, and each top-level
+  message object is
+  decoded as soon as its closing brace arrives, so that the first messages can
+  be rendered while the rest of the array is still being generated. A payload
+  consisting of a single object is emitted as one message once it is complete.
+  Content before the first bracket (e.g. a markdown fence) and after the
+  top-level value is ignored.
+
+  If a message fails to decode, the messages before it are returned first and
+  the ValueError is raised by the next call to `feed()` or `close()`. The
+  scanner stays usable, so callers can keep feeding to get the later messages.
+  """
+
+  def __init__(self):
+    self._pieces: List[str] = []
+    self._depth = 0
+    # The quote of the string being scanned, if any.
+    self._quote: Optional[str] = None
+    self._escape = False
+    self._started = False
+    self._finished = False
+    self._closed = False
+    self._top_level_array = False
+    self._results = _OrderedResults()
+
+  def feed(self, chunk: str) -> List[Dict[str, Any]]:
+    """Consumes a chunk of the payload.
+
+    Args:
+        chunk: The next piece of the JSON payload.
+
+    Returns:
+        The messages completed by this chunk.
+
+    Raises:
+        ValueError: If a previously completed message is invalid.
+    """
+    self._push(chunk)
+    return self._results.flush()
+
+  def close(self) -> List[Dict[str, Any]]:
+    """Signals the end of the payload.
+
+    Returns:
+        The remaining messages.
+
+    Raises:
+        ValueError: If a message is invalid, or the payload is empty or
+          incomplete.
+    """
+    self._finish()
+    return self._results.flush()
+
+  def scan(
+      self, chunk: str, final: bool = False
+  ) -> List[Union[Dict[str, Any], ValueError]]:
+    """Like `feed()`, or `close()` if `final`, but returns errors in place.
+
+    Args:
+        chunk: The next piece of the JSON payload.
+        final: Whether the chunk is the end of the payload.
+
+    Returns:
+        The messages completed by this chunk and the ValueErrors of the
+        invalid ones, in the order they appear in the payload. If `final`,
+        this ends with a ValueError if the payload is empty or incomplete.
+    """
+    self._push(chunk)
+    if final:
+      self._finish()
+    return self._results.drain()
+
+  def _push(self, chunk: str) -> None:
+    """Scans a chunk and queues the messages and errors it completes."""
+    if self._finished:
+      return
+
+    # Offset in the chunk where the message in progress starts, if any.
+    start = 0 if self._pieces else -1
+    i = 0
+    n = len(chunk)
+    while i < n:
+      if self._quote is not None:
+        if self._escape:
+          self._escape = False
+          i += 1
+          continue
+        match = _STRING_SPECIAL[self._quote].search(chunk, i)
+        if not match:
+          break
+        i = match.start()
+        if chunk[i] == "\\":
+          self._escape = True
+        else:
+          self._quote = None
+        i += 1
+        continue
+
+      if not self._started:
+        match = _TOP_LEVEL_START.search(chunk, i)
+        if not match:
+          break
+        i = match.start()
+        self._started = True
+        self._top_level_array = chunk[i] == "["
+        if not self._top_level_array:
+          start = i
+        self._depth = 1
+        i += 1
+        continue
+
+      match = _STRUCTURAL.search(chunk, i)
+      if not match:
+        break
+      i = match.start()
+      char = chunk[i]
+      if char == '"' or char == "'":
+        self._quote = char
+      elif char == "[" or char == "{":
+        if self._depth == 1 and self._top_level_array and char == "{":
+          start = i
+        self._depth += 1
+      else:
+        self._depth -= 1
+        if self._depth == 1 and self._top_level_array and start >= 0:
+          self._emit("".join(self._pieces) + chunk[start : i + 1])
+          self._pieces = []
+          start = -1
+        elif self._depth == 0:
+          if not self._top_level_array:
+            self._emit("".join(self._pieces) + chunk[start : i + 1])
+            self._pieces = []
+          start = -1
+          self._finished = True
+          break
+      i += 1
+
+    if start >= 0:
+      self._pieces.append(chunk[start:])
+
+  def _emit(self, message_json: str) -> None:
+    try:
+      self._results.append(parse_and_fix(message_json)[0])
+    except ValueError as e:
+      self._results.fail(e)
+
+  def _finish(self) -> None:
+    """Queues an error if the payload ended prematurely."""
+    if self._closed:
+      return
+    self._closed = True
+    if not self._started:
+      self._results.fail(ValueError("A2UI JSON part is empty."))
+    elif not self._finished:
+      self._results.fail(ValueError("A2UI JSON payload is incomplete."))
+
+
+class A2uiStreamParser:
+  """Incrementally parses an LLM token stream into ResponsePart objects.
+
+  Chunks are pushed with `feed()` as they arrive from the model and `close()`
+  is called once the stream ends. Conversational text is emitted as soon as it
+  can no longer be the start of an A2UI tag, and each A2UI block is emitted as
+  soon as its closing tag arrives. Tags may be split across chunk boundaries.
+
+  Unlike `parse_response`, text and A2UI JSON are never combined in the same
+  ResponsePart: text parts have `a2ui_json=None` and block parts have
+  `text=""`. Whitespace around blocks is trimmed the same way as in
+  `parse_response`.
+
+  If a block fails to parse, the parts before it are returned first and the
+  ValueError is raised by the next call to `feed()` or `close()`. The parser
+  stays usable after an error, so callers can keep feeding chunks (or call
+  `close()` again) to recover the remaining parts.
+
+  Args:
+      incremental_messages: If True, each message of a block is emitted as its
+        own ResponsePart (with `a2ui_json` set to a one-element list) as soon as
+        its JSON object is complete, instead of waiting for the closing tag.
+  """
+
+  def __init__(self, incremental_messages: bool = False):
+    self._incremental_messages = incremental_messages
+    self._buffer = ""
+    self._block_chunks: List[str] = []
+    self._scanner: Optional[A2uiMessageScanner] = None
+    self._in_block = False
+    self._at_segment_start = True
+    self._closed = False
+    self._results = _OrderedResults()
+
+  @property
+  def in_block(self) -> bool:
+    """Whether the parser is currently inside an unterminated A2UI block."""
+    return self._in_block
+
+  def feed(self, chunk: str) -> List[ResponsePart]:
+    """Consumes a chunk of the stream.
+
+    Args:
+        chunk: The next piece of the LLM response.
+
+    Returns:
+        The ResponsePart objects that became complete with this chunk.
+
+    Raises:
+        ValueError: If a previously closed A2UI block is invalid.
+    """
+    self._buffer += chunk
+    self._drain(final=False)
+    return self._results.flush()
+
+  def close(self) -> List[ResponsePart]:
+    """Flushes the remaining buffered content at the end of the stream.
+
+    Returns:
+        The remaining ResponsePart objects.
+
+    Raises:
+        ValueError: If an A2UI block is invalid or was never closed.
+    """
+    if not self._closed:
+      self._closed = True
+      self._drain(final=True)
+      if self._in_block:
+        self._in_block = False
+        self._block_chunks = []
+        self._scanner = None
+        self._buffer = ""
+        self._results.fail(
+            ValueError(f"A2UI block is missing the closing tag '{A2UI_CLOSE_TAG}'.")
+        )
+    return self._results.flush()
+
+  def _emit_text(self, text: str) -> None:
+    if self._at_segment_start:
+      text = text.lstrip()
+    if text:
+      self._results.append(ResponsePart(text=text, a2ui_json=None))
+      self._at_segment_start = False
+
+  def _begin_block(self) -> None:
+    self._in_block = True
+    if self._incremental_messages:
+      self._scanner = A2uiMessageScanner()
+
+  def _add_block_content(self, content: str) -> None:
+    if self._scanner is None:
+      self._block_chunks.append(content)
+      return
+    self._add_scanned(self._scanner.scan(content))
+
+  def _end_block(self) -> None:
+    self._in_block = False
+    self._at_segment_start = True
+
+    if self._scanner is not None:
+      self._add_scanned(self._scanner.scan("", final=True))
+      self._scanner = None
+      return
+
+    json_string = "".join(self._block_chunks)
+    self._block_chunks = []
+    try:
+      self._results.append(
+          ResponsePart(text="", a2ui_json=_parse_json_block(json_string))
+      )
+    except ValueError as e:
+      self._results.fail(e)
+
+  def _add_scanned(self, scanned: List[Union[Dict[str, Any], ValueError]]) -> None:
+    """Adds the messages and errors returned by the scanner to the results."""
+    for item in scanned:
+      if isinstance(item, ValueError):
+        self._results.fail(item)
+      else:
+        self._results.append(ResponsePart(text="", a2ui_json=[item]))
+
+  def _drain(self, final: bool) -> None:
+    while True:
+      if self._in_block:
+        end = self._buffer.find(A2UI_CLOSE_TAG)
+        if end < 0:
+          # Move everything that cannot be part of the closing tag out of the
+          # buffer so that long blocks are not re-scanned on every chunk.
+          keep = _partial_tag_suffix_len(self._buffer, A2UI_CLOSE_TAG)
+          if len(self._buffer) > keep:
+            self._add_block_content(self._buffer[: len(self._buffer) - keep])
+            self._buffer = self._buffer[len(self._buffer) - keep :]
+          return
+
+        self._add_block_content(self._buffer[:end])
+        self._buffer = self._buffer[end + len(A2UI_CLOSE_TAG) :]
+        self._end_block()
+        continue
+
+      start = self._buffer.find(A2UI_OPEN_TAG)
+      if start >= 0:
+        # Text preceding the JSON block
+        self._emit_text(self._buffer[:start].rstrip())
+        self._buffer = self._buffer[start + len(A2UI_OPEN_TAG) :]
+        self._begin_block()
+        continue
+
+      if final:
+        self._emit_text(self._buffer.rstrip())
+        self._buffer = ""
+        return
+
+      # Hold back a possible partial opening tag and trailing whitespace, which
+      # is dropped if a block follows.
+      safe_end = len(self._buffer) - _partial_tag_suffix_len(
+          self._buffer, A2UI_OPEN_TAG
+      )
+      text = self._buffer[:safe_end].rstrip()
+      self._emit_text(text)
+      self._buffer = self._buffer[len(text) :]
+      return
@@ -0,0 +1,93 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, OrderedDict, TypeVar
+
+from .. import codec
+
+V = TypeVar("V")
+
+
+def content_hash(obj: Any) -> str:
+  """Returns a stable SHA-256 hex digest of a JSON-compatible object."""
+  return hashlib.sha256(codec.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+  """Usage statistics of an LruCache.
+
+  Attributes:
+    hits: The number of lookups that found a cached value.
+    misses: The number of lookups that had to create the value.
+    size: The number of cached values.
+    maxsize: The maximum number of cached values.
+  """
+
+  hits: int
+  misses: int
+  size: int
+  maxsize: int
+
+
+class LruCache(Generic[V]):
+  """A thread-safe cache with least-recently-used eviction and hit/miss stats."""
+
+  def __init__(self, maxsize: int):
+    if maxsize < 1:
+      raise ValueError(f"Cache maxsize must be positive, got {maxsize}")
+    self._maxsize = maxsize
+    self._entries: OrderedDict[Hashable, V] = collections.OrderedDict()
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+
+  def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+    """Returns the cached value for key, creating it with factory on a miss.
+
+    The factory runs outside of the lock, so two threads missing on the same
+    key at once may both create the value; the first one stored wins.
+    """
+    with self._lock:
+      if key in self._entries:
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+      self._misses += 1
+
+    value = factory()
+
+    with self._lock:
+      if key in self._entries:
+        self._entries.move_to_end(key)
+        return self._entries[key]
+      self._entries[key] = value
+      if len(self._entries) > self._maxsize:
+        self._entries.popitem(last=False)
+      return value
+
+  def stats(self) -> CacheStats:
+    with self._lock:
+      return CacheStats(self._hits, self._misses, len(self._entries), self._maxsize)
+
+  def clear(self) -> None:
+    """Removes all cached values and resets the stats."""
+    with self._lock:
+      self._entries.clear()
+      self._hits = 0
+      self._misses = 0
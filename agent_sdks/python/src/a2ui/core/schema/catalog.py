@@ -12,15 +12,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import copy
-import json
+import functools
 import logging
 import os
 from dataclasses import dataclass, field, replace
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
-
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, TYPE_CHECKING
+
+from .. import codec
+from .cache import CacheStats, LruCache, content_hash
+from .compaction import (
+    SHARED_SCHEMA_ID,
+    dedupe_subschemas,
+    estimate_tokens,
+    strip_annotations,
+)
 from .catalog_provider import A2uiCatalogProvider, FileSystemCatalogProvider
 from .constants import CATALOG_COMPONENTS_KEY, CATALOG_ID_KEY
+from .pruning import prune_unreferenced_definitions
 
 
 @dataclass
@@ -53,6 +61,23 @@ class CatalogConfig:
     )
 
 
+# The maximum number of pruned catalogs kept by
+# `A2uiCatalog.with_pruned_components`.
+PRUNED_CATALOG_CACHE_SIZE = 64
+
+_pruned_catalog_cache: LruCache["A2uiCatalog"] = LruCache(PRUNED_CATALOG_CACHE_SIZE)
+
+
+def pruned_catalog_cache_stats() -> CacheStats:
+  """Returns the hit/miss stats of the pruned catalog cache."""
+  return _pruned_catalog_cache.stats()
+
+
+def clear_pruned_catalog_cache() -> None:
+  """Drops all cached pruned catalogs and resets the stats."""
+  _pruned_catalog_cache.clear()
+
+
 @dataclass(frozen=True)
 class A2uiCatalog:
   """Represents a processed component catalog with its schema.
@@ -77,15 +102,39 @@ class A2uiCatalog:
       raise ValueError(f"Catalog '{self.name}' missing catalogId")
     return self.catalog_schema[CATALOG_ID_KEY]
 
+  @functools.cached_property
+  def fingerprint(self) -> str:
+    """A hash of the catalog's schemas, identical for identical catalogs.
+
+    Computed once per catalog instance; catalogs are treated as immutable.
+    """
+    return content_hash([
+        self.version,
+        self.s2c_schema,
+        self.common_types_schema,
+        self.catalog_schema,
+    ])
+
   @property
   def validator(self) -> "A2uiValidator":
-    from .validator import A2uiValidator
+    """The validator for this catalog.
 
-    return A2uiValidator(self)
+    Validators are cached by `fingerprint`, so catalogs with the same schemas
+    (e.g. the same pruned or inline-merged catalog built for every session)
+    share a single compiled validator.
+    """
+    from .validator import get_cached_validator
+
+    return get_cached_validator(self)
 
   def with_pruned_components(self, allowed_components: List[str]) -> "A2uiCatalog":
     """Returns a new catalog with only allowed components.
 
+    Pruned catalogs are cached by fingerprint, name and allow-list, so the same
+    allow-list returns the same catalog (and its cached validator). They share
+    every unchanged part of their schemas with this catalog and must not be
+    modified.
+
     Args:
       allowed_components: List of component names to include.
 
@@ -93,18 +142,29 @@ class A2uiCatalog:
       A copy of the catalog with only allowed components.
     """
 
-    schema_copy = copy.deepcopy(self.catalog_schema)
-
     # Allow all components if no allowed components are specified
     if not allowed_components:
       return self
 
+    allowed = frozenset(allowed_components)
+    return _pruned_catalog_cache.get_or_create(
+        (self.fingerprint, self.name, allowed),
+        lambda: self._prune_components(allowed),
+    )
+
+  def _prune_components(self, allowed: FrozenSet[str]) -> "A2uiCatalog":
+    """Copies the `components` map and `anyComponent.oneOf` list without the
+    components that are not allowed, then drops the definitions, functions and
+    common types that the remaining schemas no longer reference (see
+    `prune_unreferenced_definitions`). Everything else is shared."""
+    schema_copy = dict(self.catalog_schema)
+
     if CATALOG_COMPONENTS_KEY in schema_copy and isinstance(
         schema_copy[CATALOG_COMPONENTS_KEY], dict
     ):
       all_comps = schema_copy[CATALOG_COMPONENTS_KEY]
       schema_copy[CATALOG_COMPONENTS_KEY] = {
-          k: v for k, v in all_comps.items() if k in allowed_components
+          k: v for k, v in all_comps.items() if k in allowed
       }
 
     # Filter anyComponent oneOf if it exists
@@ -118,47 +178,111 @@ class A2uiCatalog:
             ref = item["$ref"]
             if ref.startswith(f"#/{CATALOG_COMPONENTS_KEY}/"):
               comp_name = ref.split("/")[-1]
-              if comp_name in allowed_components:
+              if comp_name in allowed:
                 filtered_one_of.append(item)
             else:
               logging.warning(f"Skipping unknown ref format: {ref}")
           else:
             logging.warning(f"Skipping non-ref item in anyComponent oneOf: {item}")
 
-        any_comp["oneOf"] = filtered_one_of
+        schema_copy["$defs"] = {
+            **schema_copy["$defs"],
+            "anyComponent": {**any_comp, "oneOf": filtered_one_of},
+        }
+
+    common_types_schema, schema_copy = prune_unreferenced_definitions(
+        self.s2c_schema, self.common_types_schema, schema_copy
+    )
+    return replace(
+        self, common_types_schema=common_types_schema, catalog_schema=schema_copy
+    )
+
+  @functools.cached_property
+  def _rendered_instructions(self) -> Dict[Tuple[bool, bool, bool], str]:
+    return {}
 
-    return replace(self, catalog_schema=schema_copy)
+  def render_as_llm_instructions(
+      self,
+      compact: bool = False,
+      strip_descriptions: bool = False,
+      sort_keys: bool = False,
+  ) -> str:
+    """Renders the catalog and schema as LLM instructions.
+
+    The rendering is computed once per catalog instance and set of options;
+    catalogs are treated as immutable.
+
+    Args:
+      compact: Whether to minify the schemas and replace the subschemas they
+        repeat with `$ref`s to a shared copy (see `compaction.dedupe_subschemas`).
+      strip_descriptions: Whether to drop the `description` and `title`
+        annotations of the schemas. Saves tokens at the cost of guidance.
+      sort_keys: Whether to render the schemas with sorted keys, so that the
+        output does not depend on the order the schemas were loaded or merged
+        in.
+
+    Returns:
+      The schemas, delimited for the LLM.
+    """
+    options = (compact, strip_descriptions, sort_keys)
+    if options not in self._rendered_instructions:
+      self._rendered_instructions[options] = self._render_instructions(*options)
+    return self._rendered_instructions[options]
+
+  def estimate_instruction_tokens(
+      self, compact: bool = False, strip_descriptions: bool = False
+  ) -> int:
+    """Returns a rough token count of `render_as_llm_instructions`."""
+    return estimate_tokens(self.render_as_llm_instructions(compact, strip_descriptions))
+
+  def _render_instructions(
+      self, compact: bool, strip_descriptions: bool, sort_keys: bool
+  ) -> str:
+    schemas = [self.s2c_schema, self.common_types_schema, self.catalog_schema]
+    if sort_keys:
+      # Sorted before deduplication, so shared subschemas are named stably.
+      schemas = [codec.loads(codec.dumps(schema, sort_keys=True)) for schema in schemas]
+    if strip_descriptions:
+      schemas = [strip_annotations(schema) for schema in schemas]
+    shared = {}
+    if compact:
+      schemas, shared = dedupe_subschemas(schemas)
+    s2c_schema, common_types_schema, catalog_schema = schemas
 
-  def render_as_llm_instructions(self) -> str:
-    """Renders the catalog and schema as LLM instructions."""
     all_schemas = []
     all_schemas.append("---BEGIN A2UI JSON SCHEMA---")
 
     server_client_str = (
-        json.dumps(self.s2c_schema, indent=2) if self.s2c_schema else "{}"
+        codec.dumps(s2c_schema, indent=not compact) if s2c_schema else "{}"
     )
     all_schemas.append(f"### Server To Client Schema:\n{server_client_str}")
 
-    if self.common_types_schema:
-      common_str = json.dumps(self.common_types_schema, indent=2)
+    if common_types_schema:
+      common_str = codec.dumps(common_types_schema, indent=not compact)
       all_schemas.append(f"### Common Types Schema:\n{common_str}")
 
-    catalog_str = json.dumps(self.catalog_schema, indent=2)
+    catalog_str = codec.dumps(catalog_schema, indent=not compact)
     all_schemas.append(f"### Catalog Schema:\n{catalog_str}")
 
+    if shared:
+      shared_str = codec.dumps(
+          {"$id": SHARED_SCHEMA_ID, "$defs": shared}, indent=not compact
+      )
+      all_schemas.append(f"### Shared Subschemas Schema:\n{shared_str}")
+
     all_schemas.append("---END A2UI JSON SCHEMA---")
 
     return "\n\n".join(all_schemas)
 
   def load_examples(self, path: Optional[str], validate: bool = False) -> str:
-    """Loads and validates examples from a directory."""
+    """Loads and validates examples from a directory, in file name order."""
     if not path or not os.path.isdir(path):
       if path:
         logging.warning(f"Example path {path} is not a directory")
       return ""
 
     merged_examples = []
-    for filename in os.listdir(path):
+    for filename in sorted(os.listdir(path)):
       if filename.endswith(".json"):
         full_path = os.path.join(path, filename)
         basename = os.path.splitext(filename)[0]
@@ -178,7 +302,7 @@ class A2uiCatalog:
 
   def _validate_example(self, full_path: str, basename: str, content: str) -> bool:
     try:
-      json_data = json.loads(content)
+      json_data = codec.loads(content)
       self.validator.validate(json_data)
     except Exception as e:
       logging.warning(f"Failed to validate example {full_path}: {e}")
@@ -14,10 +14,10 @@
 
 """Module for providing A2UI catalog schemas and resources."""
 
-import json
 from abc import ABC, abstractmethod
-from json.decoder import JSONDecodeError
 from typing import Any, Dict
+
+from .. import codec
 from .constants import ENCODING
 
 
@@ -43,6 +43,6 @@ class FileSystemCatalogProvider(A2uiCatalogProvider):
   def load(self) -> Dict[str, Any]:
     try:
       with open(self.path, "r", encoding=ENCODING) as f:
-        return json.load(f)
-    except (FileNotFoundError, JSONDecodeError) as e:
+        return codec.loads(f.read())
+    except (FileNotFoundError, codec.JSONDecodeError) as e:
       raise IOError(f"Could not load schema from {self.path}: {e}") from e
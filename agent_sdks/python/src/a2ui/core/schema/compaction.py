@@ -0,0 +1,201 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Size reductions for the schemas rendered into LLM prompts.
+
+`A2uiCatalog.render_as_llm_instructions(compact=True)` uses these to minify the
+schemas, optionally without their `description`/`title` annotations, and with
+repeated subschemas replaced by `$ref`s to a single shared copy.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Tuple
+
+from .. import codec
+from .constants import CATALOG_COMPONENTS_KEY
+
+# The document that holds the shared copies of repeated subschemas.
+SHARED_SCHEMA_ID = "shared.json"
+
+# Annotations dropped by `strip_annotations`.
+_ANNOTATION_KEYWORDS = frozenset(["description", "title"])
+
+# Keywords whose values are data, not subschemas.
+_DATA_KEYWORDS = frozenset(["const", "default", "enum", "examples"])
+
+# Keywords whose values are maps of names to subschemas.
+_SCHEMA_MAP_KEYWORDS = frozenset(
+    ["$defs", "definitions", "dependentSchemas", "patternProperties", "properties"]
+)
+
+# The maps of definitions at the top level of a catalog schema.
+_CATALOG_MAP_KEYWORDS = frozenset([CATALOG_COMPONENTS_KEY, "functions"])
+
+# Keywords whose values are a single subschema. `items` may also be a list.
+_SCHEMA_KEYWORDS = frozenset([
+    "additionalItems",
+    "additionalProperties",
+    "contains",
+    "else",
+    "if",
+    "items",
+    "not",
+    "propertyNames",
+    "then",
+    "unevaluatedItems",
+    "unevaluatedProperties",
+])
+
+# Keywords whose values are lists of subschemas.
+_SCHEMA_LIST_KEYWORDS = frozenset(["allOf", "anyOf", "oneOf", "prefixItems"])
+
+# Subschemas whose minified JSON is shorter than this are never shared, as the
+# `$ref` replacing them would save little or nothing.
+_MIN_SHARED_LENGTH = 80
+
+# Subschemas with `$ref`s relative to their own document are never shared, as
+# they would resolve against the shared document instead.
+_RELATIVE_REF = '"$ref":"#'
+
+# Characters per token assumed by `estimate_tokens`.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+  """Returns a rough estimate of the number of LLM tokens in a text.
+
+  This is meant to compare renderings of the same schemas, not to enforce
+  exact context budgets, which depend on the model's tokenizer.
+  """
+  return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def strip_annotations(schema: Any) -> Any:
+  """Returns a copy of a schema without its `description`/`title` annotations.
+
+  Only string annotations are removed, so properties or definitions that
+  happen to be named `description` or `title` are kept, as are the values of
+  `const`, `default`, `enum` and `examples`.
+  """
+  if isinstance(schema, dict):
+    return {
+        key: value if key in _DATA_KEYWORDS else strip_annotations(value)
+        for key, value in schema.items()
+        if not (key in _ANNOTATION_KEYWORDS and isinstance(value, str))
+    }
+  if isinstance(schema, list):
+    return [strip_annotations(value) for value in schema]
+  return schema
+
+
+def _canonical(schema: Dict[str, Any]) -> str:
+  return codec.dumps(schema, sort_keys=True)
+
+
+def _map_subschemas(
+    schema: Dict[str, Any], function: Callable[[Any], Any], is_root: bool = False
+) -> Dict[str, Any]:
+  """Returns a copy of a schema with `function` applied to its subschemas.
+
+  Only the values in subschema positions are passed to `function`: the entries
+  of `properties`, `$defs` and the other keyword maps, `items` and the other
+  single subschema keywords, and the members of `allOf`/`anyOf`/`oneOf`. The
+  keyword maps themselves, data such as `enum` and unknown keywords are kept.
+  At the top level, the entries of a catalog's `components` and `functions`
+  are also subschemas.
+  """
+  map_keywords = _SCHEMA_MAP_KEYWORDS
+  if is_root:
+    map_keywords = map_keywords | _CATALOG_MAP_KEYWORDS
+  result = {}
+  for key, value in schema.items():
+    if key in map_keywords and isinstance(value, dict):
+      value = {name: function(subschema) for name, subschema in value.items()}
+    elif isinstance(value, list) and (key in _SCHEMA_LIST_KEYWORDS or key == "items"):
+      value = [function(subschema) for subschema in value]
+    elif key in _SCHEMA_KEYWORDS:
+      value = function(value)
+    result[key] = value
+  return result
+
+
+def _count_subschemas(schema: Dict[str, Any], counts: Dict[str, int]) -> None:
+  """Counts the occurrences of each subschema of a schema, by canonical JSON.
+
+  The contents of a repeated subschema are only counted once, as they are only
+  rendered once when it is shared.
+  """
+
+  def count(node: Any) -> Any:
+    if isinstance(node, dict):
+      key = _canonical(node)
+      counts[key] = counts.get(key, 0) + 1
+      if counts[key] == 1:
+        _map_subschemas(node, count)
+    return node
+
+  _map_subschemas(schema, count, is_root=True)
+
+
+def dedupe_subschemas(
+    schemas: List[Any],
+) -> Tuple[List[Any], Dict[str, Any]]:
+  """Replaces the subschemas repeated across the given schemas with `$ref`s.
+
+  Each repeated subschema is moved to the `$defs` of the `SHARED_SCHEMA_ID`
+  document, as `S0`, `S1`, ... in the order they are first found, and every
+  occurrence is replaced with `{"$ref": "shared.json#/$defs/S<n>"}`. Only
+  values in subschema positions are shared (see `_map_subschemas`), never
+  keyword maps such as `properties` or data such as `enum`. The top-level
+  schemas and subschemas with `$ref`s relative to their own document are never
+  shared.
+
+  Args:
+    schemas: The schemas to deduplicate, which are not modified.
+
+  Returns:
+    A tuple of the deduplicated schemas and the shared document's `$defs`,
+    which is empty if nothing is repeated.
+  """
+  counts: Dict[str, int] = {}
+  for schema in schemas:
+    if isinstance(schema, dict):
+      _count_subschemas(schema, counts)
+
+  names: Dict[str, str] = {}
+  shared: Dict[str, Any] = {}
+
+  def rewrite(node: Any) -> Any:
+    if not isinstance(node, dict):
+      return node
+    key = _canonical(node)
+    if (
+        counts.get(key, 0) > 1
+        and len(key) >= _MIN_SHARED_LENGTH
+        and _RELATIVE_REF not in key
+    ):
+      if key not in names:
+        names[key] = f"S{len(names)}"
+        # Reserve the entry so that shared subschemas keep their order.
+        shared[names[key]] = None
+        shared[names[key]] = _map_subschemas(node, rewrite)
+      return {"$ref": f"{SHARED_SCHEMA_ID}#/$defs/{names[key]}"}
+    return _map_subschemas(node, rewrite)
+
+  return [
+      _map_subschemas(schema, rewrite, is_root=True)
+      if isinstance(schema, dict)
+      else schema
+      for schema in schemas
+  ], shared
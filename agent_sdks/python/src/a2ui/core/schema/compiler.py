@@ -0,0 +1,878 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compiles A2UI JSON schemas into specialized Python validation functions.
+
+`jsonschema` interprets the schema tree on every call and evaluates every
+branch of `oneOf` unions such as `anyComponent`. This compiler turns a schema
+(and the schemas it references through a `referencing.Registry`) into Python
+source with one function per schema location, so validating an instance runs
+plain `isinstance` checks, dict lookups and direct calls. Unions that carry a
+`discriminator` (as emitted for `anyComponent`) dispatch directly to the one
+branch whose discriminator `const` matches.
+
+The compiled check only answers whether an instance is valid. It implements
+the Draft 2020-12 keywords used by the A2UI schemas and delegates any other
+subschema to `jsonschema`, so it accepts exactly the instances `jsonschema`
+accepts. Callers use `jsonschema` to produce error messages for rejected
+instances.
+
+Generated code is cached on disk, keyed by a hash of the schema, the
+referenced resources and the compiler version, so a process only pays for the
+compilation of a schema once.
+"""
+
+import hashlib
+import logging
+import marshal
+import os
+import re
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote, urljoin
+
+import referencing.exceptions
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+from .cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR = "A2UI_SCHEMA_CACHE_DIR"
+
+# Bump when the generated code changes so that stale disk caches are ignored.
+COMPILER_VERSION = 1
+
+# The URI under which the compiled root schema is registered, so that
+# delegated subschemas can be referenced by location.
+ROOT_URI = "https://a2ui.org/compiled/root.json"
+
+# Keywords implemented by the compiler. Other keywords known to jsonschema
+# cause the enclosing subschema to be delegated to jsonschema; unknown keywords
+# are ignored, as they are by jsonschema.
+_COMPILED_KEYWORDS = frozenset({
+    "$ref",
+    "additionalProperties",
+    "allOf",
+    "anyOf",
+    "const",
+    "else",
+    "enum",
+    "exclusiveMaximum",
+    "exclusiveMinimum",
+    "format",  # Annotation only, as in jsonschema without a format checker.
+    "if",
+    "items",
+    "maxItems",
+    "maxLength",
+    "maxProperties",
+    "maximum",
+    "minItems",
+    "minLength",
+    "minProperties",
+    "minimum",
+    "not",
+    "oneOf",
+    "pattern",
+    "patternProperties",
+    "properties",
+    "required",
+    "then",
+    "type",
+    "unevaluatedProperties",
+})
+_DELEGATED_KEYWORDS = frozenset(Draft202012Validator.VALIDATORS) - _COMPILED_KEYWORDS
+
+_TYPE_CHECKS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": (
+        "((isinstance({v}, int) and not isinstance({v}, bool))"
+        " or (isinstance({v}, float) and {v}.is_integer()))"
+    ),
+}
+
+
+class _Unsupported(Exception):
+  """Raised when a subschema must be delegated to jsonschema."""
+
+
+# Results of the static analysis of the properties a valid instance has
+# evaluated: a frozenset of names, all properties, or unknown until runtime.
+_ALL = "all"
+_DYNAMIC = "dynamic"
+_Evaluated = Union[frozenset, str]
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+  """Compares JSON values like jsonschema: booleans never equal numbers."""
+  if isinstance(a, bool) or isinstance(b, bool):
+    return isinstance(a, bool) and isinstance(b, bool) and a == b
+  if isinstance(a, dict):
+    return (
+        isinstance(b, dict)
+        and a.keys() == b.keys()
+        and all(_json_equal(a[k], b[k]) for k in a)
+    )
+  if isinstance(a, list):
+    return (
+        isinstance(b, list)
+        and len(a) == len(b)
+        and all(_json_equal(x, y) for x, y in zip(a, b))
+    )
+  if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+    return a == b
+  return type(a) is type(b) and a == b
+
+
+def _escape_pointer_token(token: str) -> str:
+  return token.replace("~", "~0").replace("/", "~1")
+
+
+class _Location:
+  """A schema, the resolver for its references and its URI and JSON pointer."""
+
+  def __init__(self, schema: Any, resolver: Any, uri: str, pointer: str):
+    self.schema = schema
+    self.resolver = resolver
+    self.uri = uri
+    self.pointer = pointer
+    if isinstance(schema, dict) and isinstance(schema.get("$id"), str):
+      self.resolver = resolver.in_subresource(
+          Resource.from_contents(schema, default_specification=DRAFT202012)
+      )
+      self.uri = urljoin(uri, schema["$id"]).rstrip("#")
+      self.pointer = ""
+
+  @property
+  def key(self) -> str:
+    return f"{self.uri}#{self.pointer}"
+
+  def child(self, *tokens: Union[str, int]) -> "_Location":
+    pointer = self.pointer + "".join(
+        "/" + _escape_pointer_token(str(t)) for t in tokens
+    )
+    schema = self.schema
+    for token in tokens:
+      schema = schema[token]
+    return _Location(schema, self.resolver, self.uri, pointer)
+
+  def resolve(self, ref: str) -> "_Location":
+    target = urljoin(self.uri, ref)
+    uri, _, fragment = target.partition("#")
+    fragment = unquote(fragment)
+    if fragment and not fragment.startswith("/"):
+      # Anchors are not tracked by location; delegate the reference.
+      raise _Unsupported(f"anchor reference {ref}")
+    resolved = self.resolver.lookup(ref)
+    return _Location(resolved.contents, resolved.resolver, uri, fragment)
+
+
+class _CodeGenerator:
+  """Generates the source of a module with one function per schema location."""
+
+  def __init__(self):
+    self._functions: Dict[str, str] = {}
+    self._blocks: List[str] = []
+    self._constants: List[str] = []
+    self.delegates: List[str] = []
+
+  def constant(self, value_source: str) -> str:
+    name = f"_c{len(self._constants)}"
+    self._constants.append(f"{name} = {value_source}")
+    return name
+
+  def function(self, location: _Location) -> str:
+    """Returns the name of the function that validates the location."""
+    name = self._functions.get(location.key)
+    if name is not None:
+      return name
+    name = f"_v{len(self._functions)}"
+    # Register the name first so that recursive references terminate.
+    self._functions[location.key] = name
+    try:
+      body = self._body(location)
+    except _Unsupported as e:
+      logger.debug("Delegating %s to jsonschema: %s", location.key, e)
+      body = [f"return _delegate({len(self.delegates)}, d)"]
+      self.delegates.append(location.key)
+    lines = [f"def {name}(d):"]
+    lines.extend("  " + line for line in body)
+    self._blocks.append("\n".join(lines))
+    return name
+
+  def source(self, root: str) -> str:
+    return "\n\n".join(
+        ["# Generated by a2ui.core.schema.compiler"]
+        + self._blocks
+        + self._constants
+        + [f"validate = {root}"]
+    )
+
+  def _check(self, location: _Location) -> Optional[str]:
+    """Returns an expression that validates `d`, or None if always valid."""
+    schema = location.schema
+    if schema is True or schema == {}:
+      return None
+    if schema is False:
+      return "False"
+    return f"{self.function(location)}(d)"
+
+  def _call(self, location: _Location, value: str) -> Optional[str]:
+    """Like `_check`, but for an arbitrary value expression."""
+    schema = location.schema
+    if schema is True or schema == {}:
+      return None
+    if schema is False:
+      return "False"
+    return f"{self.function(location)}({value})"
+
+  def _body(self, location: _Location) -> List[str]:
+    schema = location.schema
+    if schema is True:
+      return ["return True"]
+    if schema is False:
+      return ["return False"]
+    if not isinstance(schema, dict):
+      raise _Unsupported("non-object schema")
+    delegated = _DELEGATED_KEYWORDS.intersection(schema)
+    if delegated:
+      raise _Unsupported(f"keywords {sorted(delegated)}")
+
+    lines: List[str] = []
+    types = schema.get("type")
+    if types is not None:
+      types = [types] if isinstance(types, str) else list(types)
+      if not all(t in _TYPE_CHECKS for t in types):
+        raise _Unsupported(f"type {types}")
+      check = " or ".join(_TYPE_CHECKS[t].format(v="d") for t in types)
+      lines.append(f"if not ({check}):")
+      lines.append("  return False")
+    only = types[0] if types is not None and len(types) == 1 else None
+
+    if "const" in schema:
+      lines.extend(self._const_check(schema["const"]))
+    if "enum" in schema:
+      lines.extend(self._enum_check(schema["enum"]))
+
+    lines.extend(self._guarded(only, "object", self._object_checks(location)))
+    lines.extend(self._guarded(only, "array", self._array_checks(location)))
+    lines.extend(self._guarded(only, "string", self._string_checks(schema)))
+    lines.extend(self._number_checks(only, schema))
+    lines.extend(self._applicator_checks(location))
+    lines.append("return True")
+    return lines
+
+  @staticmethod
+  def _guarded(only: Optional[str], kind: str, lines: List[str]) -> List[str]:
+    """Applies type-specific checks only to instances of that type."""
+    if not lines:
+      return []
+    if only == kind:
+      return lines
+    if only is not None:
+      # The type check already rejected every instance of this kind.
+      return []
+    guard = _TYPE_CHECKS[kind].format(v="d")
+    return [f"if {guard}:"] + ["  " + line for line in lines]
+
+  def _const_check(self, value: Any) -> List[str]:
+    if isinstance(value, str):
+      return [f"if d != {value!r}:", "  return False"]
+    if value is None or isinstance(value, bool):
+      return [f"if d is not {value!r}:", "  return False"]
+    name = self.constant(repr(value))
+    return [f"if not _eq(d, {name}):", "  return False"]
+
+  def _enum_check(self, values: Any) -> List[str]:
+    if not isinstance(values, list):
+      raise _Unsupported("non-array enum")
+    if all(isinstance(v, str) for v in values):
+      name = self.constant(repr(frozenset(values)))
+      return [f"if not (isinstance(d, str) and d in {name}):", "  return False"]
+    name = self.constant(repr(tuple(values)))
+    return [f"if not any(_eq(d, v) for v in {name}):", "  return False"]
+
+  def _object_checks(self, location: _Location) -> List[str]:
+    schema = location.schema
+    lines: List[str] = []
+    required = schema.get("required")
+    if required:
+      if not all(isinstance(name, str) for name in required):
+        raise _Unsupported("non-string required")
+      check = " or ".join(f"{name!r} not in d" for name in required)
+      lines.extend([f"if {check}:", "  return False"])
+    if "minProperties" in schema:
+      lines.extend([f"if len(d) < {int(schema['minProperties'])}:", "  return False"])
+    if "maxProperties" in schema:
+      lines.extend([f"if len(d) > {int(schema['maxProperties'])}:", "  return False"])
+
+    properties = schema.get("properties", {})
+    if not isinstance(properties, dict):
+      raise _Unsupported("non-object properties")
+    for name in properties:
+      check = self._call(location.child("properties", name), "v")
+      if check is None:
+        continue
+      lines.extend([
+          f"v = d.get({name!r}, _MISSING)",
+          f"if v is not _MISSING and not {check}:",
+          "  return False",
+      ])
+
+    patterns = schema.get("patternProperties", {})
+    pattern_names = []
+    for pattern in patterns:
+      regex = self.constant(f"_re.compile({pattern!r})")
+      pattern_names.append(regex)
+      check = self._call(location.child("patternProperties", pattern), "v")
+      if check is None:
+        continue
+      lines.extend([
+          "for k, v in d.items():",
+          f"  if {regex}.search(k) and not {check}:",
+          "    return False",
+      ])
+
+    if "additionalProperties" in schema:
+      known = self.constant(repr(frozenset(properties)))
+      extra = f"k not in {known}" + "".join(
+          f" and not {regex}.search(k)" for regex in pattern_names
+      )
+      additional = location.child("additionalProperties")
+      if additional.schema is False:
+        lines.extend(["for k in d:", f"  if {extra}:", "    return False"])
+      else:
+        check = self._call(additional, "v")
+        if check is not None:
+          lines.extend([
+              "for k, v in d.items():",
+              f"  if {extra} and not {check}:",
+              "    return False",
+          ])
+
+    if "unevaluatedProperties" in schema:
+      lines.extend(self._unevaluated_checks(location))
+    return lines
+
+  def _unevaluated_checks(self, location: _Location) -> List[str]:
+    evaluated = _evaluated_properties(location, skip_unevaluated=True)
+    if evaluated == _DYNAMIC:
+      raise _Unsupported("unevaluatedProperties depends on the instance")
+    if evaluated == _ALL:
+      return []
+    known = self.constant(repr(evaluated))
+    unevaluated = location.child("unevaluatedProperties")
+    if unevaluated.schema is False:
+      return ["for k in d:", f"  if k not in {known}:", "    return False"]
+    check = self._call(unevaluated, "v")
+    if check is None:
+      return []
+    return [
+        "for k, v in d.items():",
+        f"  if k not in {known} and not {check}:",
+        "    return False",
+    ]
+
+  def _array_checks(self, location: _Location) -> List[str]:
+    schema = location.schema
+    lines: List[str] = []
+    if "minItems" in schema:
+      lines.extend([f"if len(d) < {int(schema['minItems'])}:", "  return False"])
+    if "maxItems" in schema:
+      lines.extend([f"if len(d) > {int(schema['maxItems'])}:", "  return False"])
+    if "items" in schema:
+      check = self._call(location.child("items"), "v")
+      if check is not None:
+        lines.extend(["for v in d:", f"  if not {check}:", "    return False"])
+    return lines
+
+  def _string_checks(self, schema: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    if "minLength" in schema:
+      lines.extend([f"if len(d) < {int(schema['minLength'])}:", "  return False"])
+    if "maxLength" in schema:
+      lines.extend([f"if len(d) > {int(schema['maxLength'])}:", "  return False"])
+    if "pattern" in schema:
+      regex = self.constant(f"_re.compile({schema['pattern']!r})")
+      lines.extend([f"if not {regex}.search(d):", "  return False"])
+    return lines
+
+  def _number_checks(self, only: Optional[str], schema: Dict[str, Any]) -> List[str]:
+    lines: List[str] = []
+    for keyword, operator in (
+        ("minimum", "<"),
+        ("maximum", ">"),
+        ("exclusiveMinimum", "<="),
+        ("exclusiveMaximum", ">="),
+    ):
+      if keyword in schema:
+        bound = schema[keyword]
+        if isinstance(bound, bool) or not isinstance(bound, (int, float)):
+          raise _Unsupported(f"non-numeric {keyword}")
+        lines.extend([f"if d {operator} {bound!r}:", "  return False"])
+    if not lines or only in ("number", "integer"):
+      return lines
+    if only is not None:
+      return []
+    guard = _TYPE_CHECKS["number"].format(v="d")
+    return [f"if {guard}:"] + ["  " + line for line in lines]
+
+  def _applicator_checks(self, location: _Location) -> List[str]:
+    schema = location.schema
+    lines: List[str] = []
+    if "$ref" in schema:
+      check = self._check(location.resolve(schema["$ref"]))
+      if check is not None:
+        lines.extend([f"if not {check}:", "  return False"])
+
+    for index in range(len(schema.get("allOf", []))):
+      check = self._check(location.child("allOf", index))
+      if check is not None:
+        lines.extend([f"if not {check}:", "  return False"])
+
+    if "anyOf" in schema:
+      checks = [
+          self._check(location.child("anyOf", i)) for i in range(len(schema["anyOf"]))
+      ]
+      if checks and None not in checks:
+        lines.extend([f"if not ({' or '.join(checks)}):", "  return False"])
+      elif not checks:
+        raise _Unsupported("empty anyOf")
+
+    if "oneOf" in schema:
+      lines.extend(self._one_of_checks(location))
+
+    if "not" in schema:
+      check = self._check(location.child("not"))
+      lines.extend(
+          ["return False"] if check is None else [f"if {check}:", "  return False"]
+      )
+
+    if "if" in schema:
+      condition = self._check(location.child("if"))
+      then_check = self._check(location.child("then")) if "then" in schema else None
+      else_check = self._check(location.child("else")) if "else" in schema else None
+      if condition is None:
+        if then_check is not None:
+          lines.extend([f"if not {then_check}:", "  return False"])
+      else:
+        lines.append(f"if {condition}:")
+        lines.extend(
+            [f"  if not {then_check}:", "    return False"]
+            if then_check is not None
+            else ["  pass"]
+        )
+        if else_check is not None:
+          lines.extend(["else:", f"  if not {else_check}:", "    return False"])
+    return lines
+
+  def _one_of_checks(self, location: _Location) -> List[str]:
+    branches = [
+        location.child("oneOf", i) for i in range(len(location.schema["oneOf"]))
+    ]
+    dispatch = _discriminator_dispatch(location, branches)
+    if dispatch is not None:
+      property_name, values = dispatch
+      table = self.constant(
+          "{"
+          + ", ".join(
+              f"{value!r}: {self.function(branch)}"
+              for value, branch in zip(values, branches)
+          )
+          + "}"
+      )
+      return [
+          f"v = d.get({property_name!r}) if isinstance(d, dict) else None",
+          f"f = {table}.get(v) if isinstance(v, str) else None",
+          "if f is None or not f(d):",
+          "  return False",
+      ]
+
+    # Branches that never match (`false`) cannot affect the count.
+    branches = [branch for branch in branches if branch.schema is not False]
+    always = [b for b in branches if b.schema is True or b.schema == {}]
+    if always:
+      # An always-valid branch: valid iff no other branch is valid.
+      if len(always) > 1:
+        return ["return False"]
+      lines = []
+      for branch in branches:
+        if branch not in always:
+          lines.extend([f"if {self._check(branch)}:", "  return False"])
+      return lines
+    if not branches:
+      return ["return False"]
+    functions = self.constant(
+        "(" + "".join(f"{self.function(b)}, " for b in branches) + ")"
+    )
+    return [
+        "n = 0",
+        f"for f in {functions}:",
+        "  if f(d):",
+        "    n += 1",
+        "    if n > 1:",
+        "      return False",
+        "if n != 1:",
+        "  return False",
+    ]
+
+
+def _evaluated_properties(
+    location: _Location, skip_unevaluated: bool = False, seen: Optional[set] = None
+) -> _Evaluated:
+  """Statically determines the properties a valid instance has evaluated.
+
+  Returns a frozenset of property names, `_ALL` if every property is evaluated
+  (e.g. by `additionalProperties`) or `_DYNAMIC` if it depends on which
+  branches of a union the instance matches.
+  """
+  schema = location.schema
+  if not isinstance(schema, dict):
+    return frozenset()
+  seen = set() if seen is None else seen
+  if location.key in seen:
+    return _DYNAMIC
+  seen = seen | {location.key}
+
+  if "additionalProperties" in schema or (
+      "unevaluatedProperties" in schema and not skip_unevaluated
+  ):
+    return _ALL
+  if "patternProperties" in schema or "dependentSchemas" in schema:
+    return _DYNAMIC
+
+  names = set(schema.get("properties", {}))
+  children: List[_Location] = []
+  if "$ref" in schema:
+    try:
+      children.append(location.resolve(schema["$ref"]))
+    except _Unsupported:
+      return _DYNAMIC
+  children.extend(
+      location.child("allOf", i) for i in range(len(schema.get("allOf", [])))
+  )
+  for child in children:
+    evaluated = _evaluated_properties(child, seen=seen)
+    if evaluated in (_ALL, _DYNAMIC):
+      return evaluated
+    names |= evaluated
+
+  # Branches only contribute the properties of the branches that match, which
+  # is known statically only if they contribute none.
+  conditional = [
+      location.child(keyword, i)
+      for keyword in ("anyOf", "oneOf")
+      for i in range(len(schema.get(keyword, [])))
+  ]
+  conditional.extend(
+      location.child(keyword) for keyword in ("if", "then", "else") if keyword in schema
+  )
+  for child in conditional:
+    if _evaluated_properties(child, seen=seen) != frozenset():
+      return _DYNAMIC
+  return frozenset(names)
+
+
+def _branch_discriminator(
+    location: _Location, property_name: str, seen: frozenset = frozenset()
+) -> Tuple[Optional[str], bool, bool]:
+  """Finds the constant discriminator value a branch unconditionally requires.
+
+  Returns a tuple of the `const` string of the property, whether the branch
+  requires an object and whether it requires the property. Only `$ref` and
+  `allOf`, which always apply, are followed.
+  """
+  schema = location.schema
+  if not isinstance(schema, dict) or location.key in seen:
+    return None, False, False
+  seen = seen | {location.key}
+
+  value = None
+  prop = schema.get("properties", {}).get(property_name)
+  if isinstance(prop, dict) and isinstance(prop.get("const"), str):
+    value = prop["const"]
+  is_object = schema.get("type") == "object"
+  required = property_name in schema.get("required", [])
+
+  children: List[_Location] = []
+  if "$ref" in schema:
+    try:
+      children.append(location.resolve(schema["$ref"]))
+    except _Unsupported:
+      pass
+  children.extend(
+      location.child("allOf", i) for i in range(len(schema.get("allOf", [])))
+  )
+  for child in children:
+    child_value, child_object, child_required = _branch_discriminator(
+        child, property_name, seen
+    )
+    if child_value is not None:
+      if value is not None and value != child_value:
+        return None, False, False
+      value = child_value
+    is_object = is_object or child_object
+    required = required or child_required
+  return value, is_object, required
+
+
+def _discriminator_dispatch(
+    location: _Location, branches: List[_Location]
+) -> Optional[Tuple[str, List[str]]]:
+  """Returns the discriminator property and the value of each branch.
+
+  Dispatching is only equivalent to `oneOf` if every branch requires an object
+  with the property set to a distinct constant string, so that an instance can
+  only match the branch selected by its value.
+  """
+  discriminator = location.schema.get("discriminator")
+  if not isinstance(discriminator, dict):
+    return None
+  property_name = discriminator.get("propertyName")
+  if not isinstance(property_name, str) or not branches:
+    return None
+
+  values = []
+  for branch in branches:
+    value, is_object, required = _branch_discriminator(branch, property_name)
+    if value is None or not is_object or not required:
+      return None
+    values.append(value)
+  if len(set(values)) != len(values):
+    return None
+  return property_name, values
+
+
+@dataclass(frozen=True)
+class DiscriminatedUnion:
+  """A `oneOf` whose branch is selected by the value of a discriminator.
+
+  Attributes:
+    schema: The schema containing the `oneOf`.
+    property_name: The discriminator property, e.g. `component`.
+    branches: Maps each discriminator value to the index of its branch.
+  """
+
+  schema: Dict[str, Any]
+  property_name: str
+  branches: Dict[str, int]
+
+
+# Keywords whose values are instances rather than subschemas.
+_NON_SCHEMA_KEYWORDS = frozenset({"const", "default", "enum", "examples"})
+
+
+def find_discriminated_unions(
+    schema: Dict[str, Any], registry: Optional[Registry] = None
+) -> Dict[int, DiscriminatedUnion]:
+  """Finds the unions reachable from a schema that can dispatch on a discriminator.
+
+  Only unions whose branches all require a distinct constant discriminator
+  value are returned, since for those validating the selected branch is
+  equivalent to evaluating the whole `oneOf`.
+
+  Args:
+    schema: The root schema.
+    registry: The registry used to resolve references to other schemas.
+
+  Returns:
+    The unions keyed by the `id()` of the schema containing the `oneOf`, which
+    is the object jsonschema passes to keyword functions.
+  """
+  registry = _with_root(schema, registry)
+  unions: Dict[int, DiscriminatedUnion] = {}
+  seen = set()
+  pending = [_Location(schema, registry.resolver(base_uri=ROOT_URI), ROOT_URI, "")]
+  while pending:
+    location = pending.pop()
+    if location.key in seen:
+      continue
+    seen.add(location.key)
+    node = location.schema
+    if isinstance(node, list):
+      pending.extend(location.child(i) for i in range(len(node)))
+      continue
+    if not isinstance(node, dict):
+      continue
+
+    if isinstance(node.get("oneOf"), list):
+      branches = [location.child("oneOf", i) for i in range(len(node["oneOf"]))]
+      dispatch = _discriminator_dispatch(location, branches)
+      if dispatch is not None:
+        property_name, values = dispatch
+        unions[id(node)] = DiscriminatedUnion(
+            node, property_name, {value: i for i, value in enumerate(values)}
+        )
+    for key, value in node.items():
+      if key == "$ref" and isinstance(value, str):
+        try:
+          pending.append(location.resolve(value))
+        except (_Unsupported, referencing.exceptions.Unresolvable):
+          pass
+      elif key not in _NON_SCHEMA_KEYWORDS and isinstance(value, (dict, list)):
+        pending.append(location.child(key))
+  return unions
+
+
+class _Delegates:
+  """Lazily built jsonschema validators for the delegated subschemas."""
+
+  def __init__(self, registry: Registry, locations: List[str]):
+    self._registry = registry
+    self._locations = locations
+    self._validators: List[Optional[Callable[[Any], bool]]] = [None] * len(locations)
+
+  def __call__(self, index: int, instance: Any) -> bool:
+    is_valid = self._validators[index]
+    if is_valid is None:
+      validator = Draft202012Validator(
+          {"$ref": self._locations[index]}, registry=self._registry
+      )
+      is_valid = self._validators[index] = validator.is_valid
+    return is_valid(instance)
+
+
+class CompiledSchema:
+  """A schema compiled into Python functions.
+
+  Attributes:
+    delegated_locations: The locations (`uri#pointer`) of the subschemas that
+      are validated by jsonschema.
+  """
+
+  def __init__(self, code: Any, registry: Registry, delegated_locations: List[str]):
+    self.delegated_locations = delegated_locations
+    namespace: Dict[str, Any] = {
+        "_re": re,
+        "_eq": _json_equal,
+        "_MISSING": object(),
+        "_delegate": _Delegates(registry, delegated_locations),
+    }
+    exec(code, namespace)
+    self._validate: Callable[[Any], bool] = namespace["validate"]
+
+  def is_valid(self, instance: Any) -> bool:
+    """Returns whether the instance is valid against the schema."""
+    return self._validate(instance)
+
+
+def _default_cache_dir() -> str:
+  if os.environ.get(CACHE_DIR_ENV_VAR):
+    return os.environ[CACHE_DIR_ENV_VAR]
+  base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+      os.path.expanduser("~"), ".cache"
+  )
+  return os.path.join(base, "a2ui", "compiled_schemas")
+
+
+def _schema_hash(schema: Dict[str, Any], registry: Registry) -> str:
+  resources = sorted(
+      (uri, registry[uri].contents) for uri in registry if uri != ROOT_URI
+  )
+  return content_hash([COMPILER_VERSION, schema, resources])
+
+
+def _read_cache(path: str) -> Optional[Tuple[Any, List[str]]]:
+  try:
+    with open(path, "rb") as f:
+      return marshal.load(f)
+  except FileNotFoundError:
+    return None
+  except (OSError, EOFError, ValueError, TypeError) as e:
+    logger.debug("Ignoring unreadable compiled schema cache %s: %s", path, e)
+    return None
+
+
+def _write_cache(path: str, entry: Tuple[Any, List[str]]) -> None:
+  try:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write atomically so that concurrent processes never read partial files.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+      marshal.dump(entry, f)
+    os.replace(tmp_path, path)
+  except OSError as e:
+    logger.debug("Could not write compiled schema cache %s: %s", path, e)
+
+
+def _with_root(schema: Dict[str, Any], registry: Optional[Registry]) -> Registry:
+  """Returns the registry with the root schema registered under `ROOT_URI`."""
+  registry = registry if registry is not None else Registry()
+  return registry.with_resource(
+      ROOT_URI, Resource.from_contents(schema, default_specification=DRAFT202012)
+  )
+
+
+def generate_source(
+    schema: Dict[str, Any], registry: Registry
+) -> Tuple[str, List[str]]:
+  """Generates the validation module source for a schema.
+
+  Args:
+    schema: The root schema.
+    registry: The registry used to resolve references, which must contain
+      the root schema under `ROOT_URI`.
+
+  Returns:
+    A tuple of the module source and the delegated subschema locations.
+  """
+  generator = _CodeGenerator()
+  root = _Location(schema, registry.resolver(base_uri=ROOT_URI), ROOT_URI, "")
+  root_name = generator.function(root)
+  return generator.source(root_name), generator.delegates
+
+
+def compile_schema(
+    schema: Dict[str, Any],
+    registry: Optional[Registry] = None,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+) -> CompiledSchema:
+  """Compiles a schema into a CompiledSchema.
+
+  Args:
+    schema: The root schema.
+    registry: The registry used to resolve references to other schemas.
+    cache_dir: The directory of the disk cache. Defaults to the
+      `A2UI_SCHEMA_CACHE_DIR` environment variable or the user cache directory.
+    use_cache: Whether to read and write the disk cache.
+
+  Returns:
+    The compiled schema.
+  """
+  registry = _with_root(schema, registry)
+
+  path = None
+  if use_cache:
+    name = f"{_schema_hash(schema, registry)}.{sys.implementation.cache_tag}.bin"
+    path = os.path.join(cache_dir or _default_cache_dir(), name)
+    entry = _read_cache(path)
+    if entry is not None:
+      code, delegated = entry
+      return CompiledSchema(code, registry, list(delegated))
+
+  source, delegated = generate_source(schema, registry)
+  code = compile(source, "<a2ui compiled schema>", "exec")
+  if path is not None:
+    _write_cache(path, (code, delegated))
+  return CompiledSchema(code, registry, delegated)
@@ -29,6 +29,9 @@ A2UI_CLIENT_CAPABILITIES_KEY = "a2uiClientCapabilities"
 BASE_SCHEMA_URL = "https://a2ui.org/"
 INLINE_CATALOG_NAME = "inline"
 
+# The maximum nesting depth of payloads and of component trees.
+MAX_GLOBAL_DEPTH = 50
+
 VERSION_0_8 = "0.8"
 VERSION_0_9 = "0.9"
 
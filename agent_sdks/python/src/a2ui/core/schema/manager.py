@@ -13,11 +13,11 @@
 # limitations under the License.
 
 import copy
-import json
 import logging
 import os
 import importlib.resources
-from typing import List, Dict, Any, Optional, Callable
+import hashlib
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from .utils import load_from_bundled_resource, deep_update
 from ..inference_strategy import InferenceStrategy
@@ -25,6 +25,34 @@ from .constants import *
 from .catalog import CatalogConfig, A2uiCatalog
 
 
+@dataclass(frozen=True)
+class SystemPrompt:
+  """A system prompt assembled by `A2uiSchemaManager.assemble_system_prompt`.
+
+  Attributes:
+    prefix: The schema and examples, which are identical for every request
+      that selects the same catalog.
+    suffix: The role, workflow and UI descriptions.
+  """
+
+  prefix: str
+  suffix: str
+
+  @property
+  def text(self) -> str:
+    """The full prompt."""
+    return "\n\n".join(part for part in (self.prefix, self.suffix) if part)
+
+  @property
+  def prefix_hash(self) -> str:
+    """The SHA-256 hex digest of `prefix`.
+
+    Requests whose prompts have the same prefix hash can hit the LLM
+    provider's prompt cache for the prefix tokens.
+    """
+    return hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()
+
+
 class A2uiSchemaManager(InferenceStrategy):
   """Manages A2UI schema levels and prompt injection."""
 
@@ -200,8 +228,91 @@ class A2uiSchemaManager(InferenceStrategy):
       include_schema: bool = False,
       include_examples: bool = False,
       validate_examples: bool = False,
+      compact_schema: bool = False,
+      strip_schema_descriptions: bool = False,
+      deterministic: bool = False,
   ) -> str:
-    """Assembles the final system instruction for the LLM."""
+    """Assembles the final system instruction for the LLM.
+
+    `compact_schema` and `strip_schema_descriptions` are passed to
+    `A2uiCatalog.render_as_llm_instructions` to shrink the schema. With
+    `deterministic`, the prompt is assembled by `assemble_system_prompt`
+    instead, with the schema and examples first.
+    """
+    args = (
+        role_description,
+        workflow_description,
+        ui_description,
+        client_ui_capabilities,
+        allowed_components,
+        include_schema,
+        include_examples,
+        validate_examples,
+        compact_schema,
+        strip_schema_descriptions,
+    )
+    if deterministic:
+      return self.assemble_system_prompt(*args).text
+    description_parts, catalog_parts = self._system_prompt_parts(*args, sort_keys=False)
+    return "\n\n".join(description_parts + catalog_parts)
+
+  def assemble_system_prompt(
+      self,
+      role_description: str,
+      workflow_description: str = "",
+      ui_description: str = "",
+      client_ui_capabilities: Optional[dict[str, Any]] = None,
+      allowed_components: List[str] = [],
+      include_schema: bool = False,
+      include_examples: bool = False,
+      validate_examples: bool = False,
+      compact_schema: bool = False,
+      strip_schema_descriptions: bool = False,
+  ) -> SystemPrompt:
+    """Assembles the system instruction for provider-side prompt caching.
+
+    The schema, rendered with sorted keys, and the examples, in file name
+    order, form the prefix of the prompt. They only depend on the selected
+    catalog, so every request for the same catalog shares the same prefix
+    bytes. The role, workflow and UI descriptions follow.
+
+    Takes the same arguments as `generate_system_prompt`.
+
+    Returns:
+      The prompt, split into its prefix and suffix.
+    """
+    description_parts, catalog_parts = self._system_prompt_parts(
+        role_description,
+        workflow_description,
+        ui_description,
+        client_ui_capabilities,
+        allowed_components,
+        include_schema,
+        include_examples,
+        validate_examples,
+        compact_schema,
+        strip_schema_descriptions,
+        sort_keys=True,
+    )
+    return SystemPrompt(
+        prefix="\n\n".join(catalog_parts), suffix="\n\n".join(description_parts)
+    )
+
+  def _system_prompt_parts(
+      self,
+      role_description: str,
+      workflow_description: str,
+      ui_description: str,
+      client_ui_capabilities: Optional[dict[str, Any]],
+      allowed_components: List[str],
+      include_schema: bool,
+      include_examples: bool,
+      validate_examples: bool,
+      compact_schema: bool,
+      strip_schema_descriptions: bool,
+      sort_keys: bool,
+  ) -> Tuple[List[str], List[str]]:
+    """Returns the description parts and the catalog parts of the prompt."""
     parts = [role_description]
 
     workflow = DEFAULT_WORKFLOW_RULES
@@ -216,12 +327,19 @@ class A2uiSchemaManager(InferenceStrategy):
         client_ui_capabilities, allowed_components
     )
 
+    catalog_parts = []
     if include_schema:
-      parts.append(selected_catalog.render_as_llm_instructions())
+      catalog_parts.append(
+          selected_catalog.render_as_llm_instructions(
+              compact=compact_schema,
+              strip_descriptions=strip_schema_descriptions,
+              sort_keys=sort_keys,
+          )
+      )
 
     if include_examples:
       examples_str = self.load_examples(selected_catalog, validate=validate_examples)
       if examples_str:
-        parts.append(f"### Examples:\n{examples_str}")
+        catalog_parts.append(f"### Examples:\n{examples_str}")
 
-    return "\n\n".join(parts)
+    return parts, catalog_parts
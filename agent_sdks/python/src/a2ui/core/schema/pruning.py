@@ -0,0 +1,186 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Removal of schema definitions that cannot be reached through `$ref`s.
+
+A catalog pruned to a few components still carries every `$defs` entry and
+function of the catalog and every common type, which are all rendered into the
+LLM prompt. `prune_unreferenced_definitions` follows the `$ref`s from the
+server-to-client schema, the remaining components and the other non-definition
+parts of the schemas, and drops the definitions that are never reached.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from .constants import CATALOG_ID_KEY
+
+# The schema documents of a catalog.
+_S2C = "s2c"
+_COMMON_TYPES = "common_types"
+_CATALOG = "catalog"
+
+_DEFS_KEY = "$defs"
+_FUNCTIONS_KEY = "functions"
+
+# The sections of each document whose entries are dropped when unreachable.
+_PRUNABLE_SECTIONS = {
+    _COMMON_TYPES: (_DEFS_KEY,),
+    _CATALOG: (_DEFS_KEY, _FUNCTIONS_KEY),
+}
+
+# Catalog definitions that are always kept. `anyComponent` is the entry point
+# of the catalog for the server-to-client schema.
+_KEPT_CATALOG_DEFS = ("anyComponent",)
+
+# Keywords whose values are data, not subschemas.
+_DATA_KEYWORDS = frozenset(["const", "default", "enum", "examples"])
+
+# A definition, as (document, section, name).
+_Definition = Tuple[str, str, str]
+
+
+def _document_names(
+    s2c_schema: Dict[str, Any],
+    common_types_schema: Dict[str, Any],
+    catalog_schema: Dict[str, Any],
+) -> Dict[str, str]:
+  """Maps the file names a `$ref` may use for each document to the document."""
+  names = {"common_types.json": _COMMON_TYPES, "catalog.json": _CATALOG}
+  for document, uris in (
+      (_S2C, [s2c_schema.get("$id")]),
+      (_COMMON_TYPES, [common_types_schema.get("$id")]),
+      (_CATALOG, [catalog_schema.get("$id"), catalog_schema.get(CATALOG_ID_KEY)]),
+  ):
+    for uri in uris:
+      if isinstance(uri, str) and uri:
+        names[os.path.basename(uri)] = document
+  return names
+
+
+def _iter_refs(schema: Any) -> Iterable[str]:
+  """Yields the `$ref`s of a schema and its subschemas."""
+  stack = [schema]
+  while stack:
+    node = stack.pop()
+    if isinstance(node, dict):
+      for key, value in node.items():
+        if key == "$ref" and isinstance(value, str):
+          yield value
+        elif key not in _DATA_KEYWORDS and isinstance(value, (dict, list)):
+          stack.append(value)
+    elif isinstance(node, list):
+      stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+
+def _resolve(
+    ref: str, document: str, document_names: Dict[str, str]
+) -> Optional[_Definition]:
+  """Returns the prunable definition a `$ref` points into, if any."""
+  uri, _, fragment = ref.partition("#")
+  if uri:
+    document = document_names.get(os.path.basename(uri.rstrip("/")))
+    if document is None:
+      return None
+  tokens = [
+      unquote(token).replace("~1", "/").replace("~0", "~")
+      for token in fragment.split("/")[1:]
+  ]
+  if len(tokens) >= 2 and tokens[0] in _PRUNABLE_SECTIONS.get(document, ()):
+    return document, tokens[0], tokens[1]
+  return None
+
+
+def _section(schema: Dict[str, Any], section: str) -> Dict[str, Any]:
+  value = schema.get(section)
+  return value if isinstance(value, dict) else {}
+
+
+def prune_unreferenced_definitions(
+    s2c_schema: Optional[Dict[str, Any]],
+    common_types_schema: Optional[Dict[str, Any]],
+    catalog_schema: Dict[str, Any],
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+  """Drops the common types and catalog definitions that cannot be reached.
+
+  The reachable definitions are the transitive closure of the `$ref`s of the
+  server-to-client schema, the catalog's components and `anyComponent`, and
+  every part of the schemas outside of the `$defs` and `functions` sections.
+  `$ref`s to unknown documents are ignored.
+
+  The returned schemas are shallow copies that share their definitions with
+  the given ones. Schemas without unreachable definitions are returned as is.
+
+  Args:
+    s2c_schema: The server-to-client schema, which is never pruned.
+    common_types_schema: The common types schema.
+    catalog_schema: The catalog schema.
+
+  Returns:
+    A tuple of the pruned common types schema and catalog schema.
+  """
+  documents = {
+      _S2C: s2c_schema or {},
+      _COMMON_TYPES: common_types_schema or {},
+      _CATALOG: catalog_schema or {},
+  }
+  document_names = _document_names(*documents.values())
+
+  pending: List[Tuple[str, Any]] = []
+  for document, schema in documents.items():
+    sections = _PRUNABLE_SECTIONS.get(document, ())
+    pending.extend(
+        (document, value) for key, value in schema.items() if key not in sections
+    )
+  reached: Set[_Definition] = set()
+  catalog_defs = _section(documents[_CATALOG], _DEFS_KEY)
+  for name in _KEPT_CATALOG_DEFS:
+    if name in catalog_defs:
+      reached.add((_CATALOG, _DEFS_KEY, name))
+      pending.append((_CATALOG, catalog_defs[name]))
+
+  while pending:
+    document, schema = pending.pop()
+    for ref in _iter_refs(schema):
+      definition = _resolve(ref, document, document_names)
+      if definition is None or definition in reached:
+        continue
+      target_document, section, name = definition
+      entries = _section(documents[target_document], section)
+      if name in entries:
+        reached.add(definition)
+        pending.append((target_document, entries[name]))
+
+  def prune(document: str) -> Dict[str, Any]:
+    schema = documents[document]
+    pruned = None
+    for section in _PRUNABLE_SECTIONS[document]:
+      entries = schema.get(section)
+      if not isinstance(entries, dict):
+        continue
+      kept = {
+          name: value
+          for name, value in entries.items()
+          if (document, section, name) in reached
+      }
+      if len(kept) < len(entries):
+        pruned = pruned if pruned is not None else dict(schema)
+        pruned[section] = kept
+    return pruned if pruned is not None else schema
+
+  return (
+      prune(_COMMON_TYPES) if common_types_schema else common_types_schema,
+      prune(_CATALOG) if catalog_schema else catalog_schema,
+  )
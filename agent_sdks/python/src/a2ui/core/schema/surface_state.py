@@ -0,0 +1,478 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Component graphs of A2UI surfaces, maintained across validated messages.
+
+A single `updateComponents` (or v0.8 `surfaceUpdate`) message only carries the
+components that changed, so references, reachability and cycles can only be
+checked against the components the client already has. `SurfaceValidationState`
+keeps the component graph of each surface, with a reverse index from each
+component to the components referencing it, so that an update is checked by
+walking up from the changed components instead of re-walking the whole tree.
+"""
+
+import collections
+import contextlib
+import functools
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .constants import MAX_GLOBAL_DEPTH
+from .validation_report import ERROR_INTEGRITY, ERROR_TOPOLOGY
+
+# A component's references to other components, as (referenced_id, field_name).
+References = List[Tuple[str, str]]
+
+# If an update changes at least this fraction of a surface's components, the
+# whole surface is checked at once instead of walking up from each component.
+_FULL_CHECK_FRACTION = 0.5
+
+
+class ComponentGraphError(ValueError):
+  """A dangling or circular reference, unreachable component or too deep tree.
+
+  Attributes:
+    kind: `ERROR_INTEGRITY` for dangling references, `ERROR_TOPOLOGY`
+      otherwise.
+    component_id: The ID of the offending component.
+    field_name: The reference field of the component at fault, if known.
+    surface_id: The surface of the component, if raised by
+      `SurfaceValidationState`.
+  """
+
+  def __init__(
+      self,
+      kind: str,
+      message: str,
+      component_id: str,
+      field_name: Optional[str] = None,
+  ):
+    super().__init__(message)
+    self.kind = kind
+    self.component_id = component_id
+    self.field_name = field_name
+    self.surface_id: Optional[str] = None
+
+
+@dataclass
+class _SurfaceGraph:
+  """The component graph of one surface."""
+
+  root_id: Optional[str] = None
+  references: Dict[str, References] = field(default_factory=dict)
+  referrers: Dict[str, Set[str]] = field(default_factory=dict)
+
+  def set_references(self, component_id: str, references: Optional[References]):
+    """Replaces the references of a component, or removes it if None."""
+    for ref_id in {ref_id for ref_id, _ in self.references.get(component_id, ())}:
+      referrers = self.referrers[ref_id]
+      referrers.discard(component_id)
+      if not referrers:
+        del self.referrers[ref_id]
+    if references is None:
+      self.references.pop(component_id, None)
+      return
+    self.references[component_id] = references
+    for ref_id, _ in references:
+      self.referrers.setdefault(ref_id, set()).add(component_id)
+
+  def check(self, changed: Collection[str], added: Collection[str], max_depth: int):
+    """Checks the changed components after they have been applied.
+
+    Args:
+      changed: The IDs of the components whose references changed.
+      added: The IDs of the components that are new to the surface, which must
+        be reachable from the root.
+      max_depth: The maximum depth of a component below the root.
+
+    Raises:
+      ComponentGraphError: If a reference is dangling or circular, a new
+        component is not reachable from the root, or the tree is too deep.
+    """
+    for component_id in changed:
+      for ref_id, field_name in self.references[component_id]:
+        if ref_id == component_id:
+          raise ComponentGraphError(
+              ERROR_TOPOLOGY,
+              f"Self-reference detected: Component '{component_id}' references"
+              f" itself in field '{field_name}'",
+              component_id,
+              field_name,
+          )
+        if self.root_id is not None and ref_id not in self.references:
+          raise ComponentGraphError(
+              ERROR_INTEGRITY,
+              f"Component '{component_id}' references non-existent component"
+              f" '{ref_id}' in field '{field_name}'",
+              component_id,
+              field_name,
+          )
+
+    if len(changed) >= _FULL_CHECK_FRACTION * len(self.references):
+      self._check_all(changed, added, max_depth)
+      return
+
+    added = set(added)
+    for component_id in changed:
+      depth = self._check_ancestors(component_id, component_id in added)
+      if depth is not None:
+        self._check_height(component_id, depth, max_depth)
+
+  def _check_ancestors(self, component_id: str, must_reach_root: bool) -> Optional[int]:
+    """Walks up from a component to detect cycles through it.
+
+    Returns:
+      The distance from the root to the component, or None if the root is
+      unknown or not an ancestor of the component.
+    """
+    depth = None
+    if component_id == self.root_id:
+      depth = 0
+    seen = {component_id}
+    level = [component_id]
+    distance = 0
+    while level:
+      distance += 1
+      next_level = []
+      for node in level:
+        for parent in self.referrers.get(node, ()):
+          if parent == component_id:
+            raise ComponentGraphError(
+                ERROR_TOPOLOGY,
+                f"Circular reference detected involving component '{component_id}'",
+                component_id,
+            )
+          if parent in seen:
+            continue
+          seen.add(parent)
+          if parent == self.root_id and depth is None:
+            depth = distance
+          next_level.append(parent)
+      level = next_level
+
+    if must_reach_root and self.root_id is not None and depth is None:
+      raise ComponentGraphError(
+          ERROR_TOPOLOGY,
+          f"Component '{component_id}' is not reachable from '{self.root_id}'",
+          component_id,
+      )
+    return depth
+
+  def _check_height(self, component_id: str, depth: int, max_depth: int) -> None:
+    """Checks that the subtree below a component at `depth` is not too deep."""
+    seen = {component_id}
+    level = [component_id]
+    while level:
+      if depth > max_depth:
+        _raise_depth_exceeded(max_depth, component_id)
+      next_level = []
+      for node in level:
+        for ref_id, _ in self.references.get(node, ()):
+          if ref_id not in seen:
+            seen.add(ref_id)
+            next_level.append(ref_id)
+      level = next_level
+      depth += 1
+
+  def _check_all(
+      self, changed: Collection[str], added: Collection[str], max_depth: int
+  ) -> None:
+    """Checks cycles, depth and reachability with one walk of the surface."""
+    visited: Set[str] = set()
+    starts = [self.root_id] if self.root_id in self.references else []
+    starts.extend(changed)
+    for start in starts:
+      if start not in visited:
+        walk_components(
+            self.references,
+            start,
+            visited,
+            max_depth if start == self.root_id else None,
+        )
+
+    if self.root_id is not None:
+      reachable = self._reachable_from_root()
+      orphans = sorted(set(added) - reachable)
+      if orphans:
+        raise ComponentGraphError(
+            ERROR_TOPOLOGY,
+            f"Component '{orphans[0]}' is not reachable from '{self.root_id}'",
+            orphans[0],
+        )
+
+  def _reachable_from_root(self) -> Set[str]:
+    reachable = {self.root_id}
+    queue = collections.deque([self.root_id])
+    while queue:
+      for ref_id, _ in self.references.get(queue.popleft(), ()):
+        if ref_id not in reachable:
+          reachable.add(ref_id)
+          queue.append(ref_id)
+    return reachable
+
+
+def walk_components(
+    references: Mapping[str, References],
+    start: str,
+    visited: Set[str],
+    max_depth: Optional[int],
+) -> None:
+  """Walks the components reachable from `start` depth-first, without recursion.
+
+  References to components that are not in `references` or already in
+  `visited` are not followed. Walked components are added to `visited`.
+
+  Args:
+    references: Maps each component ID to its references.
+    start: The ID of the component to start from.
+    visited: The IDs of the components walked so far.
+    max_depth: The maximum depth below `start`, or None for no limit.
+
+  Raises:
+    ComponentGraphError: If a reference is circular or the walk exceeds
+      max_depth.
+  """
+  on_path: Set[str] = {start}
+  visited.add(start)
+  stack = [(start, iter(references.get(start, ())))]
+  while stack:
+    node, children = stack[-1]
+    child = next(children, None)
+    if child is None:
+      stack.pop()
+      on_path.discard(node)
+      continue
+    ref_id = child[0]
+    if ref_id in on_path:
+      raise ComponentGraphError(
+          ERROR_TOPOLOGY,
+          f"Circular reference detected involving component '{ref_id}'",
+          node,
+          child[1],
+      )
+    if ref_id in visited or ref_id not in references:
+      continue
+    if max_depth is not None and len(stack) > max_depth:
+      _raise_depth_exceeded(max_depth, ref_id)
+    visited.add(ref_id)
+    on_path.add(ref_id)
+    stack.append((ref_id, iter(references[ref_id])))
+
+
+def _raise_depth_exceeded(max_depth: int, component_id: str) -> None:
+  raise ComponentGraphError(
+      ERROR_TOPOLOGY,
+      f"Global recursion limit exceeded: logical depth > {max_depth}",
+      component_id,
+  )
+
+
+@dataclass
+class _PendingCheck:
+  """The checks of one surface deferred to the end of a transaction."""
+
+  graph: _SurfaceGraph
+  changed: Dict[str, None] = field(default_factory=dict)
+  added: Dict[str, None] = field(default_factory=dict)
+  check_all: bool = False
+
+
+class _Transaction:
+  """The undo log and deferred checks of `SurfaceValidationState.transaction`."""
+
+  def __init__(self):
+    self.undo: List[Callable[[], None]] = []
+    self.pending: Dict[int, _PendingCheck] = {}
+
+  def pending_check(self, graph: _SurfaceGraph) -> _PendingCheck:
+    pending = self.pending.get(id(graph))
+    if pending is None:
+      pending = self.pending[id(graph)] = _PendingCheck(graph)
+    return pending
+
+
+class SurfaceValidationState:
+  """Tracks the component graph of each surface across validated messages.
+
+  Pass the same state to `A2uiValidator.validate` for every response of a
+  conversation. Each component update is then checked against the components
+  already sent to the surface:
+
+  - References must point to components of the surface.
+  - Components must not reference themselves or form cycles.
+  - New components must be reachable from the root.
+  - The tree must not exceed the global depth limit.
+
+  Since components may arrive in any order, references, reachability and depth
+  are only checked once the root of the surface is known, i.e. after
+  `createSurface` (v0.9) or `beginRendering` (v0.8). An update that fails
+  validation leaves the state unchanged. Within a `transaction()`, such as the
+  messages of one payload, the checks run once all updates are applied, and a
+  failure leaves the state as it was before the transaction.
+
+  Checking an update walks up from each changed component to the root, so its
+  cost depends on the number of changed components and their depth rather than
+  the size of the surface.
+
+  Args:
+    max_depth: The maximum depth of a component below the root.
+  """
+
+  def __init__(self, max_depth: int = MAX_GLOBAL_DEPTH):
+    self._max_depth = max_depth
+    self._surfaces: Dict[str, _SurfaceGraph] = {}
+    self._transaction: Optional[_Transaction] = None
+
+  def surface_ids(self) -> List[str]:
+    """Returns the IDs of the tracked surfaces."""
+    return list(self._surfaces)
+
+  def component_ids(self, surface_id: str) -> Set[str]:
+    """Returns the IDs of the components of a surface."""
+    graph = self._surfaces.get(surface_id)
+    return set(graph.references) if graph else set()
+
+  def root_id(self, surface_id: str) -> Optional[str]:
+    """Returns the root component ID of a surface, if known."""
+    graph = self._surfaces.get(surface_id)
+    return graph.root_id if graph else None
+
+  @contextlib.contextmanager
+  def transaction(self) -> Iterator[None]:
+    """Applies the updates made in the block together.
+
+    The updates are checked when the block exits, so a component may be
+    attached to its parent, or referenced, by a later update of the same
+    transaction. If a check fails, or the block raises, every update of the
+    transaction is undone. Nested transactions join the outer one.
+
+    Raises:
+      ComponentGraphError: If the updates are invalid. Its `surface_id` and
+        `component_id` identify the offending component.
+    """
+    if self._transaction is not None:
+      yield
+      return
+    transaction = self._transaction = _Transaction()
+    try:
+      yield
+      self._check(transaction)
+    except BaseException:
+      for undo in reversed(transaction.undo):
+        undo()
+      raise
+    finally:
+      self._transaction = None
+
+  def create_surface(self, surface_id: str, root_id: str) -> None:
+    """Starts tracking a new, empty surface, replacing any existing one."""
+    with self.transaction():
+      self._replace_surface(surface_id, _SurfaceGraph(root_id=root_id))
+
+  def set_root(self, surface_id: str, root_id: str) -> None:
+    """Sets the root of a surface and checks the components it already has.
+
+    Raises:
+      ValueError: If the components of the surface are invalid for this root.
+        The root is not set in that case.
+    """
+    with self.transaction():
+      graph = self._get_or_create_surface(surface_id)
+      previous = graph.root_id
+      self._transaction.undo.append(lambda: setattr(graph, "root_id", previous))
+      graph.root_id = root_id
+      self._transaction.pending_check(graph).check_all = True
+
+  def delete_surface(self, surface_id: str) -> None:
+    """Stops tracking a surface."""
+    with self.transaction():
+      self._replace_surface(surface_id, None)
+
+  def update_components(
+      self, surface_id: str, references: Mapping[str, References]
+  ) -> None:
+    """Adds or replaces components of a surface.
+
+    Args:
+      surface_id: The surface the components belong to.
+      references: Maps the ID of each component in the update to its
+        references to other components.
+
+    Raises:
+      ValueError: If the update is invalid, in which case it is not applied.
+    """
+    with self.transaction():
+      transaction = self._transaction
+      graph = self._get_or_create_surface(surface_id)
+      pending = transaction.pending_check(graph)
+      for component_id, component_references in references.items():
+        previous = graph.references.get(component_id)
+        transaction.undo.append(
+            functools.partial(graph.set_references, component_id, previous)
+        )
+        graph.set_references(component_id, list(component_references))
+        pending.changed[component_id] = None
+        if previous is None:
+          pending.added[component_id] = None
+
+  def _get_or_create_surface(self, surface_id: str) -> _SurfaceGraph:
+    graph = self._surfaces.get(surface_id)
+    if graph is None:
+      graph = _SurfaceGraph()
+      self._replace_surface(surface_id, graph)
+    return graph
+
+  def _replace_surface(self, surface_id: str, graph: Optional[_SurfaceGraph]) -> None:
+    """Replaces or, if `graph` is None, removes a surface, undoably."""
+    previous = self._surfaces.get(surface_id)
+
+    def undo():
+      if previous is None:
+        self._surfaces.pop(surface_id, None)
+      else:
+        self._surfaces[surface_id] = previous
+
+    self._transaction.undo.append(undo)
+    if graph is None:
+      self._surfaces.pop(surface_id, None)
+    else:
+      self._surfaces[surface_id] = graph
+
+  def _check(self, transaction: _Transaction) -> None:
+    """Runs the deferred checks of the surfaces that are still tracked."""
+    tracked = {id(graph): surface_id for surface_id, graph in self._surfaces.items()}
+    for pending in transaction.pending.values():
+      if id(pending.graph) not in tracked:
+        continue
+      try:
+        if pending.check_all:
+          all_ids = list(pending.graph.references)
+          pending.graph.check(all_ids, all_ids, self._max_depth)
+        else:
+          pending.graph.check(
+              list(pending.changed), list(pending.added), self._max_depth
+          )
+      except ComponentGraphError as e:
+        e.surface_id = tracked[id(pending.graph)]
+        raise
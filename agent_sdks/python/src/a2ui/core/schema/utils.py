@@ -14,12 +14,12 @@
 
 """Utilities for A2UI Schema manipulation."""
 
-import json
 import logging
 import os
 import importlib.resources
 from typing import Any, Dict
 
+from .. import codec
 from .constants import A2UI_ASSET_PACKAGE, SPECIFICATION_DIR, ENCODING
 from .catalog_provider import FileSystemCatalogProvider
 
@@ -57,7 +57,7 @@ def load_from_bundled_resource(
     traversable = importlib.resources.files(A2UI_ASSET_PACKAGE)
     traversable = traversable.joinpath(version).joinpath(filename)
     with traversable.open("r", encoding=ENCODING) as f:
-      return json.load(f)
+      return codec.loads(f.read())
   except Exception as e:
     logging.debug("Could not load '%s' from package resources: %s", filename, e)
 
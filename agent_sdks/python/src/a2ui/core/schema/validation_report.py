@@ -0,0 +1,83 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Structured reports of all the problems found in an A2UI payload."""
+
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple, Union
+
+# Kinds of validation issues.
+ERROR_SCHEMA = "schema"
+ERROR_INTEGRITY = "integrity"
+ERROR_TOPOLOGY = "topology"
+ERROR_RECURSION = "recursion"
+ERROR_PATH = "path"
+
+
+def json_pointer(tokens: Iterable[Union[str, int]]) -> str:
+  """Returns the RFC 6901 JSON Pointer for the given path tokens."""
+  return "".join(
+      "/" + str(token).replace("~", "~0").replace("/", "~1") for token in tokens
+  )
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+  """A single problem found in an A2UI payload.
+
+  Attributes:
+    kind: The kind of issue, one of the `ERROR_*` constants.
+    message: The description of the issue, as raised by
+      `A2uiValidator.validate`.
+    pointer: The JSON Pointer of the offending value in the payload, where the
+      payload is always a list of messages.
+    details: The failures of the alternatives of a `oneOf`/`anyOf` schema
+      error, when none of them is more likely than the others.
+  """
+
+  kind: str
+  message: str
+  pointer: str = ""
+  details: Tuple[str, ...] = ()
+
+
+@dataclass
+class ValidationReport:
+  """All the problems found in an A2UI payload by `A2uiValidator.validate_all`.
+
+  Attributes:
+    issues: The issues, in the order they were found: schema issues first,
+      then the integrity, topology, recursion and path issues of each message.
+  """
+
+  issues: List[ValidationIssue] = field(default_factory=list)
+
+  @property
+  def ok(self) -> bool:
+    return not self.issues
+
+  def format(self) -> str:
+    """Formats the issues as a list that can be sent back to the LLM."""
+    if self.ok:
+      return "No validation errors."
+    lines = [f"Found {len(self.issues)} validation error(s):"]
+    for issue in self.issues:
+      lines.append(f"- At '{issue.pointer}': {issue.message}")
+      lines.extend(f"    - {detail}" for detail in issue.details)
+    return "\n".join(lines)
+
+  def raise_for_errors(self) -> None:
+    """Raises a ValueError describing all the issues, if there are any."""
+    if not self.ok:
+      raise ValueError(self.format())
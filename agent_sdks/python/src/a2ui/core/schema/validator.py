@@ -12,12 +12,57 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import contextlib
 import copy
+import functools
+import logging
+import os
 import re
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union, Iterator
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    Iterable,
+    Iterator,
+)
 
-from jsonschema import Draft202012Validator
+from jsonschema import Draft202012Validator, ValidationError, validators
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
 
+from .cache import CacheStats, LruCache, content_hash
+from .compiler import (
+    CompiledSchema,
+    DiscriminatedUnion,
+    compile_schema,
+    find_discriminated_unions,
+)
+from .surface_state import (
+    ComponentGraphError,
+    References,
+    SurfaceValidationState,
+    walk_components,
+)
+from .validation_report import (
+    ERROR_INTEGRITY,
+    ERROR_PATH,
+    ERROR_RECURSION,
+    ERROR_SCHEMA,
+    ERROR_TOPOLOGY,
+    ValidationIssue,
+    ValidationReport,
+    json_pointer,
+)
 from .utils import wrap_as_json_array
 
 if TYPE_CHECKING:
@@ -28,6 +73,7 @@ from .constants import (
     CATALOG_COMPONENTS_KEY,
     CATALOG_ID_KEY,
     CATALOG_STYLES_KEY,
+    MAX_GLOBAL_DEPTH,
     VERSION_0_8,
     VERSION_0_9,
 )
@@ -36,9 +82,10 @@ from .constants import (
 JSON_POINTER_PATTERN = re.compile(r"^(?:\/(?:[^~\/]|~[01])*)*$")
 
 # Recursion Limits
-MAX_GLOBAL_DEPTH = 50
 MAX_FUNC_CALL_DEPTH = 5
 
+DRAFT_2020_12_SCHEMA = "https://json-schema.org/draft/2020-12/schema"
+
 # Constants
 COMPONENTS = "components"
 ID = "id"
@@ -48,6 +95,11 @@ FUNCTION_CALL = "functionCall"
 CALL = "call"
 ARGS = "args"
 
+# Maps a component type to the names of its single-reference fields (e.g.
+# `child`) and child-list fields (e.g. `children`).
+RefFieldsMap = Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]
+_NO_REF_FIELDS: Tuple[FrozenSet[str], FrozenSet[str]] = (frozenset(), frozenset())
+
 
 def _inject_additional_properties(
     schema: Dict[str, Any],
@@ -95,6 +147,169 @@ def _inject_additional_properties(
   return recursive_inject(schema), injected_keys
 
 
+def _without_default_dialect(schema: Any) -> Any:
+  """Returns the schema without a `$schema` declaring Draft 2020-12.
+
+  Draft 2020-12 is already the dialect of the validator. jsonschema re-selects
+  the validator class from `$schema` whenever it descends into a schema that
+  declares one, which would replace the discriminating validator class with the
+  stock one. The copy is shallow, so subschemas keep their identity.
+  """
+  if isinstance(schema, dict) and schema.get("$schema") == DRAFT_2020_12_SCHEMA:
+    return {k: v for k, v in schema.items() if k != "$schema"}
+  return schema
+
+
+def _schema_resource(contents: Any) -> Resource:
+  """Creates a Draft 2020-12 resource for a bundled schema."""
+  return Resource.from_contents(
+      _without_default_dialect(contents), default_specification=DRAFT202012
+  )
+
+
+# The maximum number of distinct catalogs whose validators are kept.
+VALIDATOR_CACHE_SIZE = 32
+
+_validator_cache: LruCache["A2uiValidator"] = LruCache(VALIDATOR_CACHE_SIZE)
+
+# Schema validation backends. `compiled` accepts valid payloads with the
+# specialized functions of `a2ui.core.schema.compiler` and falls back to
+# `jsonschema` to report the errors of invalid ones.
+VALIDATION_BACKEND_ENV_VAR = "A2UI_VALIDATION_BACKEND"
+JSONSCHEMA_BACKEND = "jsonschema"
+COMPILED_BACKEND = "compiled"
+VALIDATION_BACKENDS = [JSONSCHEMA_BACKEND, COMPILED_BACKEND]
+
+
+def resolve_validation_backend(backend: Optional[str] = None) -> str:
+  """Returns the validation backend to use.
+
+  Args:
+    backend: The requested backend. Defaults to the `A2UI_VALIDATION_BACKEND`
+      environment variable, or `jsonschema` if it is not set.
+
+  Raises:
+    ValueError: If the backend name is unknown.
+  """
+  backend = backend or os.environ.get(VALIDATION_BACKEND_ENV_VAR) or JSONSCHEMA_BACKEND
+  if backend not in VALIDATION_BACKENDS:
+    raise ValueError(
+        f"Unknown validation backend: {backend}. Supported: {VALIDATION_BACKENDS}"
+    )
+  return backend
+
+
+def get_cached_validator(
+    catalog: "A2uiCatalog",
+    backend: Optional[str] = None,
+    discriminator_dispatch: bool = False,
+) -> "A2uiValidator":
+  """Returns the shared validator for catalogs with the same fingerprint."""
+  backend = resolve_validation_backend(backend)
+  return _validator_cache.get_or_create(
+      (catalog.fingerprint, backend, discriminator_dispatch),
+      lambda: A2uiValidator(catalog, backend, discriminator_dispatch),
+  )
+
+
+def validator_cache_stats() -> CacheStats:
+  """Returns the hit/miss stats of the validator cache."""
+  return _validator_cache.stats()
+
+
+def clear_validator_cache() -> None:
+  """Drops all cached validators and resets the stats."""
+  _validator_cache.clear()
+
+
+# Results of `A2uiValidator.validate`, keyed by the catalog fingerprint and a
+# hash of the canonical payload. Disabled unless a size is configured.
+VALIDATION_CACHE_SIZE_ENV_VAR = "A2UI_VALIDATION_CACHE_SIZE"
+
+_result_cache: Optional[LruCache[Optional[str]]] = None
+
+
+def set_validation_result_cache_size(maxsize: int) -> None:
+  """Enables the validation result cache with the given size, or disables it.
+
+  Once enabled, validating a payload with the same content as a previously
+  validated one (against a catalog with the same fingerprint) returns or raises
+  the cached outcome without validating it again. Validation with a
+  `SurfaceValidationState` is never cached, since it depends on the state.
+
+  Args:
+    maxsize: The maximum number of cached results, or 0 to disable the cache.
+      Changing the size drops all cached results.
+  """
+  global _result_cache
+  _result_cache = LruCache(maxsize) if maxsize > 0 else None
+
+
+def validation_result_cache_stats() -> Optional[CacheStats]:
+  """Returns the hit/miss stats of the result cache, or None if it is disabled."""
+  return _result_cache.stats() if _result_cache is not None else None
+
+
+def clear_validation_result_cache() -> None:
+  """Drops all cached validation results and resets the stats."""
+  if _result_cache is not None:
+    _result_cache.clear()
+
+
+def _cache_size_from_env() -> int:
+  """Returns the result cache size set in the environment, or 0 if unset or invalid."""
+  value = os.environ.get(VALIDATION_CACHE_SIZE_ENV_VAR)
+  if not value:
+    return 0
+  try:
+    return int(value)
+  except ValueError:
+    logging.warning(
+        "Ignoring invalid %s=%r: the validation result cache is disabled",
+        VALIDATION_CACHE_SIZE_ENV_VAR,
+        value,
+    )
+    return 0
+
+
+set_validation_result_cache_size(_cache_size_from_env())
+
+
+def _discriminating_validator_class(
+    unions: Dict[int, DiscriminatedUnion],
+) -> type:
+  """Returns a Draft 2020-12 validator class that dispatches the given unions.
+
+  In v0.9, `anyComponent` is a `oneOf` over every component of the catalog
+  discriminated by the `component` string. jsonschema evaluates every branch
+  and reports all of their failures, while the branch named by the instance
+  is the only one that can match. (v0.8 component wrappers are keyed by the
+  component type and validated with `properties`, which already only
+  evaluates the present key.)
+  """
+  one_of = Draft202012Validator.VALIDATORS["oneOf"]
+
+  def discriminated_one_of(validator, branches, instance, schema):
+    union = unions.get(id(schema))
+    if union is None or union.schema is not schema or not isinstance(instance, dict):
+      yield from one_of(validator, branches, instance, schema)
+      return
+
+    value = instance.get(union.property_name)
+    index = union.branches.get(value) if isinstance(value, str) else None
+    if index is not None:
+      yield from validator.descend(instance, branches[index], schema_path=index)
+    elif union.property_name not in instance:
+      yield ValidationError(f"{union.property_name!r} is a required property")
+    else:
+      yield ValidationError(
+          f"{value!r} is not a valid {union.property_name!r}. Expected one of:"
+          f" {sorted(union.branches)}"
+      )
+
+  return validators.extend(Draft202012Validator, {"oneOf": discriminated_one_of})
+
+
 class A2uiValidator:
   """Validates the A2UI JSON payload against the provided schema and checks for integrity.
 
@@ -114,24 +329,64 @@ class A2uiValidator:
       -   Validates JSON Pointer syntax for data paths.
 
   Args:
-      a2ui_json: The JSON payload to validate.
-      a2ui_schema: The schema to validate against.
+      catalog: The catalog whose schemas are validated against.
+      backend: The schema validation backend, one of `VALIDATION_BACKENDS`.
+        Defaults to the `A2UI_VALIDATION_BACKEND` environment variable, or
+        `jsonschema`.
+      discriminator_dispatch: Whether component unions that declare a
+        `discriminator` (e.g. `anyComponent`) validate only the branch selected
+        by the discriminator value, so errors describe that branch alone.
+        This is faster and changes the error messages of invalid components,
+        so it is off by default.
 
   Raises:
       jsonschema.ValidationError: If the payload does not match the schema.
       ValueError: If integrity, topology, or recursion checks fail.
   """
 
-  def __init__(self, catalog: "A2uiCatalog"):
+  def __init__(
+      self,
+      catalog: "A2uiCatalog",
+      backend: Optional[str] = None,
+      discriminator_dispatch: bool = False,
+  ):
     self._catalog = catalog
-    self._validator = self._build_validator()
-
-  def _build_validator(self) -> Draft202012Validator:
-    """Builds a validator for the A2UI schema."""
+    self._backend = resolve_validation_backend(backend)
+    self._discriminator_dispatch = discriminator_dispatch
+    schema, registry = self._build_schema()
+    self._schema_and_registry = (schema, registry)
+    validator_class = Draft202012Validator
+    if discriminator_dispatch:
+      validator_class = _discriminating_validator_class(self._discriminated_unions)
+    self._validator = validator_class(schema, registry=registry)
+    self._compiled: Optional[CompiledSchema] = None
+    if self._backend == COMPILED_BACKEND:
+      self._compiled = compile_schema(schema, registry)
+    # The catalog does not change, so its reference fields are extracted once.
+    self._ref_fields_map = _extract_component_ref_fields(catalog)
+    # The thread pool of `validate_many` and `validate_async`, created on first
+    # use and shared by all their calls. The finalizer shuts it down when the
+    # validator is garbage collected without being closed.
+    self._executor: Optional[ThreadPoolExecutor] = None
+    self._executor_finalizer: Optional[weakref.finalize] = None
+    self._executor_lock = threading.Lock()
+
+  @functools.cached_property
+  def _discriminated_unions(self) -> Dict[int, DiscriminatedUnion]:
+    """The unions of the schema that dispatch on a discriminator."""
+    return find_discriminated_unions(*self._schema_and_registry)
+
+  @property
+  def backend(self) -> str:
+    """The schema validation backend, one of `VALIDATION_BACKENDS`."""
+    return self._backend
+
+  def _build_schema(self) -> Tuple[Dict[str, Any], Registry]:
+    """Builds the A2UI schema and the registry resolving its references."""
 
     if self._catalog.version == VERSION_0_8:
-      return self._build_0_8_validator()
-    return self._build_0_9_validator()
+      return self._build_0_8_schema()
+    return self._build_0_9_schema()
 
   def _bundle_0_8_schemas(self) -> Dict[str, Any]:
     if not self._catalog.s2c_schema:
@@ -152,17 +407,13 @@ class A2uiValidator:
     bundled, _ = _inject_additional_properties(bundled, source_properties)
     return bundled
 
-  def _build_0_8_validator(self) -> Draft202012Validator:
-    """Builds a validator for the A2UI schema version 0.8."""
+  def _build_0_8_schema(self) -> Tuple[Dict[str, Any], Registry]:
+    """Builds the A2UI schema version 0.8."""
     bundled_schema = self._bundle_0_8_schemas()
     full_schema = wrap_as_json_array(bundled_schema)
 
-    from referencing import Registry, Resource
-    from referencing.jsonschema import DRAFT202012
-
     # Even in v0.8, we may have references to common_types.json or other files.
     base_uri = self._catalog.s2c_schema.get("$id", BASE_SCHEMA_URL)
-    import os
 
     def get_sibling_uri(uri, filename):
       return os.path.join(os.path.dirname(uri), filename)
@@ -172,40 +423,31 @@ class A2uiValidator:
     resources = [
         (
             common_types_uri,
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
         (
             "common_types.json",
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
     ]
 
     registry = Registry().with_resources(resources)
     validator_schema = copy.deepcopy(full_schema)
-    validator_schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
+    validator_schema["items"] = _without_default_dialect(validator_schema["items"])
+    validator_schema["$schema"] = DRAFT_2020_12_SCHEMA
 
-    return Draft202012Validator(validator_schema, registry=registry)
+    return validator_schema, registry
 
-  def _build_0_9_validator(self) -> Draft202012Validator:
-    """Builds a validator for the A2UI schema version 0.9+."""
+  def _build_0_9_schema(self) -> Tuple[Dict[str, Any], Registry]:
+    """Builds the A2UI schema version 0.9+."""
     full_schema = wrap_as_json_array(self._catalog.s2c_schema)
 
-    from referencing import Registry, Resource
-    from referencing.jsonschema import DRAFT202012
-
     # v0.9 schemas (e.g. server_to_client.json) use relative references like
     # 'catalog.json#/$defs/anyComponent'. Since server_to_client.json has
     # $id: https://a2ui.org/specification/v0_9/server_to_client.json,
     # these resolve to https://a2ui.org/specification/v0_9/catalog.json.
     # We must register them using these absolute URIs.
     base_uri = self._catalog.s2c_schema.get("$id", BASE_SCHEMA_URL)
-    import os
 
     def get_sibling_uri(uri, filename):
       return os.path.join(os.path.dirname(uri), filename)
@@ -216,56 +458,91 @@ class A2uiValidator:
     resources = [
         (
             common_types_uri,
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
         (
             catalog_uri,
-            Resource.from_contents(
-                self._catalog.catalog_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.catalog_schema),
         ),
         # Fallbacks for robustness
         (
             "catalog.json",
-            Resource.from_contents(
-                self._catalog.catalog_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.catalog_schema),
         ),
         (
             "common_types.json",
-            Resource.from_contents(
-                self._catalog.common_types_schema,
-                default_specification=DRAFT202012,
-            ),
+            _schema_resource(self._catalog.common_types_schema),
         ),
     ]
     # Also register the catalog ID if it's different from the catalog URI
     if self._catalog.catalog_id and self._catalog.catalog_id != catalog_uri:
       resources.append((
           self._catalog.catalog_id,
-          Resource.from_contents(
-              self._catalog.catalog_schema,
-              default_specification=DRAFT202012,
-          ),
+          _schema_resource(self._catalog.catalog_schema),
       ))
 
     registry = Registry().with_resources(resources)
     validator_schema = copy.deepcopy(full_schema)
-    validator_schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
-
-    return Draft202012Validator(validator_schema, registry=registry)
-
-  def validate(self, a2ui_json: Union[Dict[str, Any], List[Any]]) -> None:
-    """Validates an A2UI messages against the schema."""
+    validator_schema["items"] = _without_default_dialect(validator_schema["items"])
+    validator_schema["$schema"] = DRAFT_2020_12_SCHEMA
+
+    return validator_schema, registry
+
+  def validate(
+      self,
+      a2ui_json: Union[Dict[str, Any], List[Any]],
+      state: Optional[SurfaceValidationState] = None,
+  ) -> None:
+    """Validates an A2UI messages against the schema.
+
+    If the validation result cache is enabled (see
+    `set_validation_result_cache_size`), the outcome is cached by content.
+
+    Args:
+      a2ui_json: The A2UI message or list of messages.
+      state: The component graphs of the surfaces from previously validated
+        messages. If given, component updates are also checked against the
+        components already sent to their surface. The messages are applied to
+        the state together (see `SurfaceValidationState.transaction`), and
+        only if the whole payload is valid.
+    """
     messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+    cache = _result_cache
+    if cache is None or state is not None:
+      self._validate(messages, state)
+      return
+
+    try:
+      key = (
+          self._catalog.fingerprint,
+          self._discriminator_dispatch,
+          content_hash(messages),
+      )
+    except Exception:
+      # Payloads that are not JSON-compatible are validated without the cache.
+      self._validate(messages, None)
+      return
+    error = cache.get_or_create(key, lambda: self._validation_error(messages))
+    if error is not None:
+      raise ValueError(error)
 
-    # Basic schema validation
-    error = next(self._validator.iter_errors(messages), None)
+  def _validation_error(self, messages: List[Any]) -> Optional[str]:
+    """Validates the messages and returns the error message, if any."""
+    try:
+      self._validate(messages, None)
+      return None
+    except ValueError as e:
+      return str(e)
+
+  def _validate(
+      self, messages: List[Any], state: Optional[SurfaceValidationState]
+  ) -> None:
+    # Basic schema validation. The compiled schema only accepts or rejects, so
+    # jsonschema reports the errors of rejected payloads.
+    if self._compiled is None or not self._compiled.is_valid(messages):
+      error = next(self._validator.iter_errors(messages), None)
+    else:
+      error = None
     if error is not None:
       msg = f"Validation failed: {error.message}"
       if error.context:
@@ -274,28 +551,403 @@ class A2uiValidator:
           msg += f"\n  - {sub_error.message}"
       raise ValueError(msg)
 
-    for message in messages:
-      if not isinstance(message, dict):
-        continue
+    with state.transaction() if state is not None else contextlib.nullcontext():
+      for message in messages:
+        if not isinstance(message, dict):
+          continue
+
+        _, surface_id, components = _get_component_update(message)
+        if components:
+          root_id = _find_root_id(messages, surface_id)
+          _validate_components(root_id, components, self._ref_fields_map)
+
+        _validate_recursion_and_paths(message)
+
+        if state is not None:
+          self._update_surface_state(state, message, surface_id, components)
+
+  def validate_all(
+      self,
+      a2ui_json: Union[Dict[str, Any], List[Any]],
+      state: Optional[SurfaceValidationState] = None,
+  ) -> ValidationReport:
+    """Validates A2UI messages and reports all problems instead of the first.
+
+    This performs the checks of `validate`, but collects every schema error and
+    every integrity, topology, recursion and path error of each message, so
+    that they can all be sent back to the LLM in a single retry. The
+    semantic checks of a message are skipped if it does not match the schema.
+
+    Args:
+      a2ui_json: The A2UI message or list of messages.
+      state: The component graphs of the surfaces from previously validated
+        messages, as in `validate`. It is only updated if the payload has no
+        issues.
+
+    Returns:
+      A ValidationReport whose issues point into the list of messages.
+    """
+    messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+    issues: List[ValidationIssue] = []
+    report = ValidationReport(issues)
+
+    invalid_messages = set()
+    if self._compiled is None or not self._compiled.is_valid(messages):
+      for error in self._validator.iter_errors(messages):
+        for message, path, details in _schema_error_leaves(
+            error, self._discriminated_unions
+        ):
+          issues.append(
+              ValidationIssue(ERROR_SCHEMA, message, json_pointer(path), details)
+          )
+        if not error.absolute_path:
+          return report
+        invalid_messages.add(error.absolute_path[0])
 
-      components = None
-      surface_id = None
-      if "surfaceUpdate" in message:  # v0.8
-        components = message["surfaceUpdate"].get(COMPONENTS)
-        surface_id = message["surfaceUpdate"].get("surfaceId")
-      elif "updateComponents" in message and isinstance(
-          message["updateComponents"], dict
-      ):  # v0.9
-        components = message["updateComponents"].get(COMPONENTS)
-        surface_id = message["updateComponents"].get("surfaceId")
+    for index, message in enumerate(messages):
+      if index in invalid_messages or not isinstance(message, dict):
+        continue
 
+      key, surface_id, components = _get_component_update(message)
       if components:
-        ref_map = _extract_component_ref_fields(self._catalog)
         root_id = _find_root_id(messages, surface_id)
-        _validate_component_integrity(root_id, components, ref_map)
-        _validate_topology(root_id, components, ref_map)
+        _validate_components(
+            root_id,
+            components,
+            self._ref_fields_map,
+            issues,
+            json_pointer((index, key, COMPONENTS)),
+        )
 
-      _validate_recursion_and_paths(message)
+      _collect_recursion_and_path_issues(message, json_pointer((index,)), issues)
+
+    if state is not None and report.ok:
+      self._collect_surface_state_issues(state, messages, issues)
+
+    return report
+
+  def _collect_surface_state_issues(
+      self,
+      state: SurfaceValidationState,
+      messages: List[Any],
+      issues: List[ValidationIssue],
+  ) -> None:
+    """Applies the messages to the state, or reports why they cannot be.
+
+    The issue points to the offending component in the last message of the
+    payload that updates it or, for a component sent by an earlier payload, to
+    the last message of its surface.
+    """
+    # The index of the last message of each surface, and the location of the
+    # last update of each component as (message index, key, component index).
+    surface_messages: Dict[Optional[str], int] = {}
+    locations: Dict[Tuple[Optional[str], str], Tuple[int, str, int]] = {}
+    try:
+      with state.transaction():
+        for index, message in enumerate(messages):
+          key, surface_id, components = _get_component_update(message)
+          surface_messages[_message_surface_id(message)] = index
+          for comp_index, comp in enumerate(components or ()):
+            if comp.get(ID) is not None:
+              locations[(surface_id, comp[ID])] = (index, key, comp_index)
+          self._update_surface_state(state, message, surface_id, components)
+    except ComponentGraphError as e:
+      location = locations.get((e.surface_id, e.component_id))
+      if location is not None:
+        index, key, comp_index = location
+        pointer = json_pointer((index, key, COMPONENTS))
+        if e.field_name is None:
+          pointer += json_pointer((comp_index,))
+        else:
+          component = messages[index][key][COMPONENTS][comp_index]
+          pointer += _reference_pointer(component, comp_index, e.field_name)
+      elif e.surface_id in surface_messages:
+        pointer = json_pointer((surface_messages[e.surface_id],))
+      else:
+        pointer = ""
+      issues.append(ValidationIssue(e.kind, str(e), pointer))
+
+  def validate_many(
+      self,
+      a2ui_json: Union[Dict[str, Any], List[Any]],
+      executor: Optional[Executor] = None,
+  ) -> None:
+    """Validates A2UI messages, checking the messages of each surface concurrently.
+
+    Messages are partitioned by `surfaceId`. Every check of `validate` only
+    relates messages of the same surface, so the partitions are validated
+    independently and the outcome is the same as validating them all at once.
+
+    Args:
+      a2ui_json: The A2UI message or list of messages.
+      executor: The executor the surfaces are validated in. Defaults to a
+        thread pool kept by the validator for all calls, until `close`. Threads only run the
+        checks in parallel on free-threaded Python builds; for CPU parallelism
+        on large payloads, pass a pool from `create_process_pool`, created once
+        and reused. A single surface is validated in the current thread.
+
+    Raises:
+      ValueError: If any surface is invalid. The error of the surface that
+        appears first in the messages is raised.
+    """
+    messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+    partitions = _partition_by_surface(messages)
+    if len(partitions) <= 1:
+      self.validate(messages)
+      return
+
+    executor = executor or self._get_executor()
+    errors = list(executor.map(self._partition_validator(executor), partitions))
+    for error in errors:
+      if error is not None:
+        raise error
+
+  async def validate_async(
+      self,
+      a2ui_json: Union[Dict[str, Any], List[Any]],
+      executor: Optional[Executor] = None,
+  ) -> None:
+    """Like `validate_many`, but awaits the surfaces instead of blocking.
+
+    Use this from async code, such as ADK tools, so that validating large
+    payloads does not block the event loop. Every surface, even a single one,
+    is validated in the executor.
+    """
+    messages = a2ui_json if isinstance(a2ui_json, list) else [a2ui_json]
+    executor = executor or self._get_executor()
+    validate_partition = self._partition_validator(executor)
+    loop = asyncio.get_running_loop()
+    errors = await asyncio.gather(*(
+        loop.run_in_executor(executor, validate_partition, partition)
+        for partition in _partition_by_surface(messages)
+    ))
+    for error in errors:
+      if error is not None:
+        raise error
+
+  def create_process_pool(
+      self, max_workers: Optional[int] = None
+  ) -> ProcessPoolExecutor:
+    """Creates a process pool for `validate_many` and `validate_async`.
+
+    Each worker process builds this validator once, when it starts. The pool
+    can only validate for this validator, and the caller owns it: keep it for
+    as long as the validator is used, then shut it down.
+
+    Args:
+      max_workers: The number of worker processes. Defaults to the number of
+        CPUs.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_validation_worker,
+        initargs=(self._catalog, self._backend, self._discriminator_dispatch),
+    )
+
+  def close(self) -> None:
+    """Shuts down the thread pool of `validate_many` and `validate_async`.
+
+    Waits for the validations running in it. The validator remains usable: a
+    later call creates a new pool. A validator that is garbage collected
+    without being closed shuts its pool down without waiting.
+    """
+    with self._executor_lock:
+      executor, self._executor = self._executor, None
+      finalizer, self._executor_finalizer = self._executor_finalizer, None
+    if finalizer is not None:
+      finalizer.detach()
+    if executor is not None:
+      executor.shutdown(wait=True)
+
+  def __enter__(self) -> "A2uiValidator":
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self.close()
+
+  def _get_executor(self) -> Executor:
+    """Returns the thread pool shared by the calls without an executor."""
+    with self._executor_lock:
+      if self._executor is None:
+        self._executor = ThreadPoolExecutor(thread_name_prefix="a2ui-validation")
+        self._executor_finalizer = weakref.finalize(
+            self, self._executor.shutdown, wait=False
+        )
+      return self._executor
+
+  def _partition_validator(self, executor: Executor):
+    """Returns the function validating one partition in the executor."""
+    if isinstance(executor, ProcessPoolExecutor):
+      return functools.partial(_validate_worker_partition, self._worker_key())
+    return functools.partial(_validate_partition, self)
+
+  def _worker_key(self) -> Tuple[str, str, bool]:
+    return (self._catalog.fingerprint, self._backend, self._discriminator_dispatch)
+
+  def _update_surface_state(
+      self,
+      state: SurfaceValidationState,
+      message: Dict[str, Any],
+      surface_id: Optional[str],
+      components: Optional[List[Dict[str, Any]]],
+  ) -> None:
+    """Applies a validated message to the surface state."""
+    if "createSurface" in message:
+      state.create_surface(message["createSurface"].get("surfaceId"), ROOT)
+    elif "beginRendering" in message:
+      begin_rendering = message["beginRendering"]
+      state.set_root(begin_rendering.get("surfaceId"), begin_rendering.get(ROOT, ROOT))
+    elif "deleteSurface" in message:
+      state.delete_surface(message["deleteSurface"].get("surfaceId"))
+    elif components:
+      state.update_components(
+          surface_id,
+          {
+              comp[ID]: list(_get_component_references(comp, self._ref_fields_map))
+              for comp in components
+              if comp.get(ID) is not None
+          },
+      )
+
+
+def _partition_by_surface(messages: Iterable[Any]) -> List[List[Any]]:
+  """Groups messages by `surfaceId`, in order of first appearance.
+
+  Messages without a surface ID, which fail schema validation, are grouped
+  together.
+  """
+  partitions: Dict[Optional[str], List[Any]] = {}
+  for message in messages:
+    partitions.setdefault(_message_surface_id(message), []).append(message)
+  return list(partitions.values())
+
+
+def _message_surface_id(message: Any) -> Optional[str]:
+  """Returns the `surfaceId` of a message of any type, if it has one."""
+  if isinstance(message, dict):
+    for value in message.values():
+      if isinstance(value, dict) and isinstance(value.get("surfaceId"), str):
+        return value["surfaceId"]
+  return None
+
+
+# The validator of the current worker process, built once by
+# `_init_validation_worker`.
+_worker_validator: Optional["A2uiValidator"] = None
+
+
+def _init_validation_worker(
+    catalog: "A2uiCatalog", backend: str, discriminator_dispatch: bool
+) -> None:
+  """Builds the validator once per worker process."""
+  global _worker_validator
+  _worker_validator = get_cached_validator(catalog, backend, discriminator_dispatch)
+
+
+def _validate_worker_partition(
+    key: Tuple[str, str, bool], messages: List[Any]
+) -> Optional[ValueError]:
+  """Validates the messages of one surface with the worker's validator."""
+  if _worker_validator is None or _worker_validator._worker_key() != key:
+    return ValueError(
+        "The process pool was not created by this validator's create_process_pool"
+    )
+  return _validate_partition(_worker_validator, messages)
+
+
+def _validate_partition(
+    validator: "A2uiValidator", messages: List[Any]
+) -> Optional[ValueError]:
+  """Validates the messages of one surface and returns the error, if any."""
+  try:
+    validator.validate(messages)
+    return None
+  except Exception as e:
+    # Exceptions travel back to the parent process by pickling, which fails for
+    # some third-party exception types. The message is all callers rely on.
+    if not isinstance(e, ValueError):
+      e = ValueError(f"{type(e).__name__}: {e}")
+    return e
+
+
+def _schema_error_leaves(
+    error: ValidationError, unions: Dict[int, DiscriminatedUnion]
+) -> Iterator[Tuple[str, List[Union[str, int]], Tuple[str, ...]]]:
+  """Yields the message, path and details of the underlying failures of a
+  schema error.
+
+  An error of a `oneOf`/`anyOf` that no branch matches is replaced by the
+  failures of the branch the instance was most likely meant to match: the
+  branch named by the discriminator of a discriminated union, or else the
+  branch whose failures are deepest in the instance, then the one with the
+  fewest failures. If no branch stands out, the error itself is reported, with
+  the failures of every branch as details.
+  """
+  if not error.context:
+    yield error.message, list(error.absolute_path), ()
+    return
+
+  branches: Dict[Any, List[ValidationError]] = {}
+  for sub_error in error.context:
+    branches.setdefault(sub_error.relative_schema_path[0], []).append(sub_error)
+
+  union = unions.get(id(error.schema)) if error.validator == "oneOf" else None
+  if union is not None and isinstance(error.instance, dict):
+    value = error.instance.get(union.property_name)
+    index = union.branches.get(value) if isinstance(value, str) else None
+    if index is None:
+      # Every branch fails on the discriminator, so that is the failure.
+      if union.property_name not in error.instance:
+        yield (
+            f"{union.property_name!r} is a required property",
+            list(error.absolute_path),
+            (),
+        )
+      else:
+        yield (
+            (
+                f"{value!r} is not a valid {union.property_name!r}. Expected one of:"
+                f" {sorted(union.branches)}"
+            ),
+            list(error.absolute_path) + [union.property_name],
+            (),
+        )
+      return
+    if index in branches:
+      for sub_error in branches[index]:
+        yield from _schema_error_leaves(sub_error, unions)
+      return
+
+  def likelihood(branch: Any) -> Tuple[int, int]:
+    sub_errors = branches[branch]
+    return (
+        max(len(sub_error.absolute_path) for sub_error in sub_errors),
+        -len(sub_errors),
+    )
+
+  ranked = sorted(branches, key=likelihood, reverse=True)
+  if len(ranked) > 1 and likelihood(ranked[0]) == likelihood(ranked[1]):
+    # The instance is no closer to one branch than to another.
+    details = tuple(sub_error.message for sub_error in error.context)
+    yield error.message, list(error.absolute_path), details
+    return
+  for sub_error in branches[ranked[0]]:
+    yield from _schema_error_leaves(sub_error, unions)
+
+
+def _get_component_update(
+    message: Dict[str, Any],
+) -> Tuple[Optional[str], Optional[str], Optional[List[Dict[str, Any]]]]:
+  """Returns the key, surface ID and components of a component update message."""
+  if "surfaceUpdate" in message:  # v0.8
+    update = message["surfaceUpdate"]
+    return "surfaceUpdate", update.get("surfaceId"), update.get(COMPONENTS)
+  if "updateComponents" in message and isinstance(
+      message["updateComponents"], dict
+  ):  # v0.9
+    update = message["updateComponents"]
+    return "updateComponents", update.get("surfaceId"), update.get(COMPONENTS)
+  return None, None, None
 
 
 def _find_root_id(
@@ -320,120 +972,152 @@ def _find_root_id(
   return None
 
 
-def _validate_component_integrity(
+def _validate_components(
     root_id: Optional[str],
     components: List[Dict[str, Any]],
-    ref_fields_map: Dict[str, tuple[Set[str], Set[str]]],
+    ref_fields_map: RefFieldsMap,
+    issues: Optional[List[ValidationIssue]] = None,
+    pointer: str = "",
 ) -> None:
   """
-  Validates that:
+  Validates the components of one message. The references of each component
+  are extracted once and checked without recursion:
   1. All component IDs are unique.
   2. A 'root' component exists.
   3. All references point to existing IDs.
-  """
-  ids: Set[str] = set()
+  4. No circular references (including self-references).
+  5. The component tree does not exceed the global depth limit.
+  6. No orphaned components (all components must be reachable from 'root').
 
-  # 1. Collect IDs and check for duplicates
-  for comp in components:
+  In an incremental update (root_id is None), components may reference IDs
+  already on the client, so only uniqueness, cycles and depth are checked.
+
+  If `issues` is given, every failure is appended to it, pointing below
+  `pointer` (the pointer of the component list), instead of raising the first.
+  """
+  references: Dict[str, References] = {}
+  # The references of every component in order, including those without an
+  # ID, which take no part in the topology but must not dangle.
+  ordered_references: List[Tuple[int, Optional[str], References]] = []
+  indices: Dict[str, int] = {}
+  for index, comp in enumerate(components):
     comp_id = comp.get(ID)
-    if comp_id is None:
+    if comp_id is not None and comp_id in references:
+      _report(
+          issues,
+          ERROR_INTEGRITY,
+          f"Duplicate component ID: {comp_id}",
+          json_pointer((index, ID)),
+          pointer,
+      )
       continue
+    refs = list(_get_component_references(comp, ref_fields_map))
+    ordered_references.append((index, comp_id, refs))
+    if comp_id is not None:
+      references[comp_id] = refs
+      indices[comp_id] = index
 
-    if comp_id in ids:
-      raise ValueError(f"Duplicate component ID: {comp_id}")
-    ids.add(comp_id)
+  def component_pointer(comp_id: str) -> str:
+    return json_pointer((indices[comp_id],))
 
-  # 2. Check for root component
-  if root_id is not None and root_id not in ids:
-    raise ValueError(f"Missing root component: No component has id='{root_id}'")
-
-  # 3. Check for dangling references using helper
-  # In an incremental update (root_id is None), components may reference IDs already on the client.
   if root_id is not None:
-    for comp in components:
-      for ref_id, field_name in _get_component_references(comp, ref_fields_map):
-        if ref_id not in ids:
-          raise ValueError(
-              f"Component '{comp.get(ID)}' references non-existent component '{ref_id}'"
-              f" in field '{field_name}'"
+    if root_id not in references:
+      _report(
+          issues,
+          ERROR_INTEGRITY,
+          f"Missing root component: No component has id='{root_id}'",
+          "",
+          pointer,
+      )
+    for index, comp_id, refs in ordered_references:
+      for ref_id, field_name in refs:
+        if ref_id not in references:
+          _report(
+              issues,
+              ERROR_INTEGRITY,
+              f"Component '{comp_id}' references non-existent component '{ref_id}'"
+              f" in field '{field_name}'",
+              _reference_pointer(components[index], index, field_name),
+              pointer,
           )
 
-
-def _validate_topology(
-    root_id: Optional[str],
-    components: List[Dict[str, Any]],
-    ref_fields_map: Dict[str, tuple[Set[str], Set[str]]],
-) -> None:
-  """
-  Validates the topology of the component tree:
-  1. No circular references (including self-references).
-  2. No orphaned components (all components must be reachable from 'root').
-  """
-  adj_list: Dict[str, List[str]] = {}
-  all_ids: Set[str] = set()
-
-  # Build Adjacency List
-  for comp in components:
-    comp_id = comp.get(ID)
-    if comp_id is None:
-      continue
-
-    all_ids.add(comp_id)
-    if comp_id not in adj_list:
-      adj_list[comp_id] = []
-
-    for ref_id, field_name in _get_component_references(comp, ref_fields_map):
+  self_references = False
+  for comp_id, refs in references.items():
+    for ref_id, field_name in refs:
       if ref_id == comp_id:
-        raise ValueError(
-            f"Self-reference detected: Component '{comp_id}' references itself in field"
-            f" '{field_name}'"
+        self_references = True
+        _report(
+            issues,
+            ERROR_TOPOLOGY,
+            f"Self-reference detected: Component '{comp_id}' references itself in"
+            f" field '{field_name}'",
+            _reference_pointer(
+                components[indices[comp_id]], indices[comp_id], field_name
+            ),
+            pointer,
         )
-      adj_list[comp_id].append(ref_id)
+  if self_references:
+    # Only reached when collecting issues: self-references were reported once.
+    references = {
+        comp_id: [ref for ref in refs if ref[0] != comp_id]
+        for comp_id, refs in references.items()
+    }
 
-  # Detect Cycles and Depth using DFS
   visited: Set[str] = set()
-  recursion_stack: Set[str] = set()
-
-  def dfs(node_id: str, depth: int):
-    if depth > MAX_GLOBAL_DEPTH:
-      raise ValueError(
-          f"Global recursion limit exceeded: logical depth > {MAX_GLOBAL_DEPTH}"
+  if root_id is not None and root_id in references:
+    try:
+      walk_components(references, root_id, visited, MAX_GLOBAL_DEPTH)
+    except ValueError as e:
+      _report(issues, ERROR_TOPOLOGY, str(e), component_pointer(root_id), pointer)
+      # The walk stopped early, so orphans cannot be told apart.
+      return
+    for orphan in sorted(references.keys() - visited):
+      _report(
+          issues,
+          ERROR_TOPOLOGY,
+          f"Component '{orphan}' is not reachable from '{root_id}'",
+          component_pointer(orphan),
+          pointer,
       )
+  else:
+    # Partial update (or, when collecting issues, a missing root): we cannot
+    # check root reachability, but we still check for cycles
+    for comp_id in references:
+      if comp_id not in visited:
+        try:
+          walk_components(references, comp_id, visited, MAX_GLOBAL_DEPTH)
+        except ValueError as e:
+          _report(issues, ERROR_TOPOLOGY, str(e), component_pointer(comp_id), pointer)
+
+
+def _report(
+    issues: Optional[List[ValidationIssue]],
+    kind: str,
+    message: str,
+    relative_pointer: str,
+    pointer: str,
+) -> None:
+  """Raises a ValueError, or appends the issue when collecting issues."""
+  if issues is None:
+    raise ValueError(message)
+  issues.append(ValidationIssue(kind, message, pointer + relative_pointer))
 
-    visited.add(node_id)
-    recursion_stack.add(node_id)
-
-    for neighbor in adj_list.get(node_id, []):
-      if neighbor not in visited:
-        dfs(neighbor, depth + 1)
-      elif neighbor in recursion_stack:
-        raise ValueError(
-            f"Circular reference detected involving component '{neighbor}'"
-        )
-
-    recursion_stack.remove(node_id)
 
-  if root_id is not None:
-    if root_id in all_ids:
-      dfs(root_id, 0)
+def _reference_pointer(component: Dict[str, Any], index: int, field_name: str) -> str:
+  """Returns the pointer of a reference field relative to the component list.
 
-    # Check for Orphans
-    orphans = all_ids - visited
-    if orphans:
-      sorted_orphans = sorted(list(orphans))
-      raise ValueError(
-          f"Component '{sorted_orphans[0]}' is not reachable from '{root_id}'"
-      )
-  else:
-    # Partial update: we cannot check root reachability, but we still check for cycles
-    for node_id in all_ids:
-      if node_id not in visited:
-        dfs(node_id, 0)
+  Field names such as `children.explicitList` or `tabs[0].child` name nested
+  values. References in a list point to the list itself.
+  """
+  tokens: List[Union[str, int]] = [index]
+  comp_val = component.get("component")
+  if isinstance(comp_val, dict):  # v0.8 properties are nested by type.
+    tokens.extend(("component", next(iter(comp_val), "")))
+  tokens.extend(re.sub(r"\[(\d+)\]", r".\1", field_name).split("."))
+  return json_pointer(tokens)
 
 
-def _extract_component_ref_fields(
-    catalog: "A2uiCatalog",
-) -> Dict[str, tuple[Set[str], Set[str]]]:
+def _extract_component_ref_fields(catalog: "A2uiCatalog") -> RefFieldsMap:
   """
   Parses the catalog/schema to identify which component properties reference other components.
   Returns a map: { component_name: (set_of_single_ref_fields, set_of_list_ref_fields) }
@@ -548,13 +1232,13 @@ def _extract_component_ref_fields(
     extract_from_props(comp_schema)
 
     if single_refs or list_refs:
-      ref_map[comp_name] = (single_refs, list_refs)
+      ref_map[comp_name] = (frozenset(single_refs), frozenset(list_refs))
 
   return ref_map
 
 
 def _get_component_references(
-    component: Dict[str, Any], ref_fields_map: Dict[str, tuple[Set[str], Set[str]]]
+    component: Dict[str, Any], ref_fields_map: RefFieldsMap
 ) -> Iterator[Tuple[str, str]]:
   """
   Helper to extract all referenced component IDs from a component.
@@ -580,12 +1264,12 @@ def _get_component_references(
 def _get_refs_recursively(
     comp_type: str,
     props: Dict[str, Any],
-    ref_fields_map: Dict[str, tuple[Set[str], Set[str]]],
+    ref_fields_map: RefFieldsMap,
 ) -> Iterator[Tuple[str, str]]:
   if not comp_type or not isinstance(props, dict):
     return
 
-  single_refs, list_refs = ref_fields_map.get(comp_type, (set(), set()))
+  single_refs, list_refs = ref_fields_map.get(comp_type, _NO_REF_FIELDS)
 
   for key, value in props.items():
     if key in single_refs:
@@ -626,41 +1310,186 @@ def _validate_recursion_and_paths(data: Any) -> None:
   1. Global recursion depth limit (50).
   2. FunctionCall recursion depth limit (5).
   3. Path syntax for DataBindings/DataModelUpdates.
-  """
 
-  def traverse(item: Any, global_depth: int, func_depth: int):
-    if global_depth > MAX_GLOBAL_DEPTH:
-      raise ValueError(f"Global recursion limit exceeded: Depth > {MAX_GLOBAL_DEPTH}")
+  The data is walked with an explicit stack in the same order as a recursive
+  pre-order traversal. Scalars are never pushed: a container with children at
+  the depth limit fails as its first child would.
+
+  The `value` of an `updateDataModel` message is plain data that cannot hold
+  bindings or function calls, so only its depth is checked.
+  """
+  # Locals avoid global lookups in the loop, which runs once per container.
+  max_depth = MAX_GLOBAL_DEPTH
+  containers = (dict, list)
+  valid_pointers = _valid_pointers
+  data_model_value = _get_data_model_value(data)
+  stack: List[Tuple[Any, int, int]] = [(data, 0, 0)]
+  push = stack.append
+  pop = stack.pop
+  while stack:
+    item, global_depth, func_depth = pop()
+    child_depth = global_depth + 1
 
     if isinstance(item, list):
-      for x in item:
-        traverse(x, global_depth + 1, func_depth)
-      return
+      if item and child_depth > max_depth:
+        _raise_global_depth_exceeded()
+      for x in reversed(item):
+        if isinstance(x, containers):
+          push((x, child_depth, func_depth))
+      continue
+
+    if not isinstance(item, dict):
+      continue
+
+    if item is data_model_value:
+      _check_data_depth(item, global_depth)
+      continue
+
+    # Check for path
+    if PATH in item and isinstance(item[PATH], str):
+      path = item[PATH]
+      if path not in valid_pointers and not _is_valid_json_pointer(path):
+        raise ValueError(f"Invalid JSON Pointer syntax: '{path}'")
+
+    # Check for FunctionCall
+    is_func = CALL in item and ARGS in item
+    if is_func and func_depth >= MAX_FUNC_CALL_DEPTH:
+      raise ValueError(
+          f"Recursion limit exceeded: {FUNCTION_CALL} depth > {MAX_FUNC_CALL_DEPTH}"
+      )
+
+    if item and child_depth > max_depth:
+      _raise_global_depth_exceeded()
+
+    if is_func:
+      # Increment func_depth only for 'args', but global_depth matches traversal
+      for k, v in reversed(item.items()):
+        if isinstance(v, containers):
+          push((v, child_depth, func_depth + 1 if k == ARGS else func_depth))
+    else:
+      for v in reversed(item.values()):
+        if isinstance(v, containers):
+          push((v, child_depth, func_depth))
+
+
+# JSON Pointers known to be valid. Bindings repeat the same few paths across
+# components and responses, so most paths skip the regex. This is a best-effort
+# cache shared by all threads, kept as a plain set because a lookup must cost
+# less than the regex: it is emptied when full, and concurrent updates can at
+# worst make a thread check a valid path again.
+_VALID_POINTERS_MAX_SIZE = 4096
+_valid_pointers: Set[str] = set()
+
+
+def _is_valid_json_pointer(path: str) -> bool:
+  """Returns whether a path has valid JSON Pointer syntax, caching valid paths."""
+  if path in _valid_pointers:
+    return True
+  if not JSON_POINTER_PATTERN.fullmatch(path):
+    return False
+  if len(_valid_pointers) >= _VALID_POINTERS_MAX_SIZE:
+    _valid_pointers.clear()
+  _valid_pointers.add(path)
+  return True
+
+
+def _get_data_model_value(message: Any) -> Any:
+  """Returns the `value` of an `updateDataModel` message, if it is a container."""
+  if isinstance(message, dict):
+    update = message.get("updateDataModel")
+    if isinstance(update, dict):
+      value = update.get("value")
+      if isinstance(value, (dict, list)):
+        return value
+  return None
+
+
+def _check_data_depth(data: Any, depth: int) -> None:
+  """Checks the global depth limit for plain data at `depth`, level by level."""
+  containers = (dict, list)
+  level = [data]
+  while level:
+    if depth >= MAX_GLOBAL_DEPTH and any(level):
+      _raise_global_depth_exceeded()
+    next_level: List[Any] = []
+    append = next_level.append
+    for item in level:
+      for v in item.values() if isinstance(item, dict) else item:
+        if isinstance(v, containers):
+          append(v)
+    level = next_level
+    depth += 1
+
+
+def _raise_global_depth_exceeded() -> None:
+  raise ValueError(f"Global recursion limit exceeded: Depth > {MAX_GLOBAL_DEPTH}")
+
+
+def _collect_recursion_and_path_issues(
+    data: Any, pointer: str, issues: List[ValidationIssue]
+) -> None:
+  """
+  Appends every issue that `_validate_recursion_and_paths` would raise for
+  the data at `pointer`. Values exceeding a recursion limit are reported once
+  and not descended into. Like there, only the depth of the `value` of an
+  `updateDataModel` message is checked.
+  """
+  data_model_value = _get_data_model_value(data)
+  stack: List[Tuple[Any, str, int, int]] = [(data, pointer, 0, 0)]
+  while stack:
+    item, item_pointer, global_depth, func_depth = stack.pop()
+    child_depth = global_depth + 1
+
+    if item is data_model_value:
+      try:
+        _check_data_depth(item, global_depth)
+      except ValueError as e:
+        issues.append(ValidationIssue(ERROR_RECURSION, str(e), item_pointer))
+      continue
 
-    if isinstance(item, dict):
-      # Check for path
+    if isinstance(item, list):
+      children = [(str(i), v, func_depth) for i, v in enumerate(item)]
+    elif isinstance(item, dict):
       if PATH in item and isinstance(item[PATH], str):
         path = item[PATH]
-        if not re.fullmatch(JSON_POINTER_PATTERN, path):
-          raise ValueError(f"Invalid JSON Pointer syntax: '{path}'")
+        if not _is_valid_json_pointer(path):
+          issues.append(
+              ValidationIssue(
+                  ERROR_PATH,
+                  f"Invalid JSON Pointer syntax: '{path}'",
+                  item_pointer + json_pointer((PATH,)),
+              )
+          )
 
-      # Check for FunctionCall
       is_func = CALL in item and ARGS in item
+      if is_func and func_depth >= MAX_FUNC_CALL_DEPTH:
+        issues.append(
+            ValidationIssue(
+                ERROR_RECURSION,
+                f"Recursion limit exceeded: {FUNCTION_CALL} depth >"
+                f" {MAX_FUNC_CALL_DEPTH}",
+                item_pointer,
+            )
+        )
+        continue
+      children = [
+          (k, v, func_depth + 1 if is_func and k == ARGS else func_depth)
+          for k, v in item.items()
+      ]
+    else:
+      continue
 
-      if is_func:
-        if func_depth >= MAX_FUNC_CALL_DEPTH:
-          raise ValueError(
-              f"Recursion limit exceeded: {FUNCTION_CALL} depth > {MAX_FUNC_CALL_DEPTH}"
+    if children and child_depth > MAX_GLOBAL_DEPTH:
+      issues.append(
+          ValidationIssue(
+              ERROR_RECURSION,
+              f"Global recursion limit exceeded: Depth > {MAX_GLOBAL_DEPTH}",
+              item_pointer,
           )
-
-        # Increment func_depth only for 'args', but global_depth matches traversal
-        for k, v in item.items():
-          if k == ARGS:
-            traverse(v, global_depth + 1, func_depth + 1)
-          else:
-            traverse(v, global_depth + 1, func_depth)
-      else:
-        for v in item.values():
-          traverse(v, global_depth + 1, func_depth)
-
-  traverse(data, 0, 0)
+      )
+      continue
+    for key, value, child_func_depth in reversed(children):
+      if isinstance(value, (dict, list)):
+        stack.append(
+            (value, item_pointer + json_pointer((key,)), child_depth, child_func_depth)
+        )
@@ -265,7 +265,7 @@ async def test_send_tool_run_async_invalid_json():
   result = await tool.run_async(args=args, tool_context=MagicMock())
   assert "error" in result
   assert "Failed to call A2UI tool" in result["error"]
-  assert "Expecting property name enclosed in double quotes" in result["error"]
+  assert "line 1 column 2 (char 1)" in result["error"]
 
 
 @pytest.mark.asyncio
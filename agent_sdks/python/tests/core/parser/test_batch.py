@@ -0,0 +1,74 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from a2ui.basic_catalog import BasicCatalog
+from a2ui.core.parser.batch import parse_many
+from a2ui.core.parser.parser import ResponsePart
+from a2ui.core.schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG, VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+
+VALID_MESSAGES = (
+    '[{"version": "v0.9", "createSurface": {"surfaceId": "s", "catalogId":'
+    ' "https://a2ui.org/specification/v0_9/basic_catalog.json"}},'
+    ' {"version": "v0.9", "updateComponents": {"surfaceId": "s", "components":'
+    ' [{"id": "root", "component": "Text", "text": "Hi"}]}}]'
+)
+
+
+@pytest.fixture(scope="module")
+def catalog():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+  return manager.get_selected_catalog()
+
+
+def _responses():
+  return [
+      f'One {A2UI_OPEN_TAG}[{{"id": "1"}}]{A2UI_CLOSE_TAG}',
+      "No tags at all",
+      f"{A2UI_OPEN_TAG}not json{A2UI_CLOSE_TAG}",
+      f'{A2UI_OPEN_TAG}[{{"id": "4"}},]{A2UI_CLOSE_TAG} Four',
+  ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_preserves_order_and_isolates_errors(workers):
+  results = parse_many(_responses(), workers=workers, chunksize=1)
+
+  assert [result.ok for result in results] == [True, False, False, True]
+  assert results[0].parts == [ResponsePart(text="One", a2ui_json=[{"id": "1"}])]
+  assert "not found in response" in str(results[1].error)
+  assert isinstance(results[2].error, ValueError)
+  assert results[3].parts == [
+      ResponsePart(text="", a2ui_json=[{"id": "4"}]),
+      ResponsePart(text="Four"),
+  ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_validates_with_catalog(catalog, workers):
+  responses = [
+      f"{A2UI_OPEN_TAG}{VALID_MESSAGES}{A2UI_CLOSE_TAG}",
+      f'{A2UI_OPEN_TAG}[{{"id": "1"}}]{A2UI_CLOSE_TAG}',
+  ]
+  results = parse_many(responses, catalog=catalog, workers=workers)
+
+  assert results[0].ok
+  assert "Validation failed" in str(results[1].error)
+
+
+def test_parse_many_empty():
+  assert parse_many([], workers=4) == []
@@ -13,7 +13,14 @@
 # limitations under the License.
 
 import pytest
-from a2ui.core.parser.parser import parse_response, ResponsePart
+from a2ui.core.parser.parser import (
+    find_a2ui_blocks,
+    find_response_spans,
+    has_a2ui_parts,
+    parse_response,
+    ResponsePart,
+    ResponseSpan,
+)
 from a2ui.core.schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
 
 
@@ -102,3 +109,62 @@ def test_parse_response_invalid_json():
   content = f"{A2UI_OPEN_TAG}\ninvalid_json\n{A2UI_CLOSE_TAG}"
   with pytest.raises(ValueError):
     parse_response(content)
+
+
+def test_find_response_spans_offsets():
+  content = (
+      f"  Hello \n{A2UI_OPEN_TAG}\n```json\n"
+      f'[{{"id": "test"}}]\n'
+      f"```\n{A2UI_CLOSE_TAG}\n Bye \n"
+  )
+  spans = find_response_spans(content)
+  assert len(spans) == 2
+
+  block, trailing = spans
+  assert content[block.text_start : block.text_end] == "Hello"
+  assert content[block.json_start : block.json_end] == '[{"id": "test"}]'
+  assert content[trailing.text_start : trailing.text_end] == "Bye"
+  assert trailing.json_start is None and trailing.json_end is None
+
+
+def test_find_response_spans_empty_block_and_text():
+  content = f"{A2UI_OPEN_TAG} ``` {A2UI_CLOSE_TAG}"
+  assert find_response_spans(content) == [
+      ResponseSpan(text_start=0, text_end=0, json_start=15, json_end=15)
+  ]
+
+
+def test_find_response_spans_ignores_unclosed_trailing_tag():
+  content = f'{A2UI_OPEN_TAG}[{{"id": "1"}}]{A2UI_CLOSE_TAG}{A2UI_OPEN_TAG}[{{"id"'
+  block, trailing = find_response_spans(content)
+  assert content[block.json_start : block.json_end] == '[{"id": "1"}]'
+  assert content[trailing.text_start : trailing.text_end] == f'{A2UI_OPEN_TAG}[{{"id"'
+
+
+def test_find_response_spans_no_tags():
+  with pytest.raises(ValueError, match="not found in response"):
+    find_response_spans("Only text, no tags.")
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("Only text, no tags.", []),
+        (f"{A2UI_OPEN_TAG} unterminated", []),
+        (f"{A2UI_CLOSE_TAG} before {A2UI_OPEN_TAG}", []),
+        (f"a{A2UI_OPEN_TAG}[]{A2UI_CLOSE_TAG}", [(1, 14)]),
+        (
+            f"{A2UI_OPEN_TAG}1{A2UI_CLOSE_TAG}{A2UI_OPEN_TAG}2{A2UI_CLOSE_TAG}",
+            [(0, 12), (24, 36)],
+        ),
+    ],
+)
+def test_find_a2ui_blocks(content, expected):
+  assert find_a2ui_blocks(content) == expected
+  assert has_a2ui_parts(content) == bool(expected)
+
+
+def test_parse_response_reuses_block_offsets():
+  content = f'Hello {A2UI_OPEN_TAG}[{{"id": "test"}}]{A2UI_CLOSE_TAG}'
+  blocks = find_a2ui_blocks(content)
+  assert parse_response(content, blocks) == parse_response(content)
@@ -15,34 +15,108 @@
 import json
 import pytest
 from a2ui.core.parser.payload_fixer import (
-    _remove_trailing_commas,
+    FIX_CONTROL_CHARACTER,
+    FIX_MARKDOWN_FENCE,
+    FIX_SINGLE_QUOTES,
+    FIX_TRAILING_COMMA,
+    FIX_UNCLOSED_BRACKET,
+    FIX_UNCLOSED_STRING,
+    FIXES_TOTAL_METRIC,
+    OUTCOME_FAILED,
+    OUTCOME_OK,
+    OUTCOME_REPAIRED,
+    PARSE_TOTAL_METRIC,
+    PayloadFix,
     _parse,
     parse_and_fix,
+    parse_and_fix_with_diagnostics,
+    repair_json,
 )
+from a2ui.core.metrics import get_registry, metric_labels
 
 
-def test_remove_trailing_commas(caplog):
+@pytest.fixture
+def registry():
+  registry = get_registry()
+  registry.reset()
+  yield registry
+  registry.reset()
+
+
+def test_repair_trailing_commas():
   """Tests that the fixer can handle and fix trailing commas in JSON lists and objects."""
   # Malformed JSON with a trailing comma in the list
   malformed_json_list = '[{"type": "Text", "text": "Hello"},]'
-  fixed_json_list = _remove_trailing_commas(malformed_json_list)
+  fixed_json_list, fixes = repair_json(malformed_json_list)
   assert fixed_json_list == '[{"type": "Text", "text": "Hello"}]'
+  assert fixes == [PayloadFix(FIX_TRAILING_COMMA, 34)]
 
   # Malformed JSON with a trailing comma in the object
   malformed_json_obj = '{"type": "Text", "text": "Hello",}'
-  fixed_json_obj = _remove_trailing_commas(malformed_json_obj)
+  fixed_json_obj, fixes = repair_json(malformed_json_obj)
   assert fixed_json_obj == '{"type": "Text", "text": "Hello"}'
+  assert fixes == [PayloadFix(FIX_TRAILING_COMMA, 32)]
 
-  # Assert that the warning was logged
-  assert "Detected trailing commas in LLM output; applied autofix." in caplog.text
 
-
-def test_remove_trailing_commas_no_change():
+def test_repair_no_change():
   """Tests that the fixer does not modify valid JSON."""
-  valid_json = '[{"type": "Text", "text": "Hello"}]'
-  fixed_json = _remove_trailing_commas(valid_json)
+  valid_json = '[{"type": "Text", "text": "Hello, ]"}]'
+  fixed_json, fixes = repair_json(valid_json)
 
   assert fixed_json == valid_json
+  assert fixes == []
+
+
+def test_repair_preserves_string_contents():
+  malformed_json = '[{"text": "a, ]", "b": "c, }",},]'
+  fixed_json, fixes = repair_json(malformed_json)
+  assert json.loads(fixed_json) == [{"text": "a, ]", "b": "c, }"}]
+  assert [f.kind for f in fixes] == [FIX_TRAILING_COMMA, FIX_TRAILING_COMMA]
+
+
+def test_repair_unclosed_brackets_and_string():
+  fixed_json, fixes = repair_json('[{"id": "root", "children": ["a", "b')
+  assert json.loads(fixed_json) == [{"id": "root", "children": ["a", "b"]}]
+  assert [f.kind for f in fixes] == [
+      FIX_UNCLOSED_STRING,
+      FIX_UNCLOSED_BRACKET,
+      FIX_UNCLOSED_BRACKET,
+      FIX_UNCLOSED_BRACKET,
+  ]
+
+
+def test_repair_missing_inner_bracket():
+  fixed_json, fixes = repair_json('[{"a": [1, 2}]')
+  assert json.loads(fixed_json) == [{"a": [1, 2]}]
+  assert fixes == [PayloadFix(FIX_UNCLOSED_BRACKET, 12)]
+
+
+def test_repair_single_quotes():
+  fixed_json, fixes = repair_json("""[{'id': 'it\\'s', "text": 'say "hi"'}]""")
+  assert json.loads(fixed_json) == [{"id": "it's", "text": 'say "hi"'}]
+  assert {f.kind for f in fixes} == {FIX_SINGLE_QUOTES}
+
+
+def test_repair_control_characters_in_strings():
+  # Escaped newlines are valid JSON and are left alone.
+  _, fixes = repair_json('[{"text": "line 1\\nline 2"}]')
+  assert fixes == []
+
+  fixed_json, fixes = repair_json('[{"text": "line 1\nline 2\ttab"}]')
+  assert json.loads(fixed_json) == [{"text": "line 1\nline 2\ttab"}]
+  assert fixes == [
+      PayloadFix(FIX_CONTROL_CHARACTER, 17),
+      PayloadFix(FIX_CONTROL_CHARACTER, 24),
+  ]
+
+
+def test_repair_markdown_fences():
+  fixed_json, fixes = repair_json('```json\n[{"text": "```"}]\n```')
+  assert json.loads(fixed_json) == [{"text": "```"}]
+  assert fixes == [
+      PayloadFix(FIX_MARKDOWN_FENCE, 0),
+      PayloadFix(FIX_MARKDOWN_FENCE, 26),
+  ]
 
 
 def test_parse_payload_wrapping():
@@ -69,4 +143,71 @@ def test_fix_payload_success_after_fix(caplog):
 
   assert result == [{"type": "Text", "text": "Hello"}]
   assert "Initial A2UI payload validation failed" in caplog.text
-  assert "Detected trailing commas in LLM output; applied autofix." in caplog.text
+
+
+def test_fix_payload_unrepairable_reports_original_error():
+  with pytest.raises(ValueError, match=r"line 1 column 2 \(char 1\)"):
+    parse_and_fix("{invalid")
+
+
+def test_parse_diagnostics_without_repair():
+  parsed, diagnostics = parse_and_fix_with_diagnostics('[{"a": 1}]')
+  assert parsed == [{"a": 1}]
+  assert diagnostics.outcome == OUTCOME_OK
+  assert diagnostics.attempts == 1
+  assert diagnostics.fixes == []
+  assert diagnostics.initial_error is None
+
+
+def test_parse_diagnostics_with_repair():
+  parsed, diagnostics = parse_and_fix_with_diagnostics('[{"a": 1},]')
+  assert parsed == [{"a": 1}]
+  assert diagnostics.repaired
+  assert diagnostics.attempts == 2
+  assert diagnostics.fixes == [PayloadFix(FIX_TRAILING_COMMA, 9)]
+  assert "Failed to parse JSON" in diagnostics.initial_error
+  assert diagnostics.duration > 0
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ('[{"text": "a, ]"},]', [{"text": "a, ]"}]),
+        ('[{"text": "say \\"a, ]\\""},]', [{"text": 'say "a, ]"'}]),
+        ('[{"text": "\\"a\\", ", "b": [1,],},]', [{"text": '"a", ', "b": [1]}]),
+    ],
+)
+def test_parse_diagnostics_trailing_commas_outside_strings(payload, expected):
+  parsed, diagnostics = parse_and_fix_with_diagnostics(payload)
+  assert parsed == expected
+  assert diagnostics.repaired
+  assert {f.kind for f in diagnostics.fixes} == {FIX_TRAILING_COMMA}
+
+
+def test_parse_diagnostics_falls_back_to_full_repair():
+  payload = '[{"a": [1,], "b": 2'
+  parsed, diagnostics = parse_and_fix_with_diagnostics(payload)
+  assert parsed == [{"a": [1], "b": 2}]
+  assert diagnostics.attempts == 3
+  assert diagnostics.fixes == repair_json(payload)[1]
+
+
+def test_parse_metrics_are_labelled_per_model(registry):
+  with metric_labels(model="model-a"):
+    parse_and_fix('[{"a": 1}]')
+    parse_and_fix('[{"a": 1},]')
+  with metric_labels(model="model-b"):
+    with pytest.raises(ValueError):
+      parse_and_fix("not json")
+
+  assert registry.counter(PARSE_TOTAL_METRIC) == 3
+  assert registry.counter(PARSE_TOTAL_METRIC, model="model-a") == 2
+  assert (
+      registry.counter(PARSE_TOTAL_METRIC, model="model-a", outcome=OUTCOME_REPAIRED)
+      == 1
+  )
+  assert (
+      registry.counter(PARSE_TOTAL_METRIC, model="model-b", outcome=OUTCOME_FAILED) == 1
+  )
+  assert registry.counter(FIXES_TOTAL_METRIC, kind=FIX_TRAILING_COMMA) == 1
+  assert registry.counter(PARSE_TOTAL_METRIC, outcome=OUTCOME_OK) == 1
@@ -0,0 +1,202 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from a2ui.core.parser.parser import ResponsePart
+from a2ui.core.parser.streaming import A2uiMessageScanner, A2uiStreamParser
+from a2ui.core.schema.constants import A2UI_OPEN_TAG, A2UI_CLOSE_TAG
+
+
+def _feed_all(parser, chunks):
+  parts = []
+  for chunk in chunks:
+    parts.extend(parser.feed(chunk))
+  parts.extend(parser.close())
+  return parts
+
+
+def _merge_text(parts):
+  """Merges consecutive text parts, which may be split at chunk boundaries."""
+  merged = []
+  for part in parts:
+    if merged and part.a2ui_json is None and merged[-1].a2ui_json is None:
+      merged[-1] = ResponsePart(text=merged[-1].text + part.text)
+    else:
+      merged.append(part)
+  return merged
+
+
+def _chunk(content, size):
+  return [content[i : i + size] for i in range(0, len(content), size)]
+
+
+MULTI_BLOCK_CONTENT = f"""
+Part 1
+{A2UI_OPEN_TAG}
+[{{"id": "1"}}]
+{A2UI_CLOSE_TAG}
+Part 2
+{A2UI_OPEN_TAG}
+```json
+[{{"id": "2"}}]
+```
+{A2UI_CLOSE_TAG}
+Part 3
+  """
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 11, 1000])
+def test_stream_parser_chunk_boundaries(chunk_size):
+  parser = A2uiStreamParser()
+  parts = _feed_all(parser, _chunk(MULTI_BLOCK_CONTENT, chunk_size))
+
+  assert _merge_text(parts) == [
+      ResponsePart(text="Part 1"),
+      ResponsePart(text="", a2ui_json=[{"id": "1"}]),
+      ResponsePart(text="Part 2"),
+      ResponsePart(text="", a2ui_json=[{"id": "2"}]),
+      ResponsePart(text="Part 3"),
+  ]
+
+
+def test_stream_parser_emits_block_before_stream_ends():
+  parser = A2uiStreamParser()
+  assert parser.feed("Hello ") == [ResponsePart(text="Hello")]
+  assert parser.feed(f'{A2UI_OPEN_TAG}[{{"id": "a"}}]') == []
+  assert parser.in_block
+  assert parser.feed(f"{A2UI_CLOSE_TAG} more") == [
+      ResponsePart(text="", a2ui_json=[{"id": "a"}]),
+      ResponsePart(text="more"),
+  ]
+  assert parser.close() == []
+
+
+def test_stream_parser_holds_back_partial_open_tag():
+  parser = A2uiStreamParser()
+  assert parser.feed("Text <a2u") == [ResponsePart(text="Text")]
+  assert parser.feed('i-json>[{"id": "a"}]</a2ui') == []
+  assert parser.feed("-json>") == [ResponsePart(text="", a2ui_json=[{"id": "a"}])]
+
+
+def test_stream_parser_plain_text_preserves_inner_whitespace():
+  parser = A2uiStreamParser()
+  parts = _feed_all(parser, ["Hello", " ", "world", "  \n"])
+  assert "".join(p.text for p in parts) == "Hello world"
+  assert all(p.a2ui_json is None for p in parts)
+
+
+def test_stream_parser_invalid_block_is_isolated():
+  parser = A2uiStreamParser()
+  content = (
+      f"Intro{A2UI_OPEN_TAG}invalid_json{A2UI_CLOSE_TAG}"
+      f'{A2UI_OPEN_TAG}[{{"id": "ok"}}]{A2UI_CLOSE_TAG}'
+  )
+  # The text before the invalid block is returned first.
+  assert parser.feed(content) == [ResponsePart(text="Intro")]
+  with pytest.raises(ValueError):
+    parser.feed("")
+  assert parser.close() == [ResponsePart(text="", a2ui_json=[{"id": "ok"}])]
+
+
+def test_stream_parser_empty_block_raises():
+  parser = A2uiStreamParser()
+  with pytest.raises(ValueError, match="A2UI JSON part is empty"):
+    parser.feed(f"{A2UI_OPEN_TAG}  {A2UI_CLOSE_TAG}")
+
+
+def test_stream_parser_unterminated_block_raises_on_close():
+  parser = A2uiStreamParser()
+  parser.feed(f'{A2UI_OPEN_TAG}[{{"id": "a"}}')
+  with pytest.raises(ValueError, match="missing the closing tag"):
+    parser.close()
+
+
+def test_stream_parser_incremental_messages():
+  parser = A2uiStreamParser(incremental_messages=True)
+  assert parser.feed(f'Hi {A2UI_OPEN_TAG}[{{"id": "1"}}, {{"id"') == [
+      ResponsePart(text="Hi"),
+      ResponsePart(text="", a2ui_json=[{"id": "1"}]),
+  ]
+  assert parser.feed(f': "2"}}]{A2UI_CLOSE_TAG}') == [
+      ResponsePart(text="", a2ui_json=[{"id": "2"}])
+  ]
+  assert parser.close() == []
+
+
+def test_message_scanner_emits_each_message_when_complete():
+  scanner = A2uiMessageScanner()
+  assert scanner.feed('```json\n[{"createSurface": {"surfaceId": "s"}}') == [
+      {"createSurface": {"surfaceId": "s"}}
+  ]
+  assert scanner.feed(',\n {"updateComponents": {"components": [{"id": "r') == []
+  assert scanner.feed('oot"}]}}]\n```') == [
+      {"updateComponents": {"components": [{"id": "root"}]}}
+  ]
+  assert scanner.close() == []
+
+
+def test_message_scanner_ignores_brackets_in_strings():
+  scanner = A2uiMessageScanner()
+  payload = '[{"text": "a } ] \\" { ["}, {"text": "b"}]'
+  messages = []
+  for char in payload:
+    messages.extend(scanner.feed(char))
+  messages.extend(scanner.close())
+  assert messages == [{"text": 'a } ] " { ['}, {"text": "b"}]
+
+
+def test_message_scanner_ignores_brackets_in_single_quoted_strings():
+  scanner = A2uiMessageScanner()
+  payload = """[{'text': 'a } ] \\' "{ ['}, {"text": "it's ["}]"""
+  messages = []
+  for char in payload[:-1]:
+    messages.extend(scanner.feed(char))
+  assert messages == [{"text": "a } ] ' \"{ ["}, {"text": "it's ["}]
+  assert scanner.feed("]") == []
+  assert scanner.close() == []
+
+
+def test_message_scanner_scan_returns_errors_in_place():
+  scanner = A2uiMessageScanner()
+  scanned = scanner.scan('[{"id": "1"}, {"id": oops}, {"id": "3"}')
+  assert scanned[0] == {"id": "1"}
+  assert isinstance(scanned[1], ValueError)
+  assert scanned[2] == {"id": "3"}
+  scanned = scanner.scan("", final=True)
+  assert len(scanned) == 1 and "incomplete" in str(scanned[0])
+
+
+def test_message_scanner_single_object():
+  scanner = A2uiMessageScanner()
+  assert scanner.feed('{"id": "a", "child": {"id": "b"}') == []
+  assert scanner.feed("}") == [{"id": "a", "child": {"id": "b"}}]
+
+
+def test_message_scanner_invalid_message_is_isolated():
+  scanner = A2uiMessageScanner()
+  assert scanner.feed('[{"id": "1"}, {"id": oops}, {"id": "3"}]') == [{"id": "1"}]
+  with pytest.raises(ValueError):
+    scanner.close()
+  assert scanner.close() == [{"id": "3"}]
+
+
+@pytest.mark.parametrize(
+    "payload, error",
+    [("", "A2UI JSON part is empty"), ('[{"id": "1"}', "incomplete")],
+)
+def test_message_scanner_close_errors(payload, error):
+  scanner = A2uiMessageScanner()
+  scanner.feed(payload)
+  with pytest.raises(ValueError, match=error):
+    scanner.close()
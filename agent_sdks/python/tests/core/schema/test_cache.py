@@ -0,0 +1,51 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from a2ui.core.schema.cache import CacheStats, LruCache, content_hash
+
+
+def test_content_hash_ignores_key_order():
+  assert content_hash({"a": 1, "b": [1, 2]}) == content_hash({"b": [1, 2], "a": 1})
+  assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_lru_cache_evicts_least_recently_used():
+  cache = LruCache(maxsize=2)
+  created = []
+
+  def factory(value):
+    def create():
+      created.append(value)
+      return value
+
+    return create
+
+  assert cache.get_or_create("a", factory(1)) == 1
+  assert cache.get_or_create("b", factory(2)) == 2
+  # Touch "a" so that "b" is the least recently used entry.
+  assert cache.get_or_create("a", factory(-1)) == 1
+  assert cache.get_or_create("c", factory(3)) == 3
+  assert cache.get_or_create("b", factory(4)) == 4
+
+  assert created == [1, 2, 3, 4]
+  assert cache.stats() == CacheStats(hits=1, misses=4, size=2, maxsize=2)
+
+  cache.clear()
+  assert cache.stats() == CacheStats(hits=0, misses=0, size=0, maxsize=2)
+
+
+def test_lru_cache_rejects_invalid_size():
+  with pytest.raises(ValueError, match="must be positive"):
+    LruCache(maxsize=0)
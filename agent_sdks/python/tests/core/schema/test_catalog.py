@@ -15,9 +15,16 @@
 import json
 import os
 import pytest
+from dataclasses import replace
 from typing import Any, Dict, List
-from a2ui.core.schema.catalog import A2uiCatalog
+from unittest.mock import patch
+from a2ui.core.schema.catalog import (
+    A2uiCatalog,
+    clear_pruned_catalog_cache,
+    pruned_catalog_cache_stats,
+)
 from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.validator import clear_validator_cache, validator_cache_stats
 from a2ui.basic_catalog.constants import BASIC_CATALOG_NAME
 
 
@@ -74,6 +81,23 @@ def test_load_examples(tmp_path):
   assert "ignored" not in examples_str
 
 
+def test_load_examples_in_file_name_order(tmp_path):
+  for name in ["b", "c", "a"]:
+    (tmp_path / f"{name}.json").write_text("[]")
+  catalog = A2uiCatalog(
+      version=VERSION_0_8,
+      name=BASIC_CATALOG_NAME,
+      s2c_schema={},
+      common_types_schema={},
+      catalog_schema={},
+  )
+
+  with patch("os.listdir", return_value=["c.json", "a.json", "b.json"]):
+    examples_str = catalog.load_examples(str(tmp_path))
+  assert examples_str.index("BEGIN a") < examples_str.index("BEGIN b")
+  assert examples_str.index("BEGIN b") < examples_str.index("BEGIN c")
+
+
 def test_load_examples_none_or_invalid_path():
   catalog = A2uiCatalog(
       version=VERSION_0_8,
@@ -142,6 +166,47 @@ def test_with_pruned_components():
   assert catalog.with_pruned_components([]) is catalog
 
 
+def test_with_pruned_components_is_memoized_and_shares_schemas():
+  clear_pruned_catalog_cache()
+  text = {"type": "object", "properties": {"text": {"$ref": "#/$defs/Common"}}}
+  catalog_schema = {
+      "catalogId": "basic",
+      "$defs": {
+          "anyComponent": {
+              "oneOf": [
+                  {"$ref": "#/components/Text"},
+                  {"$ref": "#/components/Image"},
+              ]
+          },
+          "Common": {"type": "string"},
+      },
+      "components": {"Text": text, "Image": {"type": "object"}},
+  }
+  catalog = A2uiCatalog(
+      version=VERSION_0_9,
+      name=BASIC_CATALOG_NAME,
+      s2c_schema={},
+      common_types_schema={},
+      catalog_schema=catalog_schema,
+  )
+
+  pruned = catalog.with_pruned_components(["Text"])
+  assert catalog.with_pruned_components(["Text", "Text"]) is pruned
+  stats = pruned_catalog_cache_stats()
+  assert (stats.hits, stats.misses) == (1, 1)
+
+  # Only the pruned containers are copied; the original is left untouched.
+  assert pruned.catalog_schema["components"]["Text"] is text
+  assert pruned.catalog_schema["$defs"]["Common"] is catalog_schema["$defs"]["Common"]
+  assert list(catalog_schema["components"]) == ["Text", "Image"]
+  assert len(catalog_schema["$defs"]["anyComponent"]["oneOf"]) == 2
+
+  # A catalog with another name gets its own pruned copy.
+  renamed = replace(catalog, name="other")
+  assert renamed.with_pruned_components(["Text"]).name == "other"
+  clear_pruned_catalog_cache()
+
+
 def test_render_as_llm_instructions():
   catalog = A2uiCatalog(
       version=VERSION_0_9,
@@ -163,3 +228,112 @@ def test_render_as_llm_instructions():
   assert '"catalog": "schema"' in schema_str
   assert '"catalogId": "id_basic"' in schema_str
   assert "---END A2UI JSON SCHEMA---" in schema_str
+
+
+def test_render_as_llm_instructions_compact():
+  text = {
+      "type": "object",
+      "description": "Displays text.",
+      "properties": {
+          "title": {"type": "string", "description": "The heading."},
+          "style": {"type": "string", "enum": ["title", "body", "caption"]},
+      },
+  }
+  catalog = A2uiCatalog(
+      version=VERSION_0_9,
+      name=BASIC_CATALOG_NAME,
+      s2c_schema={"s2c": "schema"},
+      common_types_schema={},
+      catalog_schema={
+          "catalogId": "id_basic",
+          "components": {"Text": text, "Heading": text},
+      },
+  )
+
+  full = catalog.render_as_llm_instructions()
+  assert catalog.render_as_llm_instructions() is full
+
+  compact = catalog.render_as_llm_instructions(compact=True)
+  assert catalog.render_as_llm_instructions(compact=True) is compact
+  assert '### Server To Client Schema:\n{"s2c":"schema"}' in compact
+  assert "### Common Types Schema:" not in compact
+  shared_ref = '{"$ref":"shared.json#/$defs/S0"}'
+  assert f'"components":{{"Text":{shared_ref},"Heading":{shared_ref}}}' in compact
+  assert '### Shared Subschemas Schema:\n{"$id":"shared.json","$defs":{"S0":' in compact
+  assert compact.count("Displays text.") == 1
+  assert compact.endswith("---END A2UI JSON SCHEMA---")
+
+  stripped = catalog.render_as_llm_instructions(strip_descriptions=True)
+  assert "description" not in stripped
+  assert '"title": {' in stripped
+  assert '"enum": [\n' in stripped
+
+  assert (
+      catalog.estimate_instruction_tokens(compact=True, strip_descriptions=True)
+      < catalog.estimate_instruction_tokens(compact=True)
+      < catalog.estimate_instruction_tokens()
+  )
+
+
+def test_render_as_llm_instructions_sort_keys():
+  def make_catalog(catalog_schema):
+    return A2uiCatalog(
+        version=VERSION_0_9,
+        name=BASIC_CATALOG_NAME,
+        s2c_schema={"type": "object", "$id": "s2c"},
+        common_types_schema={},
+        catalog_schema=catalog_schema,
+    )
+
+  catalog = make_catalog({"catalogId": "id_basic", "components": {"B": {}, "A": {}}})
+  reordered = make_catalog({"components": {"A": {}, "B": {}}, "catalogId": "id_basic"})
+
+  assert catalog.render_as_llm_instructions() != (
+      reordered.render_as_llm_instructions()
+  )
+  rendered = catalog.render_as_llm_instructions(compact=True, sort_keys=True)
+  assert rendered == reordered.render_as_llm_instructions(compact=True, sort_keys=True)
+  assert '{"$id":"s2c","type":"object"}' in rendered
+  assert '{"catalogId":"id_basic","components":{"A":{},"B":{}}}' in rendered
+
+
+def _minimal_0_9_catalog(name: str, text_type: str = "string") -> A2uiCatalog:
+  return A2uiCatalog(
+      version=VERSION_0_9,
+      name=name,
+      s2c_schema={
+          "$id": "https://a2ui.org/specification/v0_9/server_to_client.json",
+          "type": "object",
+      },
+      common_types_schema={
+          "$id": "https://a2ui.org/specification/v0_9/common_types.json"
+      },
+      catalog_schema={
+          "catalogId": "test_catalog",
+          "components": {
+              "Text": {
+                  "type": "object",
+                  "properties": {"text": {"type": text_type}},
+              }
+          },
+      },
+  )
+
+
+def test_validator_is_cached_by_content():
+  clear_validator_cache()
+  first = _minimal_0_9_catalog("first")
+  same_content = _minimal_0_9_catalog("second")
+  other_content = _minimal_0_9_catalog("third", text_type="number")
+
+  assert first.fingerprint == same_content.fingerprint
+  assert first.fingerprint != other_content.fingerprint
+
+  validator = first.validator
+  assert first.validator is validator
+  assert same_content.validator is validator
+  assert other_content.validator is not validator
+
+  stats = validator_cache_stats()
+  assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+  clear_validator_cache()
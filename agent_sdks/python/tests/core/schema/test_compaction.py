@@ -0,0 +1,137 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+from a2ui.core.schema.compaction import (
+    dedupe_subschemas,
+    estimate_tokens,
+    strip_annotations,
+)
+
+ACTION = {
+    "type": "object",
+    "description": "The action to perform when the component is used.",
+    "properties": {"name": {"type": "string"}},
+}
+
+
+def test_strip_annotations():
+  schema = {
+      "title": "Card",
+      "description": "A card.",
+      "properties": {
+          "title": {"type": "string", "description": "The title."},
+          "kind": {"const": {"description": "data"}},
+      },
+  }
+  assert strip_annotations(schema) == {
+      "properties": {
+          "title": {"type": "string"},
+          "kind": {"const": {"description": "data"}},
+      },
+  }
+  assert "description" in schema
+
+
+def test_dedupe_subschemas():
+  local_ref = {"$ref": "#/$defs/Action", "description": "A locally defined action."}
+  catalog = {
+      "components": {
+          "Button": {"properties": {"action": ACTION, "other": local_ref}},
+          "Link": {"properties": {"action": dict(ACTION), "other": local_ref}},
+      },
+  }
+  common_types = {"$defs": {"Action": ACTION, "Short": {"type": "string"}}}
+
+  (deduped_catalog, deduped_common_types), shared = dedupe_subschemas(
+      [catalog, common_types]
+  )
+
+  ref = {"$ref": "shared.json#/$defs/S0"}
+  assert shared == {"S0": ACTION}
+  assert deduped_catalog["components"]["Button"]["properties"] == {
+      "action": ref,
+      "other": local_ref,
+  }
+  assert deduped_catalog["components"]["Link"]["properties"]["action"] == ref
+  assert deduped_common_types == {"$defs": {"Action": ref, "Short": {"type": "string"}}}
+  assert catalog["components"]["Button"]["properties"]["action"] is ACTION
+
+
+def test_dedupe_subschemas_without_repeats():
+  schemas = [{"type": "object"}, {"properties": {"a": ACTION}}]
+  assert dedupe_subschemas(schemas) == (schemas, {})
+
+
+def test_dedupe_subschemas_keeps_keyword_maps():
+  properties = {
+      "label": {
+          "type": "string",
+          "description": "The text shown on the component.",
+          "minLength": 1,
+          "pattern": "^[A-Z]",
+      },
+      "size": {"type": "integer", "minimum": 0, "maximum": 100},
+  }
+  catalog = {
+      "$id": "catalog.json",
+      "components": {
+          "Button": {
+              "properties": properties,
+              "required": ["label"],
+              "additionalProperties": False,
+          },
+          "Link": {"properties": dict(properties), "required": ["size"]},
+      },
+      "oneOf": [{"$ref": "#/components/Button"}, {"$ref": "#/components/Link"}],
+  }
+
+  (deduped,), shared = dedupe_subschemas([catalog])
+
+  assert list(shared) == ["S0"]
+  for component in deduped["components"].values():
+    assert set(component["properties"]) == {"label", "size"}
+    assert component["properties"]["label"] == {"$ref": "shared.json#/$defs/S0"}
+
+  def validator(schema, shared):
+    registry = Registry().with_resources([
+        ("catalog.json", DRAFT202012.create_resource(schema)),
+        ("shared.json", DRAFT202012.create_resource({"$defs": shared})),
+    ])
+    return Draft202012Validator(schema, registry=registry)
+
+  original = validator(catalog, {})
+  compacted = validator(deduped, shared)
+  instances = [
+      {"label": "Go"},
+      {"label": "Go", "size": 5},
+      {"size": 5},
+      {"size": 5, "label": "go"},
+      {"label": "go"},
+      {"label": "Go", "size": -1},
+      {"size": 101},
+      {"$ref": "shared.json#/$defs/S0", "size": -1},
+  ]
+  for instance in instances:
+    assert compacted.is_valid(instance) == original.is_valid(instance), instance
+  assert not original.is_valid({"label": "Go", "size": -1})
+
+
+def test_estimate_tokens():
+  assert estimate_tokens("") == 0
+  assert estimate_tokens("abcd") == 1
+  assert estimate_tokens("abcde") == 2
@@ -0,0 +1,276 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import os
+from unittest import mock
+
+import pytest
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema import compiler
+from a2ui.core.schema.compiler import compile_schema
+from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.validator import (
+    COMPILED_BACKEND,
+    JSONSCHEMA_BACKEND,
+    A2uiValidator,
+    clear_validator_cache,
+    get_cached_validator,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+  cache_dir = tmp_path / "compiled"
+  monkeypatch.setenv(compiler.CACHE_DIR_ENV_VAR, str(cache_dir))
+  return cache_dir
+
+
+def _assert_equivalent(schema, instances, registry=None):
+  expected = Draft202012Validator(schema, registry=registry or Registry())
+  compiled = compile_schema(schema, registry, use_cache=False)
+  for instance in instances:
+    assert compiled.is_valid(instance) == expected.is_valid(instance), instance
+
+
+VALUES = [None, True, False, 0, 1, 1.0, 1.5, -3, "", "a", "abc", [], [1], {}, {"a": 1}]
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        {"type": "integer"},
+        {"type": "number", "minimum": 0, "exclusiveMaximum": 1.5},
+        {"type": ["string", "null"], "minLength": 1, "pattern": "^a"},
+        {"enum": ["a", 1, None]},
+        {"const": 1},
+        {"const": True},
+        {"type": "array", "items": {"type": "integer"}, "minItems": 1},
+        {"not": {"type": "string"}},
+        {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+        {"oneOf": [{"type": "number"}, {"type": "integer"}]},
+        {"oneOf": [True, False, {"type": "string"}]},
+        {"if": {"type": "string"}, "then": {"minLength": 2}, "else": {"type": "array"}},
+        {"uniqueItems": True},
+    ],
+)
+def test_keywords_match_jsonschema(schema):
+  _assert_equivalent(schema, VALUES)
+
+
+def test_object_keywords_match_jsonschema():
+  schema = {
+      "type": "object",
+      "properties": {"a": {"type": "integer"}},
+      "patternProperties": {"^x-": {"type": "string"}},
+      "additionalProperties": False,
+      "required": ["a"],
+  }
+  _assert_equivalent(
+      schema,
+      [
+          {"a": 1},
+          {"a": "1"},
+          {},
+          {"a": 1, "x-b": "c"},
+          {"a": 1, "x-b": 2},
+          {"a": 1, "b": 1},
+      ],
+  )
+
+
+def test_unevaluated_properties_through_refs():
+  schema = {
+      "$defs": {"common": {"properties": {"id": {"type": "string"}}}},
+      "allOf": [
+          {"$ref": "#/$defs/common"},
+          {"properties": {"text": {"type": "string"}}},
+      ],
+      "unevaluatedProperties": False,
+  }
+  _assert_equivalent(
+      schema,
+      [{"id": "a", "text": "b"}, {"id": "a", "other": 1}, {"text": 1}, "not an object"],
+  )
+
+
+def test_discriminator_dispatches_to_single_branch():
+  branches = {
+      name: {
+          "type": "object",
+          "properties": {"component": {"const": name}, "value": {"type": kind}},
+          "required": ["component"],
+      }
+      for name, kind in (("Text", "string"), ("Slider", "number"))
+  }
+  schema = {
+      "$defs": branches,
+      "oneOf": [{"$ref": "#/$defs/Text"}, {"$ref": "#/$defs/Slider"}],
+      "discriminator": {"propertyName": "component"},
+  }
+  registry = Registry().with_resource(
+      compiler.ROOT_URI,
+      Resource.from_contents(schema, default_specification=DRAFT202012),
+  )
+  source, _ = compiler.generate_source(schema, registry)
+  assert "'Text': " in source
+  _assert_equivalent(
+      schema,
+      [
+          {"component": "Text", "value": "a"},
+          {"component": "Text", "value": 1},
+          {"component": "Slider", "value": 1},
+          {"component": "Unknown"},
+          {"component": ["Text"]},
+          {"value": "a"},
+          [],
+      ],
+  )
+
+
+def _payloads(version):
+  if version == VERSION_0_8:
+    return [
+        {"beginRendering": {"surfaceId": "s", "root": "root"}},
+        {
+            "surfaceUpdate": {
+                "surfaceId": "s",
+                "components": [{
+                    "id": "root",
+                    "component": {"Text": {"text": {"literalString": "Hi"}}},
+                }],
+            }
+        },
+    ]
+  return [
+      {
+          "version": "v0.9",
+          "createSurface": {
+              "surfaceId": "s",
+              "catalogId": "https://a2ui.org/specification/v0_9/basic_catalog.json",
+          },
+      },
+      {
+          "version": "v0.9",
+          "updateComponents": {
+              "surfaceId": "s",
+              "components": [
+                  {"id": "root", "component": "Column", "children": ["t", "b"]},
+                  {"id": "t", "component": "Text", "text": "Hi"},
+                  {"id": "l", "component": "Text", "text": "Go"},
+                  {
+                      "id": "b",
+                      "component": "Button",
+                      "child": "l",
+                      "action": {"event": {"name": "go"}},
+                  },
+              ],
+          },
+      },
+  ]
+
+
+def _mutations(payload):
+  """Yields copies of the payload with a single value replaced or removed."""
+
+  def paths(node, path=()):
+    yield path
+    items = node.items() if isinstance(node, dict) else enumerate(node)
+    if isinstance(node, (dict, list)):
+      for key, value in items:
+        yield from paths(value, path + (key,))
+
+  for path in list(paths(payload))[1:]:
+    for replacement in (None, 1, "x", {}, [], ...):
+      mutated = copy.deepcopy(payload)
+      parent = mutated
+      for key in path[:-1]:
+        parent = parent[key]
+      if replacement is ...:
+        del parent[path[-1]]
+      else:
+        parent[path[-1]] = replacement
+      yield mutated
+
+
+@pytest.mark.parametrize("version", [VERSION_0_8, VERSION_0_9])
+def test_basic_catalog_matches_jsonschema(version):
+  catalog = A2uiSchemaManager(
+      version, catalogs=[BasicCatalog.get_config(version)]
+  ).get_selected_catalog()
+  schema, registry = A2uiValidator(catalog)._build_schema()
+
+  payload = _payloads(version)
+  assert compile_schema(schema, registry, use_cache=False).is_valid(payload)
+  _assert_equivalent(schema, _mutations(payload), registry)
+
+
+def test_compiled_code_is_cached_on_disk(cache_dir):
+  schema = {"type": "object", "properties": {"a": {"type": "integer"}}}
+  assert compile_schema(schema).is_valid({"a": 1})
+  assert len(os.listdir(cache_dir)) == 1
+
+  with mock.patch.object(
+      compiler, "generate_source", side_effect=AssertionError("not cached")
+  ):
+    assert not compile_schema(schema).is_valid({"a": "1"})
+    # A different schema is compiled again.
+    with pytest.raises(AssertionError, match="not cached"):
+      compile_schema({"type": "string"})
+
+
+def test_corrupt_cache_is_ignored(cache_dir):
+  schema = {"type": "string"}
+  compile_schema(schema)
+  (path,) = cache_dir.iterdir()
+  path.write_bytes(b"garbage")
+  assert compile_schema(schema).is_valid("a")
+
+
+def test_compiled_backend_reports_jsonschema_errors():
+  catalog = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  ).get_selected_catalog()
+  payload = _payloads(VERSION_0_9)
+  payload[1]["updateComponents"]["components"][1]["text"] = 1
+
+  errors = []
+  for backend in (JSONSCHEMA_BACKEND, COMPILED_BACKEND):
+    validator = A2uiValidator(catalog, backend=backend)
+    assert validator.backend == backend
+    validator.validate(_payloads(VERSION_0_9))
+    with pytest.raises(ValueError, match="Validation failed") as e:
+      validator.validate(payload)
+    errors.append(str(e.value))
+  assert errors[0] == errors[1]
+
+
+def test_validation_backend_selection(monkeypatch):
+  catalog = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  ).get_selected_catalog()
+  clear_validator_cache()
+  monkeypatch.setenv("A2UI_VALIDATION_BACKEND", COMPILED_BACKEND)
+  compiled = get_cached_validator(catalog)
+  assert compiled.backend == COMPILED_BACKEND
+  assert get_cached_validator(catalog, JSONSCHEMA_BACKEND) is not compiled
+
+  with pytest.raises(ValueError, match="Unknown validation backend"):
+    A2uiValidator(catalog, backend="fast")
+  clear_validator_cache()
@@ -0,0 +1,108 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui.basic_catalog.provider import BasicCatalog
+from a2ui.core.schema.constants import VERSION_0_9
+from a2ui.core.schema.manager import A2uiSchemaManager
+from a2ui.core.schema.pruning import prune_unreferenced_definitions
+
+S2C_SCHEMA = {
+    "$id": "https://a2ui.org/specification/v0_9/server_to_client.json",
+    "properties": {"components": {"$ref": "catalog.json#/$defs/anyComponent"}},
+}
+
+COMMON_TYPES_SCHEMA = {
+    "$id": "https://a2ui.org/specification/v0_9/common_types.json",
+    "$defs": {
+        "DynamicString": {
+            "oneOf": [{"type": "string"}, {"$ref": "#/$defs/FunctionCall"}]
+        },
+        "FunctionCall": {"$ref": "catalog.json#/$defs/anyFunction"},
+        "Action": {"type": "object"},
+    },
+}
+
+CATALOG_SCHEMA = {
+    "catalogId": "https://a2ui.org/specification/v0_9/basic_catalog.json",
+    "components": {
+        "Text": {
+            "properties": {"text": {"$ref": "common_types.json#/$defs/DynamicString"}}
+        }
+    },
+    "functions": {
+        "upper": {"properties": {"args": {"$ref": "#/$defs/Args"}}},
+        "unused": {"type": "object"},
+    },
+    "$defs": {
+        "anyComponent": {"oneOf": [{"$ref": "#/components/Text"}]},
+        "anyFunction": {"oneOf": [{"$ref": "#/functions/upper"}]},
+        "Args": {"type": "array"},
+        "theme": {"type": "object"},
+        "Unused": {"const": {"$ref": "#/$defs/theme"}},
+    },
+}
+
+
+def test_prune_unreferenced_definitions():
+  common_types, catalog = prune_unreferenced_definitions(
+      S2C_SCHEMA, COMMON_TYPES_SCHEMA, CATALOG_SCHEMA
+  )
+
+  assert list(common_types["$defs"]) == ["DynamicString", "FunctionCall"]
+  assert list(catalog["functions"]) == ["upper"]
+  assert list(catalog["$defs"]) == ["anyComponent", "anyFunction", "Args"]
+  # Definitions and other parts are shared, and the inputs are not modified.
+  assert catalog["components"] is CATALOG_SCHEMA["components"]
+  assert catalog["$defs"]["Args"] is CATALOG_SCHEMA["$defs"]["Args"]
+  assert len(CATALOG_SCHEMA["$defs"]) == 5
+
+
+def test_prune_keeps_schemas_without_unreachable_definitions():
+  common_types = {"$defs": {"Used": {"type": "string"}}}
+  catalog = {"components": {"Text": {"$ref": "common_types.json#/$defs/Used"}}}
+  pruned_common_types, pruned_catalog = prune_unreferenced_definitions(
+      None, common_types, catalog
+  )
+  assert pruned_common_types is common_types
+  assert pruned_catalog is catalog
+
+
+def test_pruned_basic_catalog_still_validates():
+  manager = A2uiSchemaManager(
+      VERSION_0_9, catalogs=[BasicCatalog.get_config(VERSION_0_9)]
+  )
+  full = manager.get_selected_catalog()
+  catalog = manager.get_selected_catalog(allowed_components=["Divider"])
+
+  common_types = catalog.common_types_schema["$defs"]
+  assert "ChildList" not in common_types
+  assert "Action" not in common_types
+  assert "ComponentCommon" in common_types
+  assert len(catalog.render_as_llm_instructions()) < len(
+      full.with_pruned_components(["Divider", "Button"]).render_as_llm_instructions()
+  )
+
+  catalog.validator.validate([
+      {
+          "version": "v0.9",
+          "createSurface": {"surfaceId": "s", "catalogId": catalog.catalog_id},
+      },
+      {
+          "version": "v0.9",
+          "updateComponents": {
+              "surfaceId": "s",
+              "components": [{"id": "root", "component": "Divider"}],
+          },
+      },
+  ])
@@ -533,3 +533,47 @@ def test_select_catalog_logic():
       )
       == basic
   )
+
+
+def test_assemble_system_prompt(tmp_path):
+  for name in ["second", "first"]:
+    (tmp_path / f"{name}.json").write_text("[]")
+  config = BasicCatalog.get_config(VERSION_0_9)
+  config.examples_path = str(tmp_path)
+  manager = A2uiSchemaManager(VERSION_0_9, catalogs=[config])
+
+  def assemble(role_description, allowed_components=["Text"]):
+    return manager.assemble_system_prompt(
+        role_description,
+        ui_description="Render UI.",
+        allowed_components=allowed_components,
+        include_schema=True,
+        include_examples=True,
+    )
+
+  prompt = assemble("Role A")
+  assert prompt.prefix.startswith("---BEGIN A2UI JSON SCHEMA---")
+  assert prompt.prefix.index("BEGIN first") < prompt.prefix.index("BEGIN second")
+  assert prompt.suffix.startswith("Role A\n\n## Workflow Description:")
+  assert prompt.suffix.endswith("## UI Description:\nRender UI.")
+  assert prompt.text == f"{prompt.prefix}\n\n{prompt.suffix}"
+
+  other_role = assemble("Role B")
+  assert other_role.prefix_hash == prompt.prefix_hash
+  assert other_role.text.startswith(prompt.prefix)
+  assert assemble("Role A", ["Text", "Image"]).prefix_hash != prompt.prefix_hash
+
+  assert (
+      manager.generate_system_prompt(
+          "Role A",
+          ui_description="Render UI.",
+          allowed_components=["Text"],
+          include_schema=True,
+          include_examples=True,
+          deterministic=True,
+      )
+      == prompt.text
+  )
+  assert manager.generate_system_prompt("Role A", include_schema=True).startswith(
+      "Role A"
+  )
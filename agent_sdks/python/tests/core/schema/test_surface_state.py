@@ -0,0 +1,139 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+import pytest
+
+from a2ui.core.schema.surface_state import (
+    ComponentGraphError,
+    SurfaceValidationState,
+    _SurfaceGraph,
+)
+from a2ui.core.schema.validation_report import ERROR_INTEGRITY, ERROR_TOPOLOGY
+
+
+def _children(*ids):
+  return [(child_id, "children") for child_id in ids]
+
+
+@pytest.fixture
+def state():
+  state = SurfaceValidationState()
+  state.create_surface("s", "root")
+  state.update_components(
+      "s", {"root": _children("a", "b"), "a": _children("c"), "b": [], "c": []}
+  )
+  return state
+
+
+def test_update_may_reference_existing_components(state):
+  state.update_components("s", {"b": _children("d"), "d": _children("c")})
+  assert state.component_ids("s") == {"root", "a", "b", "c", "d"}
+
+
+def test_dangling_reference_in_follow_up_update(state):
+  with pytest.raises(
+      ValueError,
+      match="Component 'b' references non-existent component 'x' in field 'children'",
+  ):
+    state.update_components("s", {"b": _children("x")})
+  # The failed update is not applied.
+  state.update_components("s", {"x": [], "b": _children("x")})
+
+
+def test_errors_identify_the_offending_component(state):
+  with pytest.raises(ComponentGraphError) as error:
+    state.update_components("s", {"b": _children("x")})
+  assert (error.value.kind, error.value.surface_id) == (ERROR_INTEGRITY, "s")
+  assert (error.value.component_id, error.value.field_name) == ("b", "children")
+
+  with pytest.raises(ComponentGraphError) as error:
+    state.update_components("s", {"z": []})
+  assert (error.value.kind, error.value.component_id) == (ERROR_TOPOLOGY, "z")
+
+
+def test_cycle_across_updates(state):
+  with pytest.raises(ValueError, match="Circular reference detected"):
+    state.update_components("s", {"c": _children("a")})
+  with pytest.raises(ValueError, match="Self-reference detected"):
+    state.update_components("s", {"c": _children("c")})
+  state.update_components("s", {"c": _children("b")})
+
+
+def test_new_component_must_be_reachable(state):
+  with pytest.raises(ValueError, match="Component 'z' is not reachable from 'root'"):
+    state.update_components("s", {"z": []})
+  # Existing components may be detached, e.g. to replace part of the tree.
+  state.update_components("s", {"root": _children("b")})
+  assert state.component_ids("s") == {"root", "a", "b", "c"}
+
+
+def test_depth_limit_across_updates():
+  state = SurfaceValidationState(max_depth=3)
+  state.create_surface("s", "root")
+  state.update_components("s", {"root": _children("a"), "a": _children("b"), "b": []})
+  state.update_components("s", {"c": [], "b": _children("c")})
+  with pytest.raises(ValueError, match="Global recursion limit exceeded"):
+    state.update_components("s", {"d": [], "c": _children("d")})
+
+
+def test_references_are_checked_once_root_is_known():
+  state = SurfaceValidationState()
+  # v0.8 sends components before beginRendering, possibly out of order.
+  state.update_components("s", {"root": _children("a")})
+  state.update_components("s", {"a": [], "orphan": []})
+  assert state.root_id("s") is None
+  with pytest.raises(ValueError, match="'orphan' is not reachable from 'root'"):
+    state.set_root("s", "root")
+  assert state.root_id("s") is None
+
+
+def test_small_update_does_not_walk_surface(state):
+  with mock.patch.object(_SurfaceGraph, "_check_all") as check_all:
+    state.update_components("s", {"d": [], "c": _children("d")})
+  check_all.assert_not_called()
+
+
+def test_create_and_delete_surface(state):
+  state.create_surface("s", "root")
+  assert state.component_ids("s") == set()
+  state.delete_surface("s")
+  assert state.surface_ids() == []
+
+
+def test_transaction_checks_updates_together(state):
+  with state.transaction():
+    state.update_components("s", {"x": [], "y": _children("x")})
+    state.update_components("s", {"b": _children("y")})
+  assert state.component_ids("s") == {"root", "a", "b", "c", "x", "y"}
+
+
+def test_failed_transaction_is_undone(state):
+  with pytest.raises(ValueError, match="'z' is not reachable from 'root'"):
+    with state.transaction():
+      state.update_components("s", {"a": [], "d": []})
+      state.create_surface("t", "root")
+      state.update_components("s", {"z": [], "b": _children("d")})
+  assert state.surface_ids() == ["s"]
+  assert state.component_ids("s") == {"root", "a", "b", "c"}
+
+  with pytest.raises(RuntimeError):
+    with state.transaction():
+      state.delete_surface("s")
+      raise RuntimeError()
+  assert state.component_ids("s") == {"root", "a", "b", "c"}
+  # The references of updated components are restored as well.
+  with pytest.raises(ValueError, match="Circular reference detected"):
+    state.update_components("s", {"c": _children("a")})
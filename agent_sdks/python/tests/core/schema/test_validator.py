@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gc
 import json
 import copy
 import pytest
+from unittest import mock
 from unittest.mock import MagicMock
+from a2ui.core.schema import validator as validator_module
 from a2ui.core.schema.manager import A2uiSchemaManager, A2uiCatalog, CatalogConfig
 from a2ui.core.schema.common_modifiers import remove_strict_validation
 from a2ui.core.schema.constants import VERSION_0_8, VERSION_0_9
@@ -870,6 +873,25 @@ class TestValidator:
     ):
       test_catalog.validator.validate(payload)
 
+  def test_ref_fields_extracted_once_per_validator(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    payload = self.make_payload(test_catalog, components=components)
+    with mock.patch(
+        "a2ui.core.schema.validator._extract_component_ref_fields",
+        wraps=validator_module._extract_component_ref_fields,
+    ) as extract:
+      validator = validator_module.A2uiValidator(test_catalog)
+      validator.validate(payload)
+      validator.validate(payload + payload[1:])
+
+    assert extract.call_count == 1
+    single_refs, list_refs = validator._ref_fields_map["Card"]
+    assert single_refs == frozenset({"child"})
+    assert isinstance(list_refs, frozenset)
+
   def test_validate_orphaned_component(self, test_catalog):
     components = [
         {"id": "root", "component": "Text", "text": "Root"},
@@ -1037,3 +1059,426 @@ class TestValidator:
     payload = self.make_payload(test_catalog, data_model=deep_data)
     with pytest.raises(ValueError, match="Global recursion limit exceeded"):
       test_catalog.validator.validate(payload)
+
+  def test_discriminator_reports_single_branch_error(self, catalog_0_9):
+    components = [
+        {"id": "root", "component": "Column", "children": ["t"]},
+        {"id": "t", "component": "Text", "text": "Hi", "children": ["x"]},
+    ]
+    payload = self.make_payload(catalog_0_9, components=components)
+    dispatched = validator_module.A2uiValidator(
+        catalog_0_9, discriminator_dispatch=True
+    )
+    with pytest.raises(ValueError) as excinfo:
+      dispatched.validate(payload)
+    # Only the Text branch is reported, not a failure of every component type.
+    assert "  - Unevaluated properties are not allowed ('children' was unexpected)" in (
+        str(excinfo.value)
+    )
+
+    # Dispatch is off by default.
+    with pytest.raises(ValueError) as excinfo:
+      catalog_0_9.validator.validate(payload)
+    assert "('children' was unexpected)" not in str(excinfo.value)
+
+  def test_discriminator_unknown_component(self, catalog_0_9):
+    validator = validator_module.get_cached_validator(
+        catalog_0_9, discriminator_dispatch=True
+    )
+    components = [{"id": "root", "component": "Carousel"}]
+    payload = self.make_payload(catalog_0_9, components=components)
+    with pytest.raises(
+        ValueError, match="'Carousel' is not a valid 'component'. Expected one of"
+    ):
+      validator.validate(payload)
+
+    del components[0]["component"]
+    payload = self.make_payload(catalog_0_9, components=components)
+    with pytest.raises(ValueError, match="'component' is a required property"):
+      validator.validate(payload)
+
+  def test_validate_follow_up_update_with_surface_state(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    state = validator_module.SurfaceValidationState()
+    test_catalog.validator.validate(
+        self.make_payload(test_catalog, components=components), state=state
+    )
+    assert state.component_ids("test-surface") == {"root", "c1"}
+
+    # A follow-up update without the root message.
+    update = self.make_payload(
+        test_catalog,
+        components=[{"id": "root", "component": "Card", "child": "missing"}],
+    )[1:]
+    test_catalog.validator.validate(update)
+    with pytest.raises(ValueError, match="references non-existent component 'missing'"):
+      test_catalog.validator.validate(update, state=state)
+
+  def test_failed_payload_leaves_surface_state_unchanged(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    state = validator_module.SurfaceValidationState()
+    test_catalog.validator.validate(
+        self.make_payload(test_catalog, components=components), state=state
+    )
+
+    deep_data = current = {}
+    for _ in range(55):
+      current["next"] = {}
+      current = current["next"]
+    update = self.make_payload(
+        test_catalog,
+        components=[
+            {"id": "root", "component": "Card", "child": "c2"},
+            {"id": "c2", "component": "Text", "text": "Hi"},
+        ],
+    )[1:]
+    with pytest.raises(ValueError, match="Global recursion limit exceeded"):
+      test_catalog.validator.validate(
+          update + self.make_payload(test_catalog, data_model=deep_data), state=state
+      )
+    # The valid component update of the failed payload is not applied.
+    assert state.component_ids("test-surface") == {"root", "c1"}
+    assert not test_catalog.validator.validate_all(
+        update + self.make_payload(test_catalog, data_model=deep_data), state=state
+    ).ok
+    assert state.component_ids("test-surface") == {"root", "c1"}
+
+  def test_surface_state_checks_payload_as_a_whole(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    state = validator_module.SurfaceValidationState()
+    test_catalog.validator.validate(
+        self.make_payload(test_catalog, components=components), state=state
+    )
+
+    def update(*components):
+      return self.make_payload(test_catalog, components=list(components))[1:]
+
+    new_child = update({"id": "c2", "component": "Text", "text": "Hi"})
+    attach = update({"id": "root", "component": "Card", "child": "c2"})
+    with pytest.raises(ValueError, match="'c2' is not reachable from 'root'"):
+      test_catalog.validator.validate(new_child, state=state)
+    # The child may be attached to its parent by a later message.
+    test_catalog.validator.validate(new_child + attach, state=state)
+    assert state.component_ids("test-surface") == {"root", "c1", "c2"}
+
+    new_child = update({"id": "c3", "component": "Text", "text": "Hi"})
+    attach = update({"id": "root", "component": "Card", "child": "c3"})
+    assert test_catalog.validator.validate_all(new_child + attach, state=state).ok
+    assert state.component_ids("test-surface") == {"root", "c1", "c2", "c3"}
+
+  def test_component_references_extracted_once_per_component(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    payload = self.make_payload(test_catalog, components=components)
+    with mock.patch(
+        "a2ui.core.schema.validator._get_component_references",
+        wraps=validator_module._get_component_references,
+    ) as get_references:
+      test_catalog.validator.validate(payload)
+    assert get_references.call_count == len(components)
+
+  def make_multi_surface_payload(self, catalog, broken_surface=None):
+    """Helper to create a payload with the same components on two surfaces."""
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    payload = []
+    for surface_id in ("first", "second"):
+      surface_components = copy.deepcopy(components)
+      if surface_id == broken_surface:
+        surface_components[0]["child"] = "missing"
+      messages = json.dumps(self.make_payload(catalog, components=surface_components))
+      payload.extend(json.loads(messages.replace("test-surface", surface_id)))
+    # Interleave the messages of the surfaces.
+    return [payload[0], payload[2], payload[1], payload[3]]
+
+  def test_partition_by_surface(self, test_catalog):
+    payload = self.make_multi_surface_payload(test_catalog)
+    assert validator_module._partition_by_surface(payload + ["invalid"]) == [
+        [payload[0], payload[2]],
+        [payload[1], payload[3]],
+        ["invalid"],
+    ]
+
+  @pytest.mark.parametrize("use_processes", [False, True])
+  def test_validate_many(self, test_catalog, use_processes):
+    validator = test_catalog.validator
+    executor = validator.create_process_pool(2) if use_processes else None
+    try:
+      validator.validate_many(
+          self.make_multi_surface_payload(test_catalog), executor=executor
+      )
+      payload = self.make_multi_surface_payload(test_catalog, broken_surface="second")
+      with pytest.raises(ValueError) as expected:
+        validator.validate(payload)
+      with pytest.raises(ValueError) as actual:
+        validator.validate_many(payload, executor=executor)
+      assert str(actual.value) == str(expected.value)
+    finally:
+      if executor is not None:
+        executor.shutdown()
+
+  def test_validate_many_reuses_thread_pool(self, test_catalog):
+    validator = validator_module.A2uiValidator(test_catalog)
+    payload = self.make_multi_surface_payload(test_catalog)
+    with mock.patch.object(
+        validator_module,
+        "ThreadPoolExecutor",
+        wraps=validator_module.ThreadPoolExecutor,
+    ) as thread_pool:
+      validator.validate_many(payload)
+      validator.validate_many(payload)
+    thread_pool.assert_called_once()
+
+  def test_close_shuts_down_thread_pool(self, test_catalog):
+    payload = self.make_multi_surface_payload(test_catalog)
+    with validator_module.A2uiValidator(test_catalog) as validator:
+      validator.validate_many(payload)
+      executor = validator._executor
+    assert executor._shutdown
+    assert validator._executor is None
+    # A closed validator creates a new pool when needed.
+    validator.validate_many(payload)
+    assert validator._executor is not executor
+    validator.close()
+
+  def test_thread_pool_is_shut_down_with_its_validator(self, test_catalog):
+    validator = validator_module.A2uiValidator(test_catalog)
+    validator.validate_many(self.make_multi_surface_payload(test_catalog))
+    executor = validator._executor
+    del validator
+    gc.collect()
+    assert executor._shutdown
+
+  def test_process_pool_is_bound_to_its_validator(self, test_catalog):
+    other = validator_module.A2uiValidator(test_catalog, discriminator_dispatch=True)
+    with other.create_process_pool(1) as executor:
+      with pytest.raises(ValueError, match="was not created by this validator"):
+        test_catalog.validator.validate_many(
+            self.make_multi_surface_payload(test_catalog), executor=executor
+        )
+
+  @pytest.mark.asyncio
+  async def test_validate_async(self, test_catalog):
+    validator = test_catalog.validator
+    await validator.validate_async(self.make_multi_surface_payload(test_catalog))
+    with pytest.raises(ValueError, match="non-existent component 'missing'"):
+      await validator.validate_async(
+          self.make_multi_surface_payload(test_catalog, broken_surface="first")
+      )
+
+  def test_validate_all_reports_every_issue(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Column", "children": ["c1", "c2", "ghost"]},
+        {"id": "c1", "component": "Card", "child": "c1"},
+        {"id": "c2", "component": "Text", "text": "Hello"},
+        {"id": "c2", "component": "Text", "text": "Again"},
+        {"id": "orphan", "component": "Text", "text": "Alone"},
+    ]
+    payload = self.make_payload(test_catalog, components=components)
+    report = test_catalog.validator.validate_all(payload)
+
+    components_pointer = (
+        "/1/surfaceUpdate/components"
+        if test_catalog.version == VERSION_0_8
+        else "/1/updateComponents/components"
+    )
+    props = (
+        lambda i, name: f"/{i}/component/{name}"
+        if test_catalog.version == VERSION_0_8
+        else f"/{i}"
+    )
+    assert [(issue.kind, issue.pointer) for issue in report.issues] == [
+        ("integrity", f"{components_pointer}/3/id"),
+        ("integrity", f"{components_pointer}{props(0, 'Column')}/children"),
+        ("topology", f"{components_pointer}{props(1, 'Card')}/child"),
+        ("topology", f"{components_pointer}/4"),
+    ]
+    assert "non-existent component 'ghost'" in report.issues[1].message
+    assert "'orphan' is not reachable" in report.issues[3].message
+    with pytest.raises(ValueError, match="Found 4 validation error"):
+      report.raise_for_errors()
+
+  def test_validate_all_reports_schema_and_recursion_issues(self, test_catalog):
+    deep_data = current = {}
+    for _ in range(55):
+      current["next"] = {}
+      current = current["next"]
+    payload = self.make_payload(test_catalog, data_model=deep_data)
+    payload.append({"unknownMessage": {}})
+    payload.append(copy.deepcopy(payload[0]))
+    payload.append({"anotherUnknownMessage": {}})
+
+    report = test_catalog.validator.validate_all(payload)
+    assert [(issue.kind, issue.pointer) for issue in report.issues] == [
+        ("schema", "/1"),
+        ("schema", "/3"),
+        ("recursion", report.issues[2].pointer),
+        ("recursion", report.issues[3].pointer),
+    ]
+    assert report.issues[2].pointer.startswith("/0/")
+    assert report.issues[3].pointer.startswith("/2/")
+    assert "Global recursion limit exceeded" in report.issues[2].message
+
+  def test_validate_all_points_into_component_unions(self, catalog_0_9):
+    payload = self.make_payload(
+        catalog_0_9,
+        components=[
+            {"id": "root", "component": "Column", "children": ["t", "c"]},
+            {"id": "t", "component": "Text", "text": 5},
+            {"id": "c", "component": "Carousel"},
+        ],
+    )[1:]
+
+    report = catalog_0_9.validator.validate_all(payload)
+    assert [(issue.kind, issue.pointer) for issue in report.issues] == [
+        ("schema", "/0/updateComponents/components/1/text"),
+        ("schema", "/0/updateComponents/components/2/component"),
+    ]
+    assert "'Carousel' is not a valid 'component'" in report.issues[1].message
+
+  def test_validate_all_reports_surface_state_issues(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    state = validator_module.SurfaceValidationState()
+    test_catalog.validator.validate(
+        self.make_payload(test_catalog, components=components), state=state
+    )
+
+    def update(*components):
+      return self.make_payload(test_catalog, components=list(components))[1:]
+
+    components_pointer = (
+        "/1/surfaceUpdate/components"
+        if test_catalog.version == VERSION_0_8
+        else "/1/updateComponents/components"
+    )
+    card_child = (
+        "component/Card/child" if test_catalog.version == VERSION_0_8 else "child"
+    )
+    payload = update({"id": "c2", "component": "Text", "text": "Hi"}) + update(
+        {"id": "c2", "component": "Text", "text": "Hi"},
+        {"id": "root", "component": "Card", "child": "missing"},
+    )
+    report = test_catalog.validator.validate_all(payload, state=state)
+    assert [(issue.kind, issue.pointer) for issue in report.issues] == [
+        ("integrity", f"{components_pointer}/1/{card_child}"),
+    ]
+    assert "non-existent component 'missing'" in report.issues[0].message
+
+    report = test_catalog.validator.validate_all(
+        update({"id": "c3", "component": "Text", "text": "Hi"}), state=state
+    )
+    assert [(issue.kind, issue.pointer) for issue in report.issues] == [
+        ("topology", components_pointer.replace("/1/", "/0/", 1) + "/0"),
+    ]
+    assert state.component_ids("test-surface") == {"root", "c1"}
+
+  def test_validate_all_valid_payload(self, test_catalog):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    report = test_catalog.validator.validate_all(
+        self.make_payload(test_catalog, components=components)
+    )
+    assert report.ok
+    report.raise_for_errors()
+
+  def test_collect_recursion_and_path_issues(self):
+    issues = []
+    validator_module._collect_recursion_and_path_issues(
+        {"a": [{"path": "bad path"}, {"path": "/ok"}, {"path": "/x~2"}]}, "/0", issues
+    )
+    assert [(issue.kind, issue.pointer) for issue in issues] == [
+        ("path", "/0/a/0/path"),
+        ("path", "/0/a/2/path"),
+    ]
+
+  @pytest.fixture
+  def result_cache(self):
+    validator_module.set_validation_result_cache_size(8)
+    yield
+    validator_module.set_validation_result_cache_size(0)
+
+  def test_validation_result_cache(self, test_catalog, result_cache):
+    components = [
+        {"id": "root", "component": "Card", "child": "c1"},
+        {"id": "c1", "component": "Text", "text": "Hello"},
+    ]
+    payload = self.make_payload(test_catalog, components=components)
+    invalid = copy.deepcopy(payload)
+    invalid[1][
+        "surfaceUpdate" if test_catalog.version == VERSION_0_8 else "updateComponents"
+    ]["components"][1]["id"] = "c2"
+    validator = test_catalog.validator
+
+    with mock.patch.object(validator, "_validate", wraps=validator._validate) as run:
+      validator.validate(payload)
+      # The same content in a different object, with keys in another order.
+      validator.validate(json.loads(json.dumps(payload, sort_keys=True)))
+      for _ in range(2):
+        with pytest.raises(ValueError, match="non-existent component 'c1'"):
+          validator.validate(invalid)
+      assert run.call_count == 2
+
+      # Validation against a surface state is not cached.
+      validator.validate(payload, state=validator_module.SurfaceValidationState())
+      assert run.call_count == 3
+
+    stats = validator_module.validation_result_cache_stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+  def test_validation_result_cache_disabled_by_default(self):
+    assert validator_module.validation_result_cache_stats() is None
+
+  def test_validation_result_cache_size_from_env(self, monkeypatch, caplog):
+    env_var = validator_module.VALIDATION_CACHE_SIZE_ENV_VAR
+    monkeypatch.setenv(env_var, "128")
+    assert validator_module._cache_size_from_env() == 128
+    monkeypatch.setenv(env_var, "lots")
+    assert validator_module._cache_size_from_env() == 0
+    assert f"Ignoring invalid {env_var}='lots'" in caplog.text
+
+  def test_data_model_value_is_not_checked_for_bindings(self, catalog_0_9):
+    data_model = {"link": {"path": "not a pointer"}, "call": {"call": "f", "args": {}}}
+    payload = self.make_payload(catalog_0_9, data_model=data_model)
+    catalog_0_9.validator.validate(payload)
+    payload[0]["updateDataModel"]["value"]["link"]["inner"] = {"path": "not a pointer"}
+    catalog_0_9.validator.validate(payload)
+
+  def test_valid_json_pointers_are_cached(self):
+    validator_module._valid_pointers.clear()
+    message = {"a": {"path": "/items/0"}, "b": [{"path": "/items/0"}]}
+    with mock.patch.object(
+        validator_module,
+        "_is_valid_json_pointer",
+        wraps=validator_module._is_valid_json_pointer,
+    ) as check:
+      validator_module._validate_recursion_and_paths(message)
+      validator_module._validate_recursion_and_paths(message)
+    assert check.call_count == 1
+
+    # validate_all shares the check and the cache.
+    validator_module._collect_recursion_and_path_issues(
+        {"c": {"path": "/items/1"}}, "/0", []
+    )
+    assert validator_module._valid_pointers == {"/items/0", "/items/1"}
+
+    with pytest.raises(ValueError, match="Invalid JSON Pointer syntax"):
+      validator_module._validate_recursion_and_paths({"path": "items"})
+    assert "items" not in validator_module._valid_pointers
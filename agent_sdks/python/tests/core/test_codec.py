@@ -0,0 +1,107 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from a2ui.core import codec
+
+PAYLOAD = [{
+    "version": "v0.9",
+    "updateComponents": {
+        "surfaceId": "s1",
+        "components": [{"id": "root", "component": "Text", "text": "Café ☕"}],
+    },
+}]
+
+
+@pytest.fixture(params=codec.available_backends())
+def json_codec(request):
+  return codec.create_codec(request.param)
+
+
+def test_stdlib_backend_is_always_available():
+  assert codec.STDLIB_BACKEND in codec.available_backends()
+
+
+def test_codec_round_trip(json_codec):
+  assert json_codec.loads(json_codec.dumps(PAYLOAD)) == PAYLOAD
+
+
+def test_codec_output_matches_stdlib(json_codec):
+  stdlib = codec.StdlibJsonCodec()
+  assert json_codec.dumps(PAYLOAD) == stdlib.dumps(PAYLOAD)
+  assert json_codec.dumps(PAYLOAD, indent=True) == stdlib.dumps(PAYLOAD, indent=True)
+  assert json_codec.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+
+@pytest.mark.parametrize(
+    "data, pos",
+    [("{invalid", 1), ('["é", }', 6)],
+)
+def test_codec_decode_errors_report_position(json_codec, data, pos):
+  with pytest.raises(codec.JSONDecodeError) as error:
+    json_codec.loads(data)
+  assert error.value.pos == pos
+  assert error.value.doc == data
+
+
+def test_codec_does_not_decode_invalid_documents_twice(json_codec, monkeypatch):
+  def fail(data):
+    raise AssertionError("decoded with the standard library")
+
+  if json_codec.name != codec.STDLIB_BACKEND:
+    monkeypatch.setattr(codec._STDLIB_CODEC, "loads", fail)
+  with pytest.raises(codec.JSONDecodeError):
+    json_codec.loads('[{"a": 1},]')
+
+
+def test_codec_accepts_stdlib_extensions(json_codec):
+  assert json_codec.loads('{"a": NaN}')["a"] != json_codec.loads('{"a": NaN}')["a"]
+  assert json_codec.loads("[-Infinity]") == [float("-inf")]
+  assert json_codec.loads('"\ud800"') == "\ud800"
+  assert json_codec.dumps({1: "a"}) == '{"1":"a"}'
+
+
+def test_set_backend(monkeypatch):
+  previous = codec.get_codec().name
+  try:
+    assert codec.set_backend(codec.STDLIB_BACKEND).name == codec.STDLIB_BACKEND
+    assert codec.get_codec().name == codec.STDLIB_BACKEND
+
+    monkeypatch.setenv(codec.BACKEND_ENV_VAR, codec.STDLIB_BACKEND)
+    assert codec.set_backend(None).name == codec.STDLIB_BACKEND
+
+    with pytest.raises(ValueError, match="Unknown JSON backend"):
+      codec.set_backend("yaml")
+  finally:
+    codec.set_backend(previous)
+
+
+def test_invalid_backend_env_var_falls_back(monkeypatch, caplog):
+  previous = codec.get_codec().name
+  try:
+    with monkeypatch.context() as patch:
+      patch.setenv(codec.BACKEND_ENV_VAR, "yaml")
+      assert codec.set_backend(None).name == codec.available_backends()[0]
+      assert "Ignoring A2UI_JSON_BACKEND='yaml'" in caplog.text
+
+    def not_installed():
+      raise ImportError("No module named 'orjson'")
+
+    with monkeypatch.context() as patch:
+      patch.setitem(codec._CODEC_CLASSES, codec.ORJSON_BACKEND, not_installed)
+      patch.setenv(codec.BACKEND_ENV_VAR, codec.ORJSON_BACKEND)
+      assert codec.set_backend(None).name != codec.ORJSON_BACKEND
+      assert "No module named 'orjson'" in caplog.text
+  finally:
+    codec.set_backend(previous)
@@ -0,0 +1,60 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui.core.metrics import MetricsRegistry, metric_labels
+
+
+def test_counters_merge_context_labels():
+  registry = MetricsRegistry()
+  with metric_labels(model="m1"):
+    registry.increment("requests", kind="a")
+    with metric_labels(model="m2", region="eu"):
+      registry.increment("requests", amount=2, kind="a")
+  registry.increment("requests", kind="b")
+
+  assert registry.counter("requests") == 4
+  assert registry.counter("requests", kind="a") == 3
+  assert registry.counter("requests", model="m2", region="eu") == 2
+  assert registry.counter("missing") == 0
+  assert set(registry.snapshot()["counters"]["requests"]) == {
+      (("kind", "a"), ("model", "m1")),
+      (("kind", "a"), ("model", "m2"), ("region", "eu")),
+      (("kind", "b"),),
+  }
+
+
+def test_histogram_and_prometheus_rendering():
+  registry = MetricsRegistry()
+  registry.increment("parses_total", outcome="ok")
+  registry.observe("parse_seconds", 0.0002, model='say "hi"')
+  registry.observe("parse_seconds", 5, model='say "hi"')
+
+  histogram = registry.snapshot()["histograms"]["parse_seconds"][(
+      ("model", 'say "hi"'),
+  )]
+  assert histogram.count == 2
+  assert histogram.sum == 5.0002
+
+  text = registry.render_prometheus()
+  assert '# TYPE parses_total counter\nparses_total{outcome="ok"} 1' in text
+  assert 'parse_seconds_bucket{model="say \\"hi\\"",le="0.0005"} 1' in text
+  assert 'parse_seconds_bucket{model="say \\"hi\\"",le="+Inf"} 2' in text
+  assert 'parse_seconds_count{model="say \\"hi\\""} 2' in text
+
+
+def test_reset():
+  registry = MetricsRegistry()
+  registry.increment("requests")
+  registry.reset()
+  assert registry.render_prometheus() == ""
@@ -17,6 +17,7 @@ from a2a.server.agent_execution import RequestContext
 from a2a.types import DataPart, TextPart, Part
 from a2ui.a2a import *
 from unittest.mock import MagicMock
+import pytest
 
 
 def test_a2ui_part_serialization():
@@ -96,3 +97,79 @@ def test_try_activate_a2ui_extension_not_requested():
 
   assert not try_activate_a2ui_extension(context)
   context.add_activated_extension.assert_not_called()
+
+
+async def _stream(*chunks):
+  for chunk in chunks:
+    yield chunk
+
+
+async def _collect(parts):
+  return [part async for part in parts]
+
+
+@pytest.mark.asyncio
+async def test_stream_response_to_parts_yields_parts_as_blocks_close():
+  chunks = _stream(
+      "Here is ",
+      'your UI <a2ui-json>[{"id": "1"}, ',
+      '{"id": "2"}]</a2ui-json> done',
+  )
+  stream = stream_response_to_parts(chunks)
+
+  assert (await anext(stream)).root.text == "Here is"
+  assert (await anext(stream)).root.text == " your UI"
+  assert [get_a2ui_datapart(await anext(stream)).data for _ in range(2)] == [
+      {"id": "1"},
+      {"id": "2"},
+  ]
+  assert (await anext(stream)).root.text == "done"
+  assert await _collect(stream) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_response_to_parts_isolates_failing_blocks():
+  validator = MagicMock()
+  validator.validate.side_effect = lambda data: _raise_if_invalid(data)
+  chunks = _stream(
+      "A<a2ui-json>not json</a2ui-json>",
+      'B<a2ui-json>[{"id": "invalid"}]</a2ui-json>',
+      'C<a2ui-json>[{"id": "ok"}]</a2ui-json>',
+  )
+
+  parts = await _collect(stream_response_to_parts(chunks, validator=validator))
+
+  assert [part.root.text for part in parts if not is_a2ui_part(part)] == [
+      "A",
+      "B",
+      "C",
+  ]
+  assert [get_a2ui_datapart(part).data for part in parts if is_a2ui_part(part)] == [
+      {"id": "ok"}
+  ]
+
+
+def _raise_if_invalid(data):
+  if data[0]["id"] == "invalid":
+    raise ValueError("Validation failed")
+
+
+@pytest.mark.asyncio
+async def test_stream_response_to_parts_incremental_messages():
+  stream = stream_response_to_parts(
+      _stream('<a2ui-json>[{"id": "1"}, {"id"', ': "2"}]</a2ui-json>'),
+      incremental_messages=True,
+  )
+  assert get_a2ui_datapart(await anext(stream)).data == {"id": "1"}
+  assert get_a2ui_datapart(await anext(stream)).data == {"id": "2"}
+
+
+@pytest.mark.asyncio
+async def test_stream_response_to_parts_fallback_text():
+  parts = await _collect(
+      stream_response_to_parts(
+          _stream("<a2ui-json>oops</a2ui-json>"), fallback_text="Sorry"
+      )
+  )
+  assert len(parts) == 1
+  assert parts[0].root.text == "Sorry"
@@ -251,11 +251,14 @@ class RestaurantAgent:
 
             # --- Validation Steps ---
             # Check if it validates against the A2UI_SCHEMA
-            # This will raise jsonschema.exceptions.ValidationError if it fails
+            # This raises a ValueError listing every problem if it fails, so
+            # that the retry can fix them all at once.
             logger.info(
                 "--- RestaurantAgent.stream: Validating against A2UI_SCHEMA... ---"
             )
-            selected_catalog.validator.validate(parsed_json_data)
+            selected_catalog.validator.validate_all(
+                parsed_json_data
+            ).raise_for_errors()
             # --- End Validation Steps ---
 
             logger.info(